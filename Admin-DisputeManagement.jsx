@@ -19,18 +19,25 @@ const DisputeManagement = () => {
   const [activeTab, setActiveTab] = useState('all');
   const [searchTerm, setSearchTerm] = useState('');
   const [page, setPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  // Keyset pagination: follow the cursors of the next/previous links
+  const [cursor, setCursor] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [previousCursor, setPreviousCursor] = useState(null);
 
   useEffect(() => {
     fetchDisputes();
-  }, [page, activeTab]);
+  }, [cursor, activeTab]);
+
+  const cursorFrom = (link) => (link ? new URL(link, window.location.origin).searchParams.get('cursor') : null);
 
   const fetchDisputes = async () => {
     try {
       setLoading(true);
       const response = await axiosInstance.get('/admin/disputes/', {
         params: {
-          page,
+          cursor: cursor || undefined,
+          // Cached per-status totals, only needed with the first page
+          counts: cursor ? undefined : 1,
           status: activeTab !== 'all' ? activeTab : undefined,
           search: searchTerm || undefined
         }
@@ -39,19 +46,21 @@ const DisputeManagement = () => {
       if (response.data.results) {
         setDisputes(response.data.results);
         
-        // Calculate stats from the data
-        const allDisputes = response.data.results;
-        const newStats = {
-          total: response.data.count || allDisputes.length,
-          pending: allDisputes.filter(d => d.status === 'pending').length,
-          in_progress: allDisputes.filter(d => d.status === 'in_progress').length,
-          resolved: allDisputes.filter(d => d.status === 'resolved').length,
-          rejected: allDisputes.filter(d => d.status === 'rejected').length,
-          avg_resolution_days: 3 // Calculate this from resolved disputes
-        };
-        setStats(newStats);
+        // Totals of all disputes, not just this page
+        const counts = response.data.counts;
+        if (counts) {
+          setStats({
+            total: counts.total || 0,
+            pending: counts.pending || 0,
+            in_progress: counts.in_progress || 0,
+            resolved: counts.resolved || 0,
+            rejected: counts.rejected || 0,
+            avg_resolution_days: 3 // Calculate this from resolved disputes
+          });
+        }
         
-        setTotalPages(Math.ceil((response.data.count || 0) / 20));
+        setNextCursor(cursorFrom(response.data.next));
+        setPreviousCursor(cursorFrom(response.data.previous));
       }
       setError(null);
     } catch (err) {
@@ -64,7 +73,21 @@ const DisputeManagement = () => {
 
   const handleSearch = () => {
     setPage(1);
-    fetchDisputes();
+    if (cursor) {
+      setCursor(null);
+    } else {
+      fetchDisputes();
+    }
+  };
+
+  const handleNextPage = () => {
+    setPage(p => p + 1);
+    setCursor(nextCursor);
+  };
+
+  const handlePreviousPage = () => {
+    setPage(p => Math.max(1, p - 1));
+    setCursor(previousCursor);
   };
 
   const handleViewDispute = (disputeId) => {
@@ -186,7 +209,7 @@ const DisputeManagement = () => {
           <div className="border-b border-gray-200">
             <div className="flex items-center px-6">
               <button
-                onClick={() => { setActiveTab('all'); setPage(1); }}
+                onClick={() => { setActiveTab('all'); setPage(1); setCursor(null); }}
                 className={`px-4 py-3 text-sm font-medium border-b-2 ${
                   activeTab === 'all'
                     ? 'border-blue-600 text-blue-600'
@@ -196,7 +219,7 @@ const DisputeManagement = () => {
                 All ({stats.total})
               </button>
               <button
-                onClick={() => { setActiveTab('pending'); setPage(1); }}
+                onClick={() => { setActiveTab('pending'); setPage(1); setCursor(null); }}
                 className={`px-4 py-3 text-sm font-medium border-b-2 ${
                   activeTab === 'pending'
                     ? 'border-yellow-600 text-yellow-600'
@@ -206,7 +229,7 @@ const DisputeManagement = () => {
                 Pending ({stats.pending})
               </button>
               <button
-                onClick={() => { setActiveTab('in_progress'); setPage(1); }}
+                onClick={() => { setActiveTab('in_progress'); setPage(1); setCursor(null); }}
                 className={`px-4 py-3 text-sm font-medium border-b-2 ${
                   activeTab === 'in_progress'
                     ? 'border-blue-600 text-blue-600'
@@ -216,7 +239,7 @@ const DisputeManagement = () => {
                 In Progress ({stats.in_progress})
               </button>
               <button
-                onClick={() => { setActiveTab('resolved'); setPage(1); }}
+                onClick={() => { setActiveTab('resolved'); setPage(1); setCursor(null); }}
                 className={`px-4 py-3 text-sm font-medium border-b-2 ${
                   activeTab === 'resolved'
                     ? 'border-green-600 text-green-600'
@@ -226,7 +249,7 @@ const DisputeManagement = () => {
                 Resolved ({stats.resolved})
               </button>
               <button
-                onClick={() => { setActiveTab('rejected'); setPage(1); }}
+                onClick={() => { setActiveTab('rejected'); setPage(1); setCursor(null); }}
                 className={`px-4 py-3 text-sm font-medium border-b-2 ${
                   activeTab === 'rejected'
                     ? 'border-red-600 text-red-600'
@@ -344,12 +367,12 @@ const DisputeManagement = () => {
           {/* Pagination */}
           <div className="px-6 py-4 border-t border-gray-200 flex items-center justify-between">
             <p className="text-sm text-gray-700">
-              Showing {disputes.length} dispute(s) | Page {page} of {totalPages || 1}
+              Showing {disputes.length} dispute(s) | Page {page}
             </p>
             <div className="flex items-center gap-2">
               <button
-                onClick={() => setPage(p => Math.max(1, p - 1))}
-                disabled={page === 1 || loading}
+                onClick={handlePreviousPage}
+                disabled={!previousCursor || loading}
                 className="px-3 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed flex items-center gap-2"
               >
                 <ChevronLeft className="w-4 h-4" />
@@ -357,8 +380,8 @@ const DisputeManagement = () => {
               </button>
               <span className="px-4 py-2 text-sm font-medium">{page}</span>
               <button
-                onClick={() => setPage(p => Math.min(totalPages, p + 1))}
-                disabled={page === totalPages || totalPages === 0 || loading}
+                onClick={handleNextPage}
+                disabled={!nextCursor || loading}
                 className="px-3 py-2 border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed flex items-center gap-2"
               >
                 Next
@@ -15,14 +15,18 @@ const AuctionManagement = () => {
   });
   const [searchTerm, setSearchTerm] = useState('');
   const [page, setPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
-  const [totalCount, setTotalCount] = useState(0);
+  // Keyset pagination: follow the cursors of the next/previous links
+  const [cursor, setCursor] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [previousCursor, setPreviousCursor] = useState(null);
   const [selectedAuctions, setSelectedAuctions] = useState([]);
   const [closingAuctionId, setClosingAuctionId] = useState(null);
 
   useEffect(() => {
     fetchAuctions();
-  }, [page]);
+  }, [cursor]);
+
+  const cursorFrom = (link) => (link ? new URL(link, window.location.origin).searchParams.get('cursor') : null);
 
   const fetchAuctions = async () => {
     try {
@@ -30,7 +34,9 @@ const AuctionManagement = () => {
       setError(null);
       
       const params = new URLSearchParams();
-      params.append('page', page);
+      if (cursor) {
+        params.append('cursor', cursor);
+      }
       
       if (searchTerm && searchTerm.trim()) {
         params.append('search', searchTerm.trim());
@@ -56,22 +62,18 @@ const AuctionManagement = () => {
         params.append('end_date', filters.end_date);
       }
 
-      const fullUrl = `/auctions/?${params.toString()}`;
+      const fullUrl = `/admin/auctions/?${params.toString()}`;
 
       const response = await axiosInstance.get(fullUrl);
 
       if (response.data.results) {
         setAuctions(response.data.results);
-        setTotalCount(response.data.count || 0);
-        setTotalPages(Math.ceil((response.data.count || 0) / 20));
-      } else if (Array.isArray(response.data)) {
-        setAuctions(response.data);
-        setTotalCount(response.data.length);
-        setTotalPages(1);
+        setNextCursor(cursorFrom(response.data.next));
+        setPreviousCursor(cursorFrom(response.data.previous));
       } else {
         setAuctions([]);
-        setTotalCount(0);
-        setTotalPages(1);
+        setNextCursor(null);
+        setPreviousCursor(null);
       }
     } catch (err) {
       console.error('❌ Failed to fetch auctions:', err);
@@ -84,7 +86,21 @@ const AuctionManagement = () => {
 
   const handleApplyFilters = () => {
     setPage(1);
-    fetchAuctions();
+    if (cursor) {
+      setCursor(null);
+    } else {
+      fetchAuctions();
+    }
+  };
+
+  const handleNextPage = () => {
+    setPage(p => p + 1);
+    setCursor(nextCursor);
+  };
+
+  const handlePreviousPage = () => {
+    setPage(p => Math.max(1, p - 1));
+    setCursor(previousCursor);
   };
 
   const handleClearFilters = () => {
@@ -97,6 +113,7 @@ const AuctionManagement = () => {
     });
     setSearchTerm('');
     setPage(1);
+    setCursor(null);
     setTimeout(() => fetchAuctions(), 0);
   };
 
@@ -371,7 +388,7 @@ const AuctionManagement = () => {
         <div className="bg-gray-800 rounded-lg overflow-hidden">
           <div className="p-6 border-b border-gray-700 flex items-center justify-between">
             <h2 className="text-white font-bold text-lg">
-              Current Auctions ({totalCount})
+              Current Auctions
             </h2>
             {loading && (
               <div className="flex items-center gap-2">
@@ -490,12 +507,12 @@ const AuctionManagement = () => {
 
           <div className="px-6 py-4 border-t border-gray-700 flex items-center justify-between">
             <p className="text-sm text-gray-400">
-              Showing {auctions.length} of {totalCount} auctions (Page {page} of {totalPages || 1})
+              Showing {auctions.length} auctions (Page {page})
             </p>
             <div className="flex items-center gap-2">
               <button
-                onClick={() => setPage(p => Math.max(1, p - 1))}
-                disabled={page === 1 || loading}
+                onClick={handlePreviousPage}
+                disabled={!previousCursor || loading}
                 className="px-4 py-2 bg-gray-700 text-white rounded-lg hover:bg-gray-600 disabled:opacity-50 disabled:cursor-not-allowed flex items-center gap-2 transition-colors"
               >
                 <ChevronLeft className="w-4 h-4" />
@@ -505,8 +522,8 @@ const AuctionManagement = () => {
                 {page}
               </span>
               <button
-                onClick={() => setPage(p => Math.min(totalPages, p + 1))}
-                disabled={page === totalPages || totalPages === 0 || loading}
+                onClick={handleNextPage}
+                disabled={!nextCursor || loading}
                 className="px-4 py-2 bg-gray-700 text-white rounded-lg hover:bg-gray-600 disabled:opacity-50 disabled:cursor-not-allowed flex items-center gap-2 transition-colors"
               >
                 Next
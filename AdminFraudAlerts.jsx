@@ -0,0 +1,129 @@
+// Create: src/components/AdminFraudAlerts.jsx
+import React, { useState, useEffect, useRef } from 'react';
+import { Link } from 'react-router-dom';
+import { Bell, AlertTriangle } from 'lucide-react';
+
+const WS_BASE_URL = import.meta.env.VITE_WS_BASE_URL || "ws://localhost:8000";
+const MAX_ALERTS = 50;
+
+const getAccessToken = () => {
+  try {
+    const tokensStr = localStorage.getItem('tokens');
+    if (tokensStr) {
+      const token = JSON.parse(tokensStr)?.access;
+      if (token) return token;
+    }
+  } catch (err) {
+    console.error('Error parsing tokens:', err);
+  }
+  return localStorage.getItem('access_token') ||
+         localStorage.getItem('token') ||
+         sessionStorage.getItem('access_token') ||
+         sessionStorage.getItem('token');
+};
+
+// Live shill-bidding flags for staff, pushed on ws/disputes/ as "fraud_flag" frames
+const AdminFraudAlerts = () => {
+  const [alerts, setAlerts] = useState([]);
+  const [unread, setUnread] = useState(0);
+  const [open, setOpen] = useState(false);
+  const socketRef = useRef(null);
+  const retryRef = useRef(null);
+
+  useEffect(() => {
+    let stopped = false;
+
+    const connect = () => {
+      const token = getAccessToken();
+      if (!token) return;
+
+      const socket = new WebSocket(`${WS_BASE_URL}/ws/disputes/?token=${token}`);
+      socketRef.current = socket;
+
+      socket.onmessage = (event) => {
+        try {
+          const frame = JSON.parse(event.data);
+          if (frame.type === 'ping') {
+            // Heartbeat, unanswered connections are closed by the server
+            socket.send(JSON.stringify({ type: 'pong' }));
+          } else if (frame.type === 'fraud_flag') {
+            setAlerts(prev => [{ ...frame, received_at: new Date() }, ...prev].slice(0, MAX_ALERTS));
+            setUnread(count => count + 1);
+          }
+        } catch (err) {
+          console.error('Error parsing fraud alert:', err);
+        }
+      };
+
+      socket.onclose = () => {
+        if (!stopped) {
+          retryRef.current = setTimeout(connect, 5000);
+        }
+      };
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      clearTimeout(retryRef.current);
+      socketRef.current?.close();
+    };
+  }, []);
+
+  const toggle = () => {
+    setOpen(!open);
+    setUnread(0);
+  };
+
+  return (
+    <div className="relative">
+      <button
+        onClick={toggle}
+        className="relative p-2 text-gray-600 hover:bg-gray-100 rounded-lg transition-colors"
+        title="Fraud alerts"
+      >
+        <Bell className="w-5 h-5" />
+        {unread > 0 && (
+          <span className="absolute -top-1 -right-1 min-w-[1.25rem] h-5 px-1 bg-red-500 text-white text-xs font-semibold rounded-full flex items-center justify-center">
+            {unread}
+          </span>
+        )}
+      </button>
+
+      {open && (
+        <>
+          <div className="fixed inset-0 z-40" onClick={() => setOpen(false)}></div>
+          <div className="absolute right-0 mt-2 w-96 bg-white rounded-lg shadow-lg border border-gray-200 z-50">
+            <div className="px-4 py-3 border-b border-gray-200">
+              <h3 className="text-sm font-semibold text-gray-900">Suspicious bidding</h3>
+            </div>
+            <div className="max-h-96 overflow-y-auto">
+              {alerts.length === 0 ? (
+                <p className="px-4 py-6 text-sm text-gray-500 text-center">No alerts since this page was opened</p>
+              ) : (
+                alerts.map(alert => (
+                  <Link
+                    key={alert.bid_id}
+                    to={`/auction/${alert.auction_id}`}
+                    onClick={() => setOpen(false)}
+                    className="flex gap-3 px-4 py-3 border-b border-gray-100 hover:bg-gray-50"
+                  >
+                    <AlertTriangle className="w-5 h-5 text-red-500 flex-shrink-0 mt-0.5" />
+                    <div className="min-w-0">
+                      <p className="text-sm text-gray-900">{alert.message}</p>
+                      <p className="text-xs text-gray-500 mt-1">
+                        Bid ${alert.amount} · seller {alert.seller_id} · {alert.received_at.toLocaleTimeString()}
+                      </p>
+                    </div>
+                  </Link>
+                ))
+              )}
+            </div>
+          </div>
+        </>
+      )}
+    </div>
+  );
+};
+
+export default AdminFraudAlerts;
@@ -2,6 +2,7 @@
 import React, { useState } from 'react';
 import { Outlet, Link, useLocation, useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
+import AdminFraudAlerts from '../components/AdminFraudAlerts';
 import {
   LayoutDashboard,
   Users,
@@ -15,7 +16,6 @@ import {
   LogOut,
   Menu,
   X,
-  Bell,
   Search,
   ChevronDown
 } from 'lucide-react';
@@ -167,11 +167,8 @@ const AdminLayout = () => {
           </div>
 
           <div className="flex items-center gap-4">
-            {/* Notifications */}
-            <button className="relative p-2 text-gray-600 hover:bg-gray-100 rounded-lg transition-colors">
-              <Bell className="w-5 h-5" />
-              <span className="absolute top-1 right-1 w-2 h-2 bg-red-500 rounded-full"></span>
-            </button>
+            {/* Live fraud alerts */}
+            <AdminFraudAlerts />
 
             {/* User Menu */}
             <div className="relative">
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axiosInstance from '../utils/axiosInstance';
+import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || "http://localhost:8000";
 
@@ -18,9 +19,11 @@ const AuctionDetail = () => {
   const [sellerProfile, setSellerProfile] = useState(null);
   const [sellerAuctions, setSellerAuctions] = useState([]);
   const [loadingSellerData, setLoadingSellerData] = useState(false);
+  const [priceHistory, setPriceHistory] = useState([]);
 
   useEffect(() => {
     fetchAuction();
+    fetchPriceHistory();
   }, [id]);
 
   useEffect(() => {
@@ -63,7 +66,7 @@ const AuctionDetail = () => {
   const fetchAuction = async () => {
     try {
       setLoading(true);
-      const response = await axiosInstance.get(`/auctions/${id}/`);
+      const response = await axiosInstance.get(`/auctions/browse/${id}/`);
       const auctionData = response.data;
       console.log('Auction seller field:', auctionData.seller);
       console.log('Full auction data:', auctionData);
@@ -87,6 +90,22 @@ const AuctionDetail = () => {
     }
   };
 
+  const fetchPriceHistory = async () => {
+    try {
+      // Downsampled server-side, a few hundred points whatever the bid count
+      const response = await axiosInstance.get(`/payments/auctions/${id}/price-history/`, {
+        params: { points: 300 }
+      });
+      setPriceHistory(response.data.series.map(point => ({
+        time: new Date(point.t).toLocaleString(),
+        price: parseFloat(point.price)
+      })));
+    } catch (err) {
+      console.error('Error fetching price history:', err);
+      setPriceHistory([]);
+    }
+  };
+
   const fetchSellerProfile = async (sellerId) => {
     try {
       setLoadingSellerData(true);
@@ -341,6 +360,22 @@ const AuctionDetail = () => {
               ))}
             </div>
           </div>
+
+          {/* Price History Section */}
+          {priceHistory.length > 1 && (
+            <div className="mt-8">
+              <h2 className="text-xl font-bold mb-4">Price History</h2>
+              <ResponsiveContainer width="100%" height={250}>
+                <LineChart data={priceHistory}>
+                  <CartesianGrid strokeDasharray="3 3" stroke="#f0f0f0" />
+                  <XAxis dataKey="time" stroke="#888" hide />
+                  <YAxis stroke="#888" domain={['auto', 'auto']} />
+                  <Tooltip formatter={(value) => `$${value.toFixed(2)}`} />
+                  <Line type="stepAfter" dataKey="price" stroke="#1f2937" strokeWidth={2} dot={false} />
+                </LineChart>
+              </ResponsiveContainer>
+            </div>
+          )}
         </div>
 
         {/* Seller Information Section */}
@@ -125,7 +125,7 @@ export default function LuxuryAuctionBrowse() {
   // Fetch auctions when category or filters change
   useEffect(() => {
     fetchAuctions();
-    loadWatchlistFromLocalStorage();
+    loadWatchlist();
   }, [activeCategory, filters]);
 
   const fetchAuctions = async () => {
@@ -144,13 +144,8 @@ export default function LuxuryAuctionBrowse() {
       if (filters.max_price && filters.max_price !== '') params.append('max_price', filters.max_price);
       params.append('ordering', filters.ordering || '-start_time');
 
-      let response;
-      try {
-        response = await axiosInstance.get(`/auctions/search-filters/?${params.toString()}`);
-      } catch (searchError) {
-        console.log('Falling back to /auctions/ endpoint');
-        response = await axiosInstance.get(`/auctions/?${params.toString()}`);
-      }
+      // Indexed search and filters, served from the listing cache
+      const response = await axiosInstance.get(`/auctions/browse/?${params.toString()}`);
 
       let auctionList = [];
 
@@ -192,39 +187,35 @@ export default function LuxuryAuctionBrowse() {
     }
   };
 
-  const loadWatchlistFromLocalStorage = () => {
+  const loadWatchlist = async () => {
     try {
-      const stored = localStorage.getItem(`watchlist_${user?.email || 'buyer'}`);
-      if (stored) {
-        const ids = JSON.parse(stored);
-        setWatchlistedIds(new Set(ids));
-      }
+      const response = await axiosInstance.get('/payments/watchlist/');
+      const entries = Array.isArray(response.data) ? response.data : response.data?.results || [];
+      setWatchlistedIds(new Set(entries.map(entry => entry.auction)));
     } catch (err) {
       console.error('Error loading watchlist:', err);
     }
   };
 
-  const saveWatchlistToLocalStorage = (ids) => {
+  const toggleWatchlist = async (auctionId) => {
+    const newIds = new Set(watchlistedIds);
     try {
-      localStorage.setItem(`watchlist_${user?.email || 'buyer'}`, JSON.stringify([...ids]));
+      if (newIds.has(auctionId)) {
+        await axiosInstance.delete(`/payments/watchlist/${auctionId}/`);
+        newIds.delete(auctionId);
+        alert('Removed from watchlist');
+      } else {
+        await axiosInstance.post('/payments/watchlist/', { auction: auctionId });
+        newIds.add(auctionId);
+        alert('Added to watchlist!');
+      }
+      setWatchlistedIds(newIds);
     } catch (err) {
       console.error('Error saving watchlist:', err);
+      alert('Failed to update watchlist');
     }
   };
 
-  const toggleWatchlist = (auctionId) => {
-    const newIds = new Set(watchlistedIds);
-    if (newIds.has(auctionId)) {
-      newIds.delete(auctionId);
-      alert('Removed from watchlist');
-    } else {
-      newIds.add(auctionId);
-      alert('Added to watchlist!');
-    }
-    setWatchlistedIds(newIds);
-    saveWatchlistToLocalStorage(newIds);
-  };
-
   const handleFilterChange = (name, value) => {
     setFilters(prev => ({
       ...prev,
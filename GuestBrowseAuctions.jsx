@@ -75,7 +75,7 @@ const GuestBrowseAuctions = () => {
       if (filters.max_price && filters.max_price !== '') params.append('max_price', filters.max_price);
       params.append('ordering', filters.ordering || '-start_time');
 
-      const response = await axiosInstance.get(`/auctions/?${params.toString()}`);
+      const response = await axiosInstance.get(`/auctions/browse/?${params.toString()}`);
       
       let auctionList = [];
       if (response.data.results && Array.isArray(response.data.results)) {
@@ -84,21 +84,17 @@ const PlaceBid = () => {
   const [soundsEnabled, setSoundsEnabled] = useState(true);
   const [hasPlayedFinal3, setHasPlayedFinal3] = useState(false);
   
-  const chatSocketRef = useRef(null);
-  const auctionSocketRef = useRef(null);
+  const streamSocketRef = useRef(null);
   const messagesEndRef = useRef(null);
   const reconnectTimeoutRef = useRef(null);
 
   useEffect(() => {
     fetchAuction();
     fetchBids();
-    fetchChatHistory();
-    connectChatWebSocket();
-    connectAuctionWebSocket();
+    connectStreamWebSocket();
 
     return () => {
-      if (chatSocketRef.current) chatSocketRef.current.close();
-      if (auctionSocketRef.current) auctionSocketRef.current.close();
+      if (streamSocketRef.current) streamSocketRef.current.close();
       if (reconnectTimeoutRef.current) clearTimeout(reconnectTimeoutRef.current);
     };
   }, [id]);
@@ -175,20 +171,7 @@ const PlaceBid = () => {
     }
   };
 
-  const fetchChatHistory = async () => {
-    try {
-      setChatLoading(true);
-      const response = await axiosInstance.get(`/auctions/${id}/chat/`);
-      setMessages(Array.isArray(response.data) ? response.data : []);
-    } catch (err) {
-      console.error('Error fetching chat history:', err);
-      setMessages([]);
-    } finally {
-      setChatLoading(false);
-    }
-  };
-
-  const connectChatWebSocket = () => {
+  const connectStreamWebSocket = () => {
     let token = null;
     
     try {
@@ -213,37 +196,78 @@ const PlaceBid = () => {
       return;
     }
 
-    const wsUrl = `${WS_BASE_URL}/ws/auctions/${id}/chat/?token=${token}`;
+    setChatLoading(true);
+
+    // One socket carries both the bid and chat streams of this auction
+    const wsUrl = `${WS_BASE_URL}/ws/stream/?token=${token}`;
     
     try {
-      chatSocketRef.current = new WebSocket(wsUrl);
+      streamSocketRef.current = new WebSocket(wsUrl);
 
-      chatSocketRef.current.onopen = () => {
-        console.log('✅ Chat WebSocket connected');
-        setWsConnectionStatus('connected');
+      streamSocketRef.current.onopen = () => {
+        console.log('✅ Auction WebSocket connected');
+        streamSocketRef.current.send(JSON.stringify({ action: 'subscribe', stream: 'bids', auction_id: id }));
+        // The server replays recent chat history right after subscribing
+        streamSocketRef.current.send(JSON.stringify({ action: 'subscribe', stream: 'chat', auction_id: id, replay: true }));
       };
 
-      chatSocketRef.current.onmessage = (event) => {
+      streamSocketRef.current.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data);
-          setMessages(prev => [...prev, {
-            user: data.user,
-            message: data.message,
-            timestamp: data.timestamp
-          }]);
+          const frame = JSON.parse(event.data);
+
+          if (frame.type === 'ping') {
+            streamSocketRef.current.send(JSON.stringify({ type: 'pong' }));
+            return;
+          }
+
+          if (frame.type === 'subscribed' && frame.stream === 'chat') {
+            setMessages([]);
+            setChatLoading(false);
+            setWsConnectionStatus('connected');
+          } else if (frame.type === 'throttled') {
+            alert(frame.message);
+          } else if (frame.stream === 'chat') {
+            const data = frame.payload;
+            setMessages(prev => [...prev, {
+              user: data.user,
+              message: data.message,
+              timestamp: data.timestamp
+            }]);
+          } else if (frame.stream === 'bids') {
+            const data = frame.payload;
+          
+            if (data.type === 'auction_extended') {
+              if (soundsEnabled) playExtensionSound();
+              
+              setExtensionMessage(
+                `⏰ Auction Extended! ${data.extended_by_seconds} seconds added due to last-minute bid!`
+              );
+              setShowExtensionNotif(true);
+              
+              setTimeout(() => setShowExtensionNotif(false), 5000);
+              
+              fetchAuction();
+              setHasPlayedFinal3(false);
+            } else if (data.type === 'send_bid_update') {
+              fetchBids();
+            } else if (data.type === 'auction_closed' || data.type === 'auction.closed') {
+              if (soundsEnabled) playHammerSound();
+            }
+          }
         } catch (err) {
           console.error('Error parsing message:', err);
         }
       };
 
-      chatSocketRef.current.onerror = (error) => {
-        console.error('❌ Chat WebSocket error:', error);
+      streamSocketRef.current.onerror = (error) => {
+        console.error('❌ Auction WebSocket error:', error);
         setWsConnectionStatus('disconnected');
       };
 
-      chatSocketRef.current.onclose = () => {
-        console.log('Chat WebSocket disconnected');
+      streamSocketRef.current.onclose = () => {
+        console.log('Auction WebSocket disconnected');
         setWsConnectionStatus('disconnected');
+        setChatLoading(false);
       };
     } catch (err) {
       console.error('Error creating WebSocket:', err);
@@ -251,67 +275,6 @@ const PlaceBid = () => {
     }
   };
 
-  const connectAuctionWebSocket = () => {
-    let token = null;
-    
-    try {
-      const tokensStr = localStorage.getItem('tokens');
-      if (tokensStr) {
-        const tokens = JSON.parse(tokensStr);
-        token = tokens?.access;
-      }
-    } catch (err) {
-      console.error('Error parsing tokens:', err);
-    }
-    
-    if (!token) {
-      token = localStorage.getItem('access_token') || 
-              localStorage.getItem('token') ||
-              sessionStorage.getItem('access_token') ||
-              sessionStorage.getItem('token');
-    }
-    
-    if (!token) return;
-
-    const wsUrl = `${WS_BASE_URL}/ws/auctions/${id}/`;
-    
-    try {
-      auctionSocketRef.current = new WebSocket(wsUrl);
-
-      auctionSocketRef.current.onmessage = (event) => {
-        try {
-          const data = JSON.parse(event.data);
-          
-          if (data.type === 'auction_extended') {
-            if (soundsEnabled) playExtensionSound();
-            
-            setExtensionMessage(
-              `⏰ Auction Extended! ${data.extended_by_seconds} seconds added due to last-minute bid!`
-            );
-            setShowExtensionNotif(true);
-            
-            setTimeout(() => setShowExtensionNotif(false), 5000);
-            
-            fetchAuction();
-            setHasPlayedFinal3(false);
-          } else if (data.type === 'send_bid_update') {
-            fetchBids();
-          } else if (data.type === 'auction_closed' || data.type === 'auction.closed') {
-            if (soundsEnabled) playHammerSound();
-          }
-        } catch (err) {
-          console.error('Error parsing auction update:', err);
-        }
-      };
-
-      auctionSocketRef.current.onerror = (error) => {
-        console.error('❌ Auction WebSocket error:', error);
-      };
-    } catch (err) {
-      console.error('Error creating auction WebSocket:', err);
-    }
-  };
-
   const calculateTimeRemaining = () => {
     if (!auction?.end_time) return;
 
@@ -406,13 +369,16 @@ const PlaceBid = () => {
   const handleSendMessage = () => {
     if (!newMessage.trim()) return;
 
-    if (!chatSocketRef.current || chatSocketRef.current.readyState !== WebSocket.OPEN) {
+    if (!streamSocketRef.current || streamSocketRef.current.readyState !== WebSocket.OPEN) {
       alert('Chat connection is not open. Please wait or refresh the page.');
       return;
     }
 
     try {
-      chatSocketRef.current.send(JSON.stringify({
+      streamSocketRef.current.send(JSON.stringify({
+        action: 'send',
+        stream: 'chat',
+        auction_id: id,
         message: newMessage.trim()
       }));
       setNewMessage('');
@@ -824,7 +790,7 @@ const PlaceBid = () => {
                   Chat disconnected
                 </p>
                 <button
-                  onClick={connectChatWebSocket}
+                  onClick={connectStreamWebSocket}
                   className="px-3 py-1 bg-red-600 text-white text-xs rounded hover:bg-red-700 transition-colors"
                 >
                   Reconnect
@@ -19,9 +19,10 @@ const Watchlist = () => {
       setLoading(true);
       setError(null);
       
-      // Get watchlisted IDs from localStorage
-      const stored = localStorage.getItem(`watchlist_${user?.email || 'buyer'}`);
-      const watchlistedIds = stored ? JSON.parse(stored) : [];
+      // Get watchlisted IDs from the server
+      const watchResponse = await axiosInstance.get('/payments/watchlist/');
+      const entries = Array.isArray(watchResponse.data) ? watchResponse.data : watchResponse.data?.results || [];
+      const watchlistedIds = entries.map(entry => entry.auction);
       
       if (watchlistedIds.length === 0) {
         setWatchlist([]);
@@ -63,13 +64,9 @@ const Watchlist = () => {
     }
   };
 
-  const removeFromWatchlist = (auctionId) => {
+  const removeFromWatchlist = async (auctionId) => {
     try {
-      const stored = localStorage.getItem(`watchlist_${user?.email || 'buyer'}`);
-      const watchlistedIds = stored ? JSON.parse(stored) : [];
-      const newIds = watchlistedIds.filter(id => id !== auctionId);
-      
-      localStorage.setItem(`watchlist_${user?.email || 'buyer'}`, JSON.stringify(newIds));
+      await axiosInstance.delete(`/payments/watchlist/${auctionId}/`);
       setWatchlist(watchlist.filter(auction => auction.id !== auctionId));
       alert('Removed from watchlist');
     } catch (err) {
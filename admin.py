@@ -1,11 +1,51 @@
 # payments/admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import PaymentMethod, Payment, WebhookEvent
+from .models import PaymentMethod, Payment, WebhookEvent, RefundJob, WatchlistEntry, ChatArchive
+from .exports import PAYMENT_EXPORT_FIELDS, stream_export
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the planner's row estimate instead of COUNT(*)
+    for unfiltered changelists on large PostgreSQL tables.
+    """
+    exact_count_threshold = 100000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if connection.vendor == "postgresql" and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [query.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.exact_count_threshold:
+                return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings shared by the payment tables, which grow without bound.
+
+    Subclasses should not set date_hierarchy, its drill-down runs a
+    DISTINCT over every date in the table. Filter dates with
+    DateFieldListFilter instead, which only adds a bounded range.
+    Search fields should be exact ("=") lookups on indexed columns.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
 
 
 @admin.register(PaymentMethod)
-class PaymentMethodAdmin(admin.ModelAdmin):
+class PaymentMethodAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "user",
@@ -15,8 +55,9 @@ class PaymentMethodAdmin(admin.ModelAdmin):
         "is_default",
         "created_at",
     )
-    list_filter = ("card_brand", "is_default", "created_at")
-    search_fields = ("user__email", "user__username", "last_four_digits")
+    list_filter = ("card_brand", "is_default", ("created_at", admin.DateFieldListFilter))
+    list_select_related = ("user",)
+    search_fields = ("=user__email", "=user__username", "=last_four_digits")
     readonly_fields = (
         "stripe_payment_method_id",
         "card_brand",
@@ -75,7 +116,7 @@ class PaymentMethodAdmin(admin.ModelAdmin):
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "user",
@@ -85,8 +126,10 @@ class PaymentAdmin(admin.ModelAdmin):
         "paid_at",
         "created_at",
     )
-    list_filter = ("status", "currency", "created_at")
-    search_fields = ("user__email", "user__username", "stripe_payment_intent_id", "stripe_charge_id")
+    list_filter = ("status", "currency", ("created_at", admin.DateFieldListFilter))
+    list_select_related = ("user",)
+    search_fields = ("=user__email", "=user__username", "=stripe_payment_intent_id", "=stripe_charge_id")
+    actions = ("bulk_refund_selected", "export_selected_csv", "export_selected_jsonl")
     readonly_fields = (
         "id",
         "user",
@@ -157,6 +200,32 @@ class PaymentAdmin(admin.ModelAdmin):
         return "No errors"
     error_details.short_description = "Error Information"
 
+    @admin.action(description="Refund selected payments")
+    def bulk_refund_selected(self, request, queryset):
+        from .bulk_refunds import create_refund_job
+        from .tasks import process_bulk_refund
+
+        payment_ids = list(queryset.filter(status="succeeded").values_list("id", flat=True))
+        if not payment_ids:
+            self.message_user(request, "No succeeded payments selected.", level=messages.WARNING)
+            return
+
+        job = create_refund_job(payment_ids, user=request.user, reason="Admin bulk refund")
+        transaction.on_commit(lambda: process_bulk_refund.delay(job.id))
+        self.message_user(
+            request,
+            f"Refund job {job.id} queued for {job.total} payments.",
+            level=messages.SUCCESS,
+        )
+
+    @admin.action(description="Export selected payments (CSV)")
+    def export_selected_csv(self, request, queryset):
+        return stream_export(queryset.order_by("id"), PAYMENT_EXPORT_FIELDS, "csv", "payments")
+
+    @admin.action(description="Export selected payments (JSONL)")
+    def export_selected_jsonl(self, request, queryset):
+        return stream_export(queryset.order_by("id"), PAYMENT_EXPORT_FIELDS, "jsonl", "payments")
+
     def has_add_permission(self, request):
         return False  # Payments should only be created via API
 
@@ -165,10 +234,10 @@ class PaymentAdmin(admin.ModelAdmin):
 
 
 @admin.register(WebhookEvent)
-class WebhookEventAdmin(admin.ModelAdmin):
+class WebhookEventAdmin(LargeTableAdmin):
     list_display = ("id", "event_type", "stripe_event_id_short", "processed_at")
-    list_filter = ("event_type", "processed_at")
-    search_fields = ("stripe_event_id", "event_type")
+    list_filter = ("event_type", ("processed_at", admin.DateFieldListFilter))
+    search_fields = ("=stripe_event_id", "=event_type")
     readonly_fields = ("stripe_event_id", "event_type", "processed_at")
 
     def stripe_event_id_short(self, obj):
@@ -179,4 +248,55 @@ class WebhookEventAdmin(admin.ModelAdmin):
         return False
 
     def has_delete_permission(self, request, obj=None):
-        return request.user.is_superuser  # Only superuser can delete webhook events
\ No newline at end of file
+        return request.user.is_superuser  # Only superuser can delete webhook events
+
+
+@admin.register(RefundJob)
+class RefundJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "created_by", "progress_display", "succeeded", "failed", "created_at", "finished_at")
+    list_filter = ("status", "created_at")
+    list_select_related = ("created_by",)
+    readonly_fields = (
+        "created_by",
+        "status",
+        "reason",
+        "payment_ids",
+        "errors",
+        "total",
+        "processed",
+        "succeeded",
+        "failed",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+
+    def progress_display(self, obj):
+        return f"{obj.processed}/{obj.total}"
+    progress_display.short_description = "Progress"
+
+    def has_add_permission(self, request):
+        return False  # Refund jobs are started from the Payment changelist or the API
+
+    def has_delete_permission(self, request, obj=None):
+        return False  # Keep an audit trail of refunds
+
+
+@admin.register(WatchlistEntry)
+class WatchlistEntryAdmin(LargeTableAdmin):
+    list_display = ("user", "auction", "created_at")
+    list_select_related = ("user", "auction")
+    search_fields = ("=user__email", "=auction__id")
+    raw_id_fields = ("user", "auction")
+
+
+@admin.register(ChatArchive)
+class ChatArchiveAdmin(LargeTableAdmin):
+    list_display = ("auction", "message_count", "size_bytes", "first_message_at", "last_message_at", "archived_at")
+    list_select_related = ("auction",)
+    search_fields = ("=auction__id",)
+    exclude = ("data",)
+    readonly_fields = ("auction", "message_count", "size_bytes", "first_message_at", "last_message_at", "archived_at")
+
+    def has_add_permission(self, request):
+        return False  # Archives are written by the archive_closed_auction_chats task
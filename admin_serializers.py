@@ -0,0 +1,44 @@
+# auctions/admin_serializers.py
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from .models import AuctionItem
+
+
+class AdminAuctionListSerializer(serializers.ModelSerializer):
+    """
+    List-mode serializer for the admin auction table.
+    Reads the bid_count/max_bid/first_image annotations from
+    AdminAuctionListView instead of rendering every bid and image.
+    """
+    seller = serializers.CharField(source='seller.email', read_only=True, default=None)
+    winner = serializers.CharField(source='winner.email', read_only=True, default=None)
+    bid_count = serializers.IntegerField(read_only=True)
+    max_bid = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    first_image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AuctionItem
+        fields = [
+            'id',
+            'item_name',
+            'category',
+            'condition',
+            'status',
+            'seller',
+            'winner',
+            'starting_price',
+            'current_price',
+            'start_time',
+            'end_time',
+            'bid_count',
+            'max_bid',
+            'first_image',
+        ]
+        read_only_fields = fields
+
+    def get_first_image(self, obj):
+        if not obj.first_image:
+            return None
+        url = default_storage.url(obj.first_image)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
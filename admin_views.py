@@ -6,21 +6,38 @@ from rest_framework import generics, permissions, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Sum, Count, Q
+from django.db.models import Sum, Count, Max, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .serializers import DisputeSerializer, AuctionItemSerializer
+from .admin_serializers import AdminAuctionListSerializer
 from django.utils.timezone import now, timedelta
 from django.db.models.functions import TruncDay
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from django.core.cache import cache
+from payments import bid_log, rollups
+from payments.stats import get_counters
+from payments.search import AuctionSearchFilter
+from payments.exports import AUCTION_EXPORT_FIELDS, BID_EXPORT_FIELDS, parse_day, stream_export
+from datetime import date
 
 User = get_user_model()
 
+DISPUTE_COUNTS_CACHE_SECONDS = getattr(settings, 'DISPUTE_COUNTS_CACHE_SECONDS', 60)
+
 class AdminPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
 
+class AdminCursorPagination(CursorPagination):
+    """Keyset pagination for admin lists, so deep pages cost the same as the first"""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
 class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user and (request.user.is_staff or request.user.is_superuser)
@@ -28,31 +45,87 @@ class IsAdminUser(permissions.BasePermission):
 
 # ========== AUCTION MANAGEMENT ==========
 
+class AdminAuctionCursorPagination(AdminCursorPagination):
+    """
+    Keyset pagination over AdminAuctionListView.cursor_ordering_fields.
+
+    Those are limited to fields that never change after an auction is
+    listed, since a cursor positioned on a value that moves (such as
+    current_price) skips or repeats rows. id is always appended so rows
+    with equal values have a stable order.
+    """
+    ordering = ("-start_time", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
+
+
 class AdminAuctionListView(generics.ListAPIView):
     """
     Admin endpoint to list all auctions with advanced filtering
     GET /admin/auctions/
     
     Query Parameters:
-    - search: Search by item_name, description, seller email
+    - search: Ranked prefix search over item name, category, description and seller
     - status: Filter by status (active, closed, pending, cancelled)
     - category: Filter by category
     - condition: Filter by condition
     - start_date: Filter auctions starting after this date
     - end_date: Filter auctions ending before this date
-    - page: Page number
+    - ordering: One of ordering_fields, optionally prefixed with "-". Prices
+      can only be ordered on with ?page=
+    - cursor: Keyset cursor from the previous response's next/previous link
+    - page: Page number (legacy offset pagination, slower on deep pages)
     - page_size: Results per page (default 20)
     """
-    serializer_class = AuctionItemSerializer
+    serializer_class = AdminAuctionListSerializer
     permission_classes = [IsAdminUser]
-    pagination_class = AdminPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['item_name', 'description', 'seller__email', 'seller__first_name', 'seller__last_name']
-    ordering_fields = ['start_time', 'end_time', 'starting_price', 'current_price', 'id']
-    ordering = ['-start_time']
+    filter_backends = [AuctionSearchFilter, filters.OrderingFilter]
+    # Immutable fields only for keyset pages, see AdminAuctionCursorPagination
+    cursor_ordering_fields = ['start_time', 'end_time', 'id']
+    page_ordering_fields = ['start_time', 'end_time', 'starting_price', 'current_price', 'id']
+    ordering = ['-start_time', '-id']
+
+    @property
+    def page_numbered(self):
+        # Keep ?page= working for existing clients, everything else pages by keyset
+        return "page" in self.request.query_params
+
+    @property
+    def ordering_fields(self):
+        return self.page_ordering_fields if self.page_numbered else self.cursor_ordering_fields
+
+    @property
+    def pagination_class(self):
+        return AdminPagination if self.page_numbered else AdminAuctionCursorPagination
 
     def get_queryset(self):
-        queryset = AuctionItem.objects.select_related('seller', 'winner').prefetch_related('images', 'bids').all()
+        bids = Bid.objects.filter(auction_item=OuterRef('pk')).order_by().values('auction_item')
+        images_rel = AuctionItem._meta.get_field('images')
+        first_image = (
+            images_rel.related_model.objects
+            .filter(**{images_rel.field.name: OuterRef('pk')})
+            .order_by('pk')
+            .values('image')[:1]
+        )
+
+        # Correlated subqueries only run for the rows on the page, unlike a GROUP BY over all bids
+        queryset = (
+            AuctionItem.objects.select_related('seller', 'winner')
+            .only(
+                'id', 'item_name', 'category', 'condition', 'status',
+                'starting_price', 'current_price', 'start_time', 'end_time',
+                'seller__email', 'winner__email',
+            )
+            .annotate(
+                bid_count=Coalesce(Subquery(bids.annotate(c=Count('*')).values('c')), 0),
+                max_bid=Subquery(bids.annotate(m=Max('amount')).values('m')),
+                first_image=Subquery(first_image),
+            )
+        )
         
         # Status filter
         status = self.request.query_params.get('status', None)
@@ -92,6 +165,65 @@ class AdminAuctionListView(generics.ListAPIView):
         return Response(serializer.data)
 
 
+class AdminAuctionExportView(AdminAuctionListView):
+    """
+    Stream every auction matching the admin list filters
+    GET /admin/auctions/export/?export_format=csv|jsonl
+
+    Accepts the same search, filter and ordering parameters as /admin/auctions/,
+    plus ordering by price since the export is not paginated.
+    """
+    pagination_class = None
+    ordering_fields = ['start_time', 'end_time', 'starting_price', 'current_price', 'id']
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'csv')
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            return stream_export(queryset, AUCTION_EXPORT_FIELDS, export_format, 'auctions')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+
+class AdminBidExportView(APIView):
+    """
+    Stream bids for admins
+    GET /admin/bids/export/?export_format=csv|jsonl
+
+    Query Parameters:
+    - auction_id: Only bids on this auction
+    - start_date / end_date: Filter by bid time (YYYY-MM-DD)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        export_format = request.query_params.get('export_format', 'csv')
+        queryset = Bid.objects.order_by('id')
+
+        auction_id = request.query_params.get('auction_id')
+        if auction_id:
+            if not auction_id.isdigit():
+                return Response({'error': 'Invalid auction_id'}, status=400)
+            queryset = queryset.filter(auction_item_id=auction_id)
+
+        # end_date is inclusive, so bound on the start of the following day
+        try:
+            start_date = request.query_params.get('start_date')
+            if start_date:
+                queryset = queryset.filter(created_at__gte=parse_day(start_date))
+
+            end_date = request.query_params.get('end_date')
+            if end_date:
+                queryset = queryset.filter(created_at__lt=parse_day(end_date) + timedelta(days=1))
+        except ValueError as e:
+            return Response({'error': f'Invalid date: {e}'}, status=400)
+
+        try:
+            return stream_export(queryset, BID_EXPORT_FIELDS, export_format, 'bids')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def close_auction_api(request, auction_id):
@@ -196,22 +328,15 @@ class AdminReportView(APIView):
 
     def get(self, request):
         try:
-            total_users = User.objects.count()
-            total_auctions = AuctionItem.objects.count()
-            active_auctions = AuctionItem.objects.filter(status="active").count()
-            total_bids = Bid.objects.count()
-            
-            # Use current_price sum for closed auctions
-            total_revenue = AuctionItem.objects.filter(status="closed").aggregate(
-                Sum("current_price")
-            )["current_price__sum"] or 0
+            # Incrementally maintained totals instead of full-table aggregates
+            counters = get_counters()
 
             return Response({
-                "total_users": total_users,
-                "total_auctions": total_auctions,
-                "active_auctions": active_auctions,
-                "total_bids": total_bids,
-                "total_revenue": float(total_revenue),
+                "total_users": int(counters["total_users"]),
+                "total_auctions": int(counters["total_auctions"]),
+                "active_auctions": int(counters["active_auctions"]),
+                "total_bids": int(counters["total_bids"]),
+                "total_revenue": float(counters["total_revenue"]),
             })
         except Exception as e:
             import traceback
@@ -224,64 +349,51 @@ class AdminReportView(APIView):
 
 
 class AdminAnalyticsView(APIView):
+    """
+    Admin analytics served from the daily per-category rollups
+    GET /admin/analytics/
+
+    Query Parameters:
+    - days: Window for every series (default 7 for bids, 30 for revenue and categories)
+    - start_date / end_date: Explicit window (YYYY-MM-DD), overrides days
+    """
     permission_classes = [IsAdminUser]
 
+    def get_ranges(self):
+        start_date = self.request.query_params.get('start_date')
+        end_date = self.request.query_params.get('end_date')
+        if start_date or end_date:
+            end = date.fromisoformat(end_date) if end_date else now().date()
+            start = date.fromisoformat(start_date) if start_date else end - timedelta(days=30)
+            return (start, end), (start, end), (start, end)
+
+        days = self.request.query_params.get('days')
+        if days:
+            days = min(max(int(days), 1), 3660)
+            window = rollups.default_range(days)
+            return window, window, window
+
+        # Categories over the revenue window, all time would read every rollup row
+        return rollups.default_range(7), rollups.default_range(30), rollups.default_range(30)
+
     def get(self, request):
         try:
-            # Bids per day (last 7 days)
-            last_week = now() - timedelta(days=7)
-            bids_per_day = (
-                Bid.objects.filter(created_at__gte=last_week)
-                .annotate(day=TruncDay("created_at"))
-                .values("day")
-                .annotate(count=Count("id"))
-                .order_by("day")
-            )
+            bids_range, revenue_range, category_range = self.get_ranges()
 
-            # Convert to list and format dates
-            bids_data = []
-            for item in bids_per_day:
-                bids_data.append({
-                    "day": item["day"].strftime("%Y-%m-%d") if item["day"] else "",
-                    "count": item["count"]
-                })
-
-            # Auctions by category
-            auctions_by_category = []
-            try:
-                category_data = (
-                    AuctionItem.objects.values("category")
-                    .annotate(count=Count("id"))
-                    .order_by("-count")
-                )
-                for item in category_data:
-                    auctions_by_category.append({
-                        "category__name": item["category"],
-                        "count": item["count"]
-                    })
-            except Exception as e:
-                print(f"Category aggregation error: {e}")
-                auctions_by_category = []
-
-            # Revenue trend (last 30 days)
-            last_month = now() - timedelta(days=30)
-            revenue_trend = (
-                AuctionItem.objects.filter(
-                    status="closed", 
-                    end_time__gte=last_month
-                )
-                .annotate(day=TruncDay("end_time"))
-                .values("day")
-                .annotate(total=Sum("current_price"))
-                .order_by("day")
-            )
+            bids_data = [
+                {"day": day.strftime("%Y-%m-%d"), "count": int(total)}
+                for day, total in rollups.daily_totals(*bids_range, "bid_count")
+            ]
 
-            revenue_data = []
-            for item in revenue_trend:
-                revenue_data.append({
-                    "day": item["day"].strftime("%Y-%m-%d") if item["day"] else "",
-                    "total": float(item["total"]) if item["total"] else 0
-                })
+            auctions_by_category = [
+                {"category__name": category, "count": int(total)}
+                for category, total in rollups.category_totals("auctions_opened", *category_range)
+            ]
+
+            revenue_data = [
+                {"day": day.strftime("%Y-%m-%d"), "total": float(total)}
+                for day, total in rollups.daily_totals(*revenue_range, "revenue")
+            ]
 
             data = {
                 "bids_per_day": bids_data,
@@ -291,6 +403,8 @@ class AdminAnalyticsView(APIView):
 
             return Response(data)
 
+        except ValueError as e:
+            return Response({"error": f"Invalid date range: {e}"}, status=400)
         except Exception as e:
             import traceback
             print(f"Analytics error: {str(e)}")
@@ -307,44 +421,148 @@ class AdminAnalyticsView(APIView):
             )
 
 
+class AdminBiddingReportView(APIView):
+    """
+    Vectorized bidding and revenue report (see payments/analytics.py)
+    GET /admin/analytics/bidding/
+
+    Query Parameters:
+    - days: Window ending now (default 30)
+    - start_date / end_date: Explicit window (YYYY-MM-DD, project time zone),
+      overrides days. Both are capped at max_days.
+    """
+    permission_classes = [IsAdminUser]
+    max_days = 3660
+
+    def get_window(self):
+        start_date = self.request.query_params.get('start_date')
+        end_date = self.request.query_params.get('end_date')
+        if start_date or end_date:
+            # Same day boundaries as the exports
+            end = parse_day(end_date) + timedelta(days=1) if end_date else now()
+            start = parse_day(start_date) if start_date else end - timedelta(days=30)
+            return max(start, end - timedelta(days=self.max_days)), end
+
+        days = min(max(int(self.request.query_params.get('days', 30)), 1), self.max_days)
+        return now() - timedelta(days=days), now()
+
+    def get(self, request):
+        try:
+            from payments import analytics
+        except ImportError:
+            return Response({"error": "Bidding reports need numpy installed"}, status=501)
+
+        try:
+            start, end = self.get_window()
+        except ValueError as e:
+            return Response({"error": f"Invalid date range: {e}"}, status=400)
+        if start >= end:
+            return Response({"error": "start_date must be before end_date"}, status=400)
+
+        return Response(analytics.bidding_report(start, end))
+
+
 # ========== DISPUTE MANAGEMENT ==========
 
+def dispute_status_counts():
+    """Disputes per status plus 'total', cached so the list's tabs cost one GROUP BY per DISPUTE_COUNTS_CACHE_SECONDS"""
+    counts = cache.get("admin:dispute_counts")
+    if counts is None:
+        counts = dict(Dispute.objects.order_by().values_list("status").annotate(count=Count("id")))
+        counts["total"] = sum(counts.values())
+        cache.set("admin:dispute_counts", counts, DISPUTE_COUNTS_CACHE_SECONDS)
+    return counts
+
+
 class DisputeListView(generics.ListAPIView):
+    """
+    Admin endpoint to list disputes, newest first
+    GET /admin/disputes/
+
+    Query Parameters:
+    - status: Filter by status (pending, in_progress, resolved, rejected)
+    - created_after / created_before: Filter by creation date (YYYY-MM-DD)
+    - cursor: Opaque cursor from the previous page's next/previous link
+    - page_size: Results per page (default 20)
+    - counts: When set, adds "counts" of all disputes per status (cached,
+      up to DISPUTE_COUNTS_CACHE_SECONDS old)
+    """
     permission_classes = [IsAdminUser]
-    
+    pagination_class = AdminCursorPagination
+
+    # Flat columns fetched in one joined query instead of per-row lookups
+    list_fields = (
+        "id",
+        "order_id",
+        "order__auction_item__item_name",
+        "raised_by__email",
+        "against__email",
+        "status",
+        "created_at",
+        "resolved_at",
+    )
+
+    def get_queryset(self):
+        queryset = Dispute.objects.all()
+
+        status = self.request.query_params.get("status")
+        if status:
+            queryset = queryset.filter(status=status)
+
+        # Datetime bounds instead of a __date cast, so the created_at index is used
+        created_after = self.request.query_params.get("created_after")
+        if created_after:
+            queryset = queryset.filter(created_at__gte=parse_day(created_after))
+
+        created_before = self.request.query_params.get("created_before")
+        if created_before:
+            queryset = queryset.filter(created_at__lt=parse_day(created_before) + timedelta(days=1))
+
+        return queryset
+
+    @staticmethod
+    def serialize_row(row):
+        return {
+            "id": row["id"],
+            "order": {
+                "id": row["order_id"],
+                "auction": {
+                    "item_name": row["order__auction_item__item_name"]
+                },
+            },
+            "raised_by": {
+                "email": row["raised_by__email"]
+            },
+            "against": {
+                "email": row["against__email"]
+            },
+            "status": row["status"],
+            "created_at": row["created_at"].isoformat(),
+            "resolved_at": row["resolved_at"].isoformat() if row["resolved_at"] else None,
+        }
+
     def get(self, request):
         try:
-            disputes = Dispute.objects.all().order_by("-created_at")
-            
-            dispute_data = []
-            for dispute in disputes:
-                dispute_data.append({
-                    "id": dispute.id,
-                    "order": {
-                        "id": dispute.order.id if hasattr(dispute, 'order') else None,
-                        "auction": {
-                            "item_name": dispute.order.auction.item_name if hasattr(dispute.order, 'auction') else None
-                        } if hasattr(dispute, 'order') else {}
-                    },
-                    "raised_by": {
-                        "email": dispute.raised_by.email if dispute.raised_by else None
-                    },
-                    "against": {
-                        "email": dispute.against.email if dispute.against else None
-                    },
-                    "status": dispute.status,
-                    "created_at": dispute.created_at.isoformat(),
-                    "resolved_at": dispute.resolved_at.isoformat() if dispute.resolved_at else None,
-                })
-            
-            return Response({
-                "results": dispute_data,
-                "count": len(dispute_data)
-            })
+            queryset = self.get_queryset()
+        except ValueError as e:
+            return Response({"error": f"Invalid date: {e}"}, status=400)
+
+        try:
+            page = self.paginate_queryset(queryset.values(*self.list_fields))
+
+            # No per-page count: a COUNT(*) per page would undo the keyset pagination
+            data = {
+                "results": [self.serialize_row(row) for row in page],
+                "next": self.paginator.get_next_link(),
+                "previous": self.paginator.get_previous_link(),
+            }
+            if request.query_params.get("counts"):
+                data["counts"] = dispute_status_counts()
+            return Response(data)
         except Exception as e:
             print(f"Dispute list error: {str(e)}")
             return Response(
-                {"results": [], "count": 0, "error": str(e)},
+                {"results": [], "next": None, "previous": None, "error": str(e)},
                 status=200
             )
 
@@ -386,6 +604,11 @@ class DisputeDetailView(generics.RetrieveUpdateAPIView):
                 "admin_notes": [],
             }
             
+            # Replay of the disputed auction from this host's bid event log
+            auction_id = dispute.order.auction_item_id if dispute.order_id else None
+            if auction_id is not None:
+                dispute_data["bid_log"] = bid_log.replay_state(auction_id)
+            
             return Response(dispute_data)
         except Dispute.DoesNotExist:
             return Response(
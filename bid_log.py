@@ -0,0 +1,322 @@
+# payments/bid_log.py
+"""
+Append-only log of bid and close events, one directory per auction.
+
+Events are fixed-width binary records appended to numbered segment files
+(<BID_LOG_DIR>/<auction_id>/00000001.seg, ...). A segment is closed once it
+reaches BID_LOG_SEGMENT_BYTES and the next one is started. Each record is a
+single O_APPEND write, so concurrent workers never interleave records.
+
+Replay maps each segment with mmap and decodes it with struct.iter_unpack,
+which runs at millions of events per second. Events are written from model
+signals after commit (see signals.py); rebuild_bid_log backfills the log
+from Bid rows.
+
+BID_LOG_DIR is a directory on local disk. Each host only logs the bids
+its own workers accepted, so a replay sees the bids written by the same
+host. Point BID_LOG_DIR at storage shared by every host, or run
+rebuild_bid_log, before relying on replays across a multi-host deploy.
+"""
+import logging
+import mmap
+import os
+import shutil
+import struct
+from collections import namedtuple
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Local disk, replays only see bids logged by this host (see above)
+BID_LOG_DIR = getattr(settings, 'BID_LOG_DIR', os.path.join(str(getattr(settings, 'BASE_DIR', '.')), 'var', 'bid_log'))
+BID_LOG_SEGMENT_BYTES = getattr(settings, 'BID_LOG_SEGMENT_BYTES', 16 * 1024 * 1024)
+BID_LOG_FSYNC = getattr(settings, 'BID_LOG_FSYNC', False)
+BID_LOG_ENABLED = getattr(settings, 'BID_LOG_ENABLED', True)
+
+BID = 1
+RETRACT = 2
+CLOSE = 3
+
+# kind, timestamp (µs since epoch), bid id, user id, amount (cents)
+RECORD = struct.Struct('<B7xqqqq')
+SEGMENT_SUFFIX = '.seg'
+
+Event = namedtuple('Event', 'kind timestamp bid_id user_id amount')
+
+
+def auction_dir(auction_id):
+    return os.path.join(BID_LOG_DIR, str(int(auction_id)))
+
+
+def segment_paths(auction_id):
+    """Segments of an auction, oldest first"""
+    return _segments(auction_dir(auction_id))
+
+
+def _segments(directory):
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names]
+
+
+def to_micros(moment):
+    return int(moment.timestamp() * 1_000_000)
+
+
+def from_micros(micros):
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+def to_cents(amount):
+    return int((Decimal(amount or 0) * 100).to_integral_value())
+
+
+def _active_segment(directory):
+    """Path to append to, rolling over to a new segment when the last one is full"""
+    paths = _segments(directory)
+    if paths and os.path.getsize(paths[-1]) + RECORD.size <= BID_LOG_SEGMENT_BYTES:
+        return paths[-1]
+
+    os.makedirs(directory, exist_ok=True)
+    number = int(os.path.basename(paths[-1])[:-len(SEGMENT_SUFFIX)]) + 1 if paths else 1
+    return os.path.join(directory, f"{number:08d}{SEGMENT_SUFFIX}")
+
+
+def append(auction_id, kind, timestamp, bid_id=0, user_id=0, amount=0):
+    """Append one event to an auction's log"""
+    record = RECORD.pack(kind, to_micros(timestamp), bid_id or 0, user_id or 0, to_cents(amount))
+    fd = os.open(_active_segment(auction_dir(auction_id)), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, record)
+        if BID_LOG_FSYNC:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def append_many(auction_id, events):
+    """
+    Append (kind, timestamp, bid_id, user_id, amount) tuples in order,
+    one write per segment. Used by the backfill.
+    """
+    return _append_events(auction_dir(auction_id), events)
+
+
+def _append_events(directory, events):
+    buffer = bytearray()
+    for kind, timestamp, bid_id, user_id, amount in events:
+        buffer += RECORD.pack(kind, to_micros(timestamp), bid_id or 0, user_id or 0, to_cents(amount))
+    return _append_records(directory, buffer)
+
+
+def _append_records(directory, buffer):
+    """Write packed records, one write per segment"""
+    written = 0
+    while written < len(buffer):
+        path = _active_segment(directory)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        room = max(RECORD.size, (BID_LOG_SEGMENT_BYTES - size) // RECORD.size * RECORD.size)
+        with open(path, 'ab') as segment:
+            segment.write(buffer[written:written + room])
+        written += room
+    return len(buffer) // RECORD.size
+
+
+def delete_log(auction_id):
+    for path in segment_paths(auction_id):
+        os.remove(path)
+
+
+def iter_records(auction_id):
+    """
+    Raw (kind, timestamp, bid_id, user_id, amount) tuples of an auction,
+    in append order. A torn record at the end of a segment is skipped.
+    """
+    return _read_segments(segment_paths(auction_id))
+
+
+def _logged_records(auction_id):
+    """Number of whole records in an auction's log"""
+    return sum(os.path.getsize(path) // RECORD.size for path in segment_paths(auction_id))
+
+
+def _read_segments(paths):
+    for path in paths:
+        with open(path, 'rb') as segment:
+            size = os.fstat(segment.fileno()).st_size // RECORD.size * RECORD.size
+            if not size:
+                continue
+            with mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield from RECORD.iter_unpack(view[:size])
+                finally:
+                    view.release()
+
+
+def iter_events(auction_id):
+    """Events of an auction with timestamps and amounts decoded"""
+    for kind, micros, bid_id, user_id, cents in iter_records(auction_id):
+        yield Event(kind, from_micros(micros), bid_id, user_id, Decimal(cents) / 100)
+
+
+def replay_state(auction_id):
+    """
+    Rebuild an auction's bidding state from its log.
+
+    Retracted bids are removed and the leader recomputed from the
+    remaining ones.
+
+    Returns:
+        dict: Bid counts, current price and leader, winner if closed
+    """
+    live = {}  # bid id -> (cents, user id, micros)
+    bids = retracted = 0
+    bidders = set()
+    closed = None
+
+    for kind, micros, bid_id, user_id, cents in iter_records(auction_id):
+        if kind == BID:
+            live[bid_id] = (cents, user_id, micros)
+            bidders.add(user_id)
+            bids += 1
+        elif kind == RETRACT:
+            if live.pop(bid_id, None) is not None:
+                retracted += 1
+        elif kind == CLOSE:
+            closed = (micros, user_id, cents)
+
+    leader = max(live.values(), key=lambda bid: (bid[0], -bid[2]), default=None)
+    return {
+        'auction_id': int(auction_id),
+        'bid_count': bids,
+        'retracted': retracted,
+        'bidders': len(bidders),
+        'current_price': str(Decimal(leader[0]) / 100) if leader else None,
+        'leader_id': leader[1] if leader else None,
+        'closed_at': from_micros(closed[0]).isoformat() if closed else None,
+        'winner_id': (closed[1] or None) if closed else None,
+        'final_price': str(Decimal(closed[2]) / 100) if closed else None,
+    }
+
+
+def price_history(auction_id):
+    """
+    (timestamp, price) each time the leading bid went up, oldest first.
+    Retractions are ignored, the history shows what bidders saw.
+    """
+    history = []
+    high = 0
+    for kind, micros, _, _, cents in iter_records(auction_id):
+        if kind == BID and cents > high:
+            high = cents
+            history.append((from_micros(micros), Decimal(cents) / 100))
+    return history
+
+
+def log_bid(bid):
+    try:
+        append(bid.auction_item_id, BID, bid.created_at, bid.pk, bid.user_id, bid.amount)
+    except OSError as e:
+        logger.error(f"Failed to log bid {bid.pk}: {e}")
+
+
+def log_retraction(bid, when):
+    try:
+        append(bid.auction_item_id, RETRACT, when, bid.pk, bid.user_id, bid.amount)
+    except OSError as e:
+        logger.error(f"Failed to log retraction of bid {bid.pk}: {e}")
+
+
+def log_close(auction, when):
+    try:
+        append(auction.pk, CLOSE, when, 0, getattr(auction, 'winner_id', None), auction.current_price)
+    except OSError as e:
+        logger.error(f"Failed to log close of auction {auction.pk}: {e}")
+
+
+def rebuild(auction_ids=None, batch_size=5000):
+    """
+    Rewrite the logs of the given auctions (all by default) from
+    Bid rows, ordered by (created_at, id), followed by the close event.
+
+    Each log is written to a staging directory and swapped in with
+    os.replace, so live appends never land in a half-written log.
+
+    Returns:
+        int: Events written
+    """
+    from auctions.models import AuctionItem
+
+    auctions = AuctionItem.objects.order_by('pk')
+    if auction_ids is not None:
+        auctions = auctions.filter(pk__in=auction_ids)
+
+    written = 0
+    for auction in auctions.only('id', 'status', 'end_time', 'current_price', 'winner').iterator(chunk_size=500):
+        written += _rebuild_auction(auction, batch_size)
+    return written
+
+
+def _rebuild_auction(auction, batch_size):
+    from auctions.models import Bid
+
+    directory = auction_dir(auction.pk)
+    staging = directory + '.rebuild'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    # Anything appended past this point arrived while the rows were read
+    logged = _logged_records(auction.pk)
+    bid_ids = set()
+
+    def bid_events():
+        bids = (
+            Bid.objects.filter(auction_item_id=auction.pk)
+            .order_by('created_at', 'id')
+            .values_list('created_at', 'id', 'user_id', 'amount')
+            .iterator(chunk_size=batch_size)
+        )
+        for created_at, bid_id, user_id, amount in bids:
+            bid_ids.add(bid_id)
+            yield BID, created_at, bid_id, user_id, amount
+
+    written = _append_events(staging, bid_events())
+    closed = auction.status == 'closed'
+    if closed:
+        written += _append_events(staging, [
+            (CLOSE, auction.end_time, 0, getattr(auction, 'winner_id', None), auction.current_price)
+        ])
+
+    # os.replace only overwrites an empty directory: retire the live log
+    # first, and again if an append recreates it before the swap
+    retired = []
+    while True:
+        if os.path.isdir(directory):
+            old = f"{directory}.old{len(retired)}"
+            shutil.rmtree(old, ignore_errors=True)
+            os.rename(directory, old)
+            retired.append(old)
+        try:
+            os.replace(staging, directory)
+            break
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+    # Carry over what was appended during the rebuild and is not in the rows
+    late = bytearray()
+    records = _read_segments([path for old in retired for path in _segments(old)])
+    for index, (kind, micros, bid_id, user_id, cents) in enumerate(records):
+        if index < logged or (kind == BID and bid_id in bid_ids) or (kind == CLOSE and closed):
+            continue
+        late += RECORD.pack(kind, micros, bid_id, user_id, cents)
+    written += _append_records(directory, late)
+    for old in retired:
+        shutil.rmtree(old, ignore_errors=True)
+    return written
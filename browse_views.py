@@ -0,0 +1,92 @@
+# auctions/browse_views.py
+"""
+Public browse (/api/auctions/browse/) and detail (/api/auctions/browse/<id>/)
+endpoints used by BrowseAuctions.jsx, GuestBrowseAuctions.jsx and
+AuctionDetail.jsx. Searches go through the inverted index
+(payments/search.py), listings are served from the listing cache
+(listing_cache.py) and details from the rendered-response cache
+(response_cache.py).
+
+Route them with urls_browse.py, included ahead of the app's other
+/api/auctions/ routes. Both views only serve GET, so they are mounted
+under browse/ and leave the app's create, update and delete routes alone.
+"""
+from decimal import Decimal, InvalidOperation
+
+from rest_framework import filters, generics, permissions
+from rest_framework.pagination import PageNumberPagination
+
+from payments.search import AuctionSearchFilter
+from .listing_cache import CachedListingMixin
+from .models import AuctionItem
+from .response_cache import CachedAuctionDetailMixin
+from .serializers import AuctionItemSerializer
+
+
+def parse_price(value):
+    """Decimal price from a query parameter, None if missing or malformed"""
+    try:
+        return Decimal(value) if value else None
+    except InvalidOperation:
+        return None
+
+
+class BrowsePagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class AuctionListView(CachedListingMixin, generics.ListAPIView):
+    """
+    Browse auctions
+    GET /api/auctions/browse/
+
+    Query Parameters:
+    - search: Ranked prefix search over item name, category, description and seller
+    - status, category, condition: Exact filters
+    - min_price / max_price: Bounds on the current price
+    - ordering: One of ordering_fields, optionally prefixed with "-"
+    - page / page_size: Pagination
+
+    Every parameter that changes the results must be in
+    listing_cache.LISTING_PARAMS, or pages will share a cache key.
+    """
+    serializer_class = AuctionItemSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = BrowsePagination
+    filter_backends = [AuctionSearchFilter, filters.OrderingFilter]
+    ordering_fields = ['start_time', 'end_time', 'starting_price', 'current_price', 'item_name']
+    ordering = ['-start_time', '-id']
+
+    def get_queryset(self):
+        queryset = AuctionItem.objects.select_related('seller').prefetch_related('images')
+        params = self.request.query_params
+
+        for field in ('status', 'category', 'condition'):
+            value = params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+
+        min_price = parse_price(params.get('min_price'))
+        if min_price is not None:
+            queryset = queryset.filter(current_price__gte=min_price)
+
+        max_price = parse_price(params.get('max_price'))
+        if max_price is not None:
+            queryset = queryset.filter(current_price__lte=max_price)
+
+        return queryset
+
+
+class AuctionDetailView(CachedAuctionDetailMixin, generics.RetrieveAPIView):
+    """
+    Auction detail, polled by AuctionDetail.jsx
+    GET /api/auctions/browse/<id>/
+
+    Responses carry an ETag, polls sending If-None-Match get a 304 until
+    a bid lands or the auction changes.
+    """
+    serializer_class = AuctionItemSerializer
+    permission_classes = [permissions.AllowAny]
+    queryset = AuctionItem.objects.select_related('seller').prefetch_related('images')
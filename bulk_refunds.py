@@ -0,0 +1,176 @@
+# payments/bulk_refunds.py
+"""
+Bulk refund engine for admins.
+Sends refunds through a bounded worker pool and applies the results
+to Payment and Order in batches.
+"""
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Payment, RefundJob
+from .stripe_utils import StripePaymentHandler
+
+logger = logging.getLogger(__name__)
+
+# Stripe allows ~100 write requests/sec in live mode, keep well below that
+BULK_REFUND_MAX_WORKERS = getattr(settings, 'BULK_REFUND_MAX_WORKERS', 8)
+BULK_REFUND_BATCH_SIZE = getattr(settings, 'BULK_REFUND_BATCH_SIZE', 50)
+BULK_REFUND_MAX_RETRIES = getattr(settings, 'BULK_REFUND_MAX_RETRIES', 5)
+BULK_REFUND_BACKOFF_SECONDS = getattr(settings, 'BULK_REFUND_BACKOFF_SECONDS', 1.0)
+
+
+def refund_idempotency_key(payment_id):
+    """
+    Idempotency key for refunding a payment.
+    Keyed on the payment (not the job) so two jobs never refund the same charge twice.
+    """
+    return f"refund-payment-{payment_id}"
+
+
+def create_refund_job(payment_ids, user=None, reason=None):
+    """
+    Create a pending RefundJob for the given payments.
+
+    Args:
+        payment_ids (iterable): Payment IDs to refund
+        user: Admin user starting the job
+        reason (str): Why the payments are refunded (e.g. seller banned)
+
+    Returns:
+        RefundJob: The new job
+    """
+    payment_ids = sorted({int(pk) for pk in payment_ids})
+    return RefundJob.objects.create(
+        created_by=user,
+        reason=reason,
+        payment_ids=payment_ids,
+        total=len(payment_ids),
+    )
+
+
+def _refund_with_backoff(payment_id, charge_id):
+    """
+    Refund one charge, backing off exponentially while Stripe rate limits us.
+    Runs on a worker thread, so it must not touch the database.
+    """
+    key = refund_idempotency_key(payment_id)
+
+    for attempt in range(BULK_REFUND_MAX_RETRIES + 1):
+        result = StripePaymentHandler.refund_payment(charge_id=charge_id, idempotency_key=key)
+        if result['success'] or not result.get('rate_limited'):
+            return result
+
+        if attempt < BULK_REFUND_MAX_RETRIES:
+            delay = BULK_REFUND_BACKOFF_SECONDS * (2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay))
+
+    return result
+
+
+def _apply_batch(job, succeeded_ids, failures):
+    """Write one batch of refund results to Payment, Order and the job counters"""
+    from orders.models import Order
+
+    with transaction.atomic():
+        if succeeded_ids:
+            Payment.objects.filter(id__in=succeeded_ids).update(
+                status='refunded',
+                updated_at=timezone.now(),
+            )
+            Order.objects.filter(payment_id__in=succeeded_ids).update(status='refunded')
+
+        if failures:
+            job.errors.update({str(pk): message for pk, message in failures.items()})
+
+        RefundJob.objects.filter(pk=job.pk).update(
+            processed=F('processed') + len(succeeded_ids) + len(failures),
+            succeeded=F('succeeded') + len(succeeded_ids),
+            failed=F('failed') + len(failures),
+            errors=job.errors,
+        )
+
+
+def run_refund_job(job_id):
+    """
+    Process a RefundJob to completion.
+
+    Args:
+        job_id (int): RefundJob ID
+
+    Returns:
+        dict: Final job counters
+    """
+    job = RefundJob.objects.get(id=job_id)
+    if job.status != 'pending':
+        logger.warning(f"⚠️ Refund job {job_id} is already {job.status}")
+        return {'success': False, 'error': f'Job is {job.status}'}
+
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+    logger.info(f"💸 Refund job {job.id} started: {job.total} payments")
+
+    # Only succeeded payments with a charge can be refunded, the rest fail up front
+    refundable = dict(
+        Payment.objects.filter(
+            id__in=job.payment_ids,
+            status='succeeded',
+            stripe_charge_id__isnull=False,
+        ).values_list('id', 'stripe_charge_id')
+    )
+    skipped = {
+        pk: 'Payment is not refundable'
+        for pk in job.payment_ids
+        if pk not in refundable
+    }
+
+    try:
+        if skipped:
+            _apply_batch(job, [], skipped)
+
+        succeeded_ids, failures = [], {}
+        with ThreadPoolExecutor(max_workers=BULK_REFUND_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(_refund_with_backoff, pk, charge_id): pk
+                for pk, charge_id in refundable.items()
+            }
+            for future in as_completed(futures):
+                payment_id = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'success': False, 'error': str(e)}
+
+                if result['success']:
+                    succeeded_ids.append(payment_id)
+                else:
+                    failures[payment_id] = result['error']
+
+                if len(succeeded_ids) + len(failures) >= BULK_REFUND_BATCH_SIZE:
+                    _apply_batch(job, succeeded_ids, failures)
+                    succeeded_ids, failures = [], {}
+
+        _apply_batch(job, succeeded_ids, failures)
+
+    except Exception as e:
+        logger.error(f"❌ Refund job {job.id} failed: {str(e)}")
+        RefundJob.objects.filter(pk=job.pk).update(status='failed', finished_at=timezone.now())
+        raise
+
+    RefundJob.objects.filter(pk=job.pk).update(status='completed', finished_at=timezone.now())
+    job.refresh_from_db()
+    logger.info(f"✅ Refund job {job.id} completed: {job.succeeded} refunded, {job.failed} failed")
+
+    return {
+        'success': True,
+        'job_id': job.id,
+        'succeeded': job.succeeded,
+        'failed': job.failed,
+    }
@@ -0,0 +1,265 @@
+# auctions/channel_layers.py
+"""
+Hybrid channel layer: in-process delivery for local group members, the
+shared layer (Redis) only between processes.
+
+Consumers in this process join groups locally. The process itself joins
+each of those groups on the shared layer once, through a relay channel
+per group. A group_send therefore hands the message straight to the local
+consumers' queues and publishes one copy per process to the shared layer,
+instead of one copy per member. Published copies are tagged with the
+origin process, so the sender's own relay ignores its echo. A relay knows
+its group from the channel it listens on, so untagged messages from
+processes on the stock layer are delivered too.
+
+The shared layer expires group memberships after its group_expiry, so
+relay memberships are re-added every group_refresh seconds (half the
+inner layer's group_expiry by default) for as long as the group has
+local members.
+
+Channels registered with tag_groups() receive group messages with the
+group name under GROUP_KEY, so a consumer subscribed to several groups
+can tell which one a message was sent to.
+
+Settings:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "auctions.channel_layers.HybridChannelLayer",
+            "CONFIG": {
+                "inner": {
+                    "BACKEND": "channels_redis.core.RedisChannelLayer",
+                    "CONFIG": {"hosts": [("127.0.0.1", 6379)]},
+                },
+            },
+        },
+    }
+
+Celery workers and other send-only processes can use the same setting,
+they simply have no local members.
+"""
+import asyncio
+import logging
+import uuid
+from collections import defaultdict, deque
+
+from channels.layers import BaseChannelLayer
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+ORIGIN_KEY = '__hybrid_origin'
+GROUP_KEY = '__hybrid_group'
+
+
+class HybridChannelLayer(BaseChannelLayer):
+    """
+    Channel layer wrapper that short-circuits same-process group members.
+
+    Args:
+        inner (dict): BACKEND/CONFIG of the shared layer
+            (default: InMemoryChannelLayer)
+        local_capacity (int): Pending messages per local channel, group
+            messages beyond it are dropped like a full channel on the
+            shared layer
+        group_refresh (float): Seconds between re-adds of the relay
+            group memberships (default: half the inner group_expiry)
+    """
+
+    extensions = ['groups', 'flush']
+
+    def __init__(self, inner=None, local_capacity=100, group_refresh=None, expiry=60, capacity=100,
+                 channel_capacity=None, **kwargs):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity)
+        inner = inner or {'BACKEND': 'channels.layers.InMemoryChannelLayer'}
+        self.inner = import_string(inner['BACKEND'])(**inner.get('CONFIG', {}))
+        self.local_capacity = local_capacity
+        self.group_refresh = group_refresh or getattr(self.inner, 'group_expiry', 86400) / 2
+        self.origin = uuid.uuid4().hex
+
+        self.local_channels = {}  # channel -> deque of pending messages
+        self.waiters = {}  # channel -> future of a receive() waiting on local delivery
+        self.remote_receives = {}  # channel -> pending receive on the shared layer
+        self.local_groups = defaultdict(set)  # group -> local channels
+        self.tagged_channels = set()  # local channels that want GROUP_KEY on group messages
+        self.relays = {}  # group -> (relay channel on the shared layer, receive task)
+        self.refresh_task = None
+        self.stats = {'local_deliveries': 0, 'relayed_in': 0, 'published': 0}
+
+    # Channels
+
+    async def new_channel(self, prefix='specific.'):
+        channel = await self.inner.new_channel(prefix)
+        self.local_channels[channel] = deque()
+        return channel
+
+    async def send(self, channel, message):
+        if channel in self.local_channels:
+            self._deliver(channel, message)
+        else:
+            await self.inner.send(channel, message)
+
+    async def receive(self, channel):
+        pending = self.local_channels.get(channel)
+        if pending is None:
+            return await self.inner.receive(channel)
+        if pending:
+            return pending.popleft()
+
+        # Wait for whichever comes first, local delivery or a direct send through the
+        # shared layer. The shared-layer receive is kept across calls rather than
+        # cancelled every time a local message wins.
+        local = asyncio.get_running_loop().create_future()
+        self.waiters[channel] = local
+        remote = self.remote_receives.get(channel)
+        if remote is None:
+            remote = self.remote_receives[channel] = asyncio.ensure_future(self.inner.receive(channel))
+        try:
+            await asyncio.wait({local, remote}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            # The consumer has stopped, forget its local state
+            self._forget(channel)
+            raise
+        finally:
+            self.waiters.pop(channel, None)
+
+        if local.done():
+            return local.result()
+        del self.remote_receives[channel]
+        return remote.result()
+
+    def _deliver(self, channel, message):
+        waiter = self.waiters.pop(channel, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(message)
+            return True
+
+        pending = self.local_channels[channel]
+        if len(pending) >= self.local_capacity:
+            return False
+        pending.append(message)
+        return True
+
+    def _forget(self, channel):
+        self.local_channels.pop(channel, None)
+        self.tagged_channels.discard(channel)
+        remote = self.remote_receives.pop(channel, None)
+        if remote is not None:
+            remote.cancel()
+        for group in [group for group, members in self.local_groups.items() if channel in members]:
+            self.local_groups[group].discard(channel)
+            if not self.local_groups[group]:
+                del self.local_groups[group]
+                relay_channel = self._drop_relay(group)
+                if relay_channel:
+                    asyncio.ensure_future(self.inner.group_discard(group, relay_channel))
+
+    # Groups
+
+    def tag_groups(self, channel):
+        """Deliver group messages to a local channel tagged with their group under GROUP_KEY"""
+        if channel in self.local_channels:
+            self.tagged_channels.add(channel)
+
+    async def group_add(self, group, channel):
+        if channel not in self.local_channels:
+            return await self.inner.group_add(group, channel)
+
+        first_member = group not in self.local_groups
+        self.local_groups[group].add(channel)
+        if first_member:
+            await self._start_relay(group)
+
+    async def group_discard(self, group, channel):
+        members = self.local_groups.get(group)
+        if not members or channel not in members:
+            return await self.inner.group_discard(group, channel)
+
+        members.discard(channel)
+        if not members:
+            del self.local_groups[group]
+            relay_channel = self._drop_relay(group)
+            if relay_channel:
+                await self.inner.group_discard(group, relay_channel)
+
+    async def group_send(self, group, message):
+        self._deliver_to_group(group, message)
+        await self.inner.group_send(group, {**message, ORIGIN_KEY: self.origin})
+        self.stats['published'] += 1
+
+    def _deliver_to_group(self, group, message):
+        for channel in list(self.local_groups.get(group, ())):
+            copy = {**message, GROUP_KEY: group} if channel in self.tagged_channels else dict(message)
+            if self._deliver(channel, copy):
+                self.stats['local_deliveries'] += 1
+
+    # Relay from other processes
+
+    async def _start_relay(self, group):
+        relay_channel = await self.inner.new_channel('relay.')
+        await self.inner.group_add(group, relay_channel)
+        self.relays[group] = (relay_channel, asyncio.ensure_future(self._relay(group, relay_channel)))
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.ensure_future(self._refresh_relays())
+
+    def _drop_relay(self, group):
+        """Stop relaying a group, returning its relay channel so the caller can leave the group"""
+        relay = self.relays.pop(group, None)
+        if relay is None:
+            return None
+        relay[1].cancel()
+        return relay[0]
+
+    async def _relay(self, group, relay_channel):
+        while True:
+            try:
+                message = await self.inner.receive(relay_channel)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Channel layer relay for {group} failed to receive: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if message.pop(ORIGIN_KEY, None) == self.origin:
+                continue  # Our own publish, local members already have it
+            message.pop(GROUP_KEY, None)
+            self.stats['relayed_in'] += 1
+            self._deliver_to_group(group, message)
+
+    async def _refresh_relays(self):
+        """Re-add relay memberships before the shared layer's group_expiry drops them"""
+        while self.relays:
+            await asyncio.sleep(self.group_refresh)
+            for group, (relay_channel, _) in list(self.relays.items()):
+                try:
+                    await self.inner.group_add(group, relay_channel)
+                except Exception as e:
+                    logger.error(f"Failed to refresh channel layer relay for {group}: {e}")
+
+    # Flush extension
+
+    def _stop_relays(self):
+        for group in list(self.relays):
+            self._drop_relay(group)
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            self.refresh_task = None
+
+    async def flush(self):
+        self._stop_relays()
+        self.local_channels.clear()
+        self.local_groups.clear()
+        self.tagged_channels.clear()
+        self.waiters.clear()
+        for remote in self.remote_receives.values():
+            remote.cancel()
+        self.remote_receives.clear()
+        if hasattr(self.inner, 'flush'):
+            await self.inner.flush()
+
+    async def close(self):
+        self._stop_relays()
+        if hasattr(self.inner, 'close'):
+            await self.inner.close()
+        elif hasattr(self.inner, 'close_pools'):
+            await self.inner.close_pools()
@@ -0,0 +1,184 @@
+# auctions/chat_archive.py
+"""
+Archival of chat logs for closed auctions.
+
+Chats of auctions closed for CHAT_ARCHIVE_AFTER_DAYS are written, oldest
+message first, as zlib-compressed JSON lines into one ChatArchive blob per
+auction, then the archived AuctionChatMessage rows are deleted in batches
+of CHAT_ARCHIVE_DELETE_BATCH so no single statement holds locks for long.
+The live table keeps only chats that are still read. The blob records
+message ids, so rows left behind by a run that stopped between the blob
+commit and the deletes are deleted by the next run, not archived twice.
+
+Archived history is served transparently: chat_history merges the archive
+with any live rows, e.g. of an auction reopened after it was archived.
+"""
+import json
+import logging
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from payments.models import ChatArchive
+
+logger = logging.getLogger(__name__)
+
+CHAT_ARCHIVE_AFTER_DAYS = getattr(settings, 'CHAT_ARCHIVE_AFTER_DAYS', 30)
+CHAT_ARCHIVE_DELETE_BATCH = getattr(settings, 'CHAT_ARCHIVE_DELETE_BATCH', 1000)
+CHAT_ARCHIVE_CACHE_TIMEOUT = getattr(settings, 'CHAT_ARCHIVE_CACHE_TIMEOUT', 600)
+
+
+def _cache_key(auction_id):
+    return f"chat:archive:{auction_id}"
+
+
+def decompress(data):
+    """Payloads of an archive blob, oldest first"""
+    if not data:
+        return []
+    return [json.loads(line) for line in zlib.decompress(bytes(data)).decode().splitlines() if line]
+
+
+def read_archive(auction_id):
+    """
+    Archived messages of an auction as chat payloads, oldest first.
+
+    Returns:
+        list: Empty when the auction has no archive
+    """
+    key = _cache_key(auction_id)
+    messages = cache.get(key)
+    if messages is None:
+        data = ChatArchive.objects.filter(auction_id=auction_id).values_list('data', flat=True).first()
+        messages = decompress(data)
+        cache.set(key, messages, CHAT_ARCHIVE_CACHE_TIMEOUT)
+    return messages
+
+
+def with_live_messages(archived, rows):
+    """
+    Archived payloads followed by the live rows missing from the archive.
+
+    Args:
+        archived (list): read_archive() payloads, oldest first
+        rows (QuerySet): AuctionChatMessage rows of the same auction
+
+    Returns:
+        list: Chat payloads, oldest first
+    """
+    from .chat_history import message_payload
+
+    seen = {payload.get('id') for payload in archived}
+    live = [
+        message_payload(message)
+        for message in rows.order_by('timestamp', 'id').iterator()
+        if message.id not in seen
+    ]
+    return archived + live
+
+
+def archive_auction_chat(auction_id, batch_size=None):
+    """
+    Move every chat message of one auction into its archive blob.
+
+    Messages that arrive after an earlier run are appended to the existing
+    archive. Only rows written to the blob are deleted, and rows already
+    in the blob are deleted without being written again.
+
+    Returns:
+        int: Number of messages archived
+    """
+    from .chat_history import message_payload
+    from .models import AuctionChatMessage
+
+    batch_size = batch_size or CHAT_ARCHIVE_DELETE_BATCH
+    rows = (
+        AuctionChatMessage.objects.filter(auction_id=auction_id)
+        .select_related('sender')
+        .only('id', 'message', 'timestamp', 'sender__email')
+        .order_by('timestamp', 'id')
+    )
+
+    archived_ids = []
+    delete_ids = []
+    first_at = last_at = None
+    compressor = zlib.compressobj(9)
+    encoder = DjangoJSONEncoder()
+
+    with transaction.atomic():
+        archive = ChatArchive.objects.select_for_update().filter(auction_id=auction_id).first()
+        chunks = []
+        already_archived = set()
+        if archive is not None:
+            # Re-compress the existing log so the blob stays one zlib stream
+            for payload in decompress(archive.data):
+                already_archived.add(payload.get('id'))
+                chunks.append(compressor.compress((encoder.encode(payload) + '\n').encode()))
+
+        for message in rows.iterator(chunk_size=batch_size):
+            delete_ids.append(message.id)
+            if message.id in already_archived:
+                continue  # Left behind by a run that stopped before its deletes
+            chunks.append(compressor.compress((encoder.encode(message_payload(message)) + '\n').encode()))
+            archived_ids.append(message.id)
+            first_at = first_at or message.timestamp
+            last_at = message.timestamp
+
+        if archived_ids:
+            chunks.append(compressor.flush())
+            data = b''.join(chunks)
+
+            if archive is None:
+                archive = ChatArchive(auction_id=auction_id, first_message_at=first_at)
+            archive.data = data
+            archive.size_bytes = len(data)
+            archive.message_count += len(archived_ids)
+            archive.last_message_at = last_at
+            archive.save()
+
+    # The blob is committed, now shrink the hot table a batch at a time
+    for start in range(0, len(delete_ids), batch_size):
+        AuctionChatMessage.objects.filter(id__in=delete_ids[start:start + batch_size]).delete()
+
+    cache.delete(_cache_key(auction_id))
+    return len(archived_ids)
+
+
+def archive_closed_chats(older_than_days=None, limit=None):
+    """
+    Archive the chats of auctions closed more than `older_than_days` ago.
+
+    Returns:
+        dict: Auctions and messages archived
+    """
+    from .models import AuctionChatMessage
+
+    older_than_days = CHAT_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+
+    auction_ids = (
+        AuctionChatMessage.objects.filter(auction__status='closed', auction__end_time__lt=cutoff)
+        .values_list('auction_id', flat=True)
+        .distinct()
+        .order_by('auction_id')
+    )
+    if limit:
+        auction_ids = auction_ids[:limit]
+
+    auctions = messages = 0
+    for auction_id in list(auction_ids):
+        try:
+            archived = archive_auction_chat(auction_id)
+        except Exception as e:
+            logger.error(f"Failed to archive chat of auction {auction_id}: {e}")
+            continue
+        if archived:
+            auctions += 1
+            messages += archived
+
+    return {'auctions': auctions, 'messages': messages}
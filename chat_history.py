@@ -0,0 +1,225 @@
+# auctions/chat_history.py
+"""
+Auction chat history.
+
+History is read newest first with keyset (cursor) pagination on
+(timestamp, id) within an auction, backed by the
+AuctionChatMessage (auction, -timestamp, -id) index, so older pages cost
+the same as the first.
+
+Each ASGI process also keeps a ring buffer of the last CHAT_BUFFER_SIZE
+messages of every room it has connections in. The buffer is loaded with
+one query when the first local connection joins, kept current from the
+room's own broadcasts, and dropped when the last local connection leaves
+(after which it could miss messages). New connections and first history
+pages of hot rooms are served from it without touching the database.
+
+Chats of long-closed auctions are moved out of the table into compressed
+archives (see chat_archive.py); their history is read from the archive.
+"""
+from collections import deque
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions, serializers
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+
+CHAT_BUFFER_SIZE = getattr(settings, 'CHAT_BUFFER_SIZE', 50)
+
+
+def message_payload(chat_message):
+    """The JSON a chat message is broadcast and replayed as"""
+    return {
+        "id": chat_message.id,
+        "user": chat_message.sender.email,
+        "message": chat_message.message,
+        "timestamp": chat_message.timestamp.isoformat(),
+    }
+
+
+class RoomBuffer:
+    def __init__(self, messages):
+        self.messages = deque(messages, maxlen=CHAT_BUFFER_SIZE)
+        self.ids = {message["id"] for message in self.messages}
+        self.members = 0
+
+    def record(self, payload):
+        if payload.get("id") is None or payload["id"] in self.ids:
+            return  # Already seen through another local connection
+        if len(self.messages) == self.messages.maxlen:
+            self.ids.discard(self.messages[0]["id"])
+        self.messages.append(payload)
+        self.ids.add(payload["id"])
+
+
+class RoomBuffers:
+    """Ring buffers of the rooms with local connections in this process"""
+
+    def __init__(self):
+        self.rooms = {}
+
+    async def join(self, auction_id):
+        """
+        Register a local connection to a room.
+
+        Returns:
+            list: The room's latest messages, oldest first
+        """
+        room = self.rooms.get(auction_id)
+        if room is None:
+            # Join the group before loading, broadcasts that overlap the query are deduplicated by id
+            messages = await database_sync_to_async(latest_messages)(auction_id, CHAT_BUFFER_SIZE)
+            room = self.rooms.setdefault(auction_id, RoomBuffer(messages))
+        room.members += 1
+        return list(room.messages)
+
+    def leave(self, auction_id):
+        room = self.rooms.get(auction_id)
+        if room is None:
+            return
+        room.members -= 1
+        if room.members <= 0:
+            del self.rooms[auction_id]
+
+    def record(self, auction_id, payload):
+        room = self.rooms.get(auction_id)
+        if room is not None:
+            room.record(payload)
+
+    def latest(self, auction_id, limit):
+        """
+        Newest-first page of a buffered room.
+
+        Returns:
+            tuple: (messages, whether older messages may exist), or None when
+                the room is not buffered here or the buffer is too short
+        """
+        room = self.rooms.get(auction_id)
+        if room is None:
+            return None
+        messages = list(room.messages)  # Copied in one step, the event loop may be appending
+        complete = len(messages) < CHAT_BUFFER_SIZE  # The whole room fits in the buffer
+        if limit > len(messages) and not complete:
+            return None
+        page = messages[::-1][:limit]
+        return page, not (complete and limit >= len(messages))
+
+
+room_buffers = RoomBuffers()
+
+
+def latest_messages(auction_id, limit):
+    """Last `limit` messages of a room as payloads, oldest first"""
+    from .models import AuctionChatMessage
+
+    recent = (
+        AuctionChatMessage.objects.filter(auction_id=auction_id)
+        .select_related('sender')
+        .only('id', 'message', 'timestamp', 'sender__email')
+        .order_by('-timestamp', '-id')[:limit]
+    )
+    messages = [message_payload(message) for message in reversed(list(recent))]
+    if len(messages) < limit:
+        from .chat_archive import read_archive
+
+        # Older history of a reopened auction lives in its archive
+        live_ids = {message['id'] for message in messages}
+        archived = [payload for payload in read_archive(auction_id) if payload.get('id') not in live_ids]
+        if archived:
+            messages = archived[-(limit - len(messages)):] + messages
+    return messages
+
+
+class ChatHistoryPagination(CursorPagination):
+    """Keyset pagination, newest first"""
+    page_size = CHAT_BUFFER_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("-timestamp", "-id")
+
+
+class ChatMessageSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    user = serializers.EmailField(source='sender.email')
+    message = serializers.CharField()
+    timestamp = serializers.DateTimeField()
+
+
+class ChatHistoryView(generics.ListAPIView):
+    """
+    GET /api/auctions/<auction_id>/chat/history/?cursor=...&page_size=50
+    Chat messages of an auction, newest first. Follow `next` for older pages.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ChatMessageSerializer
+    pagination_class = ChatHistoryPagination
+
+    def get_queryset(self):
+        from .models import AuctionChatMessage
+
+        return (
+            AuctionChatMessage.objects.filter(auction_id=self.kwargs['auction_id'])
+            .select_related('sender')
+            .only('id', 'message', 'timestamp', 'sender__email')
+        )
+
+    def list(self, request, *args, **kwargs):
+        from .chat_archive import read_archive, with_live_messages
+
+        # An archived chat is served as one list with any live rows written since,
+        # e.g. after the auction was reopened
+        archived = read_archive(int(self.kwargs['auction_id']))
+        if archived:
+            return Response(self.archived_page(request, with_live_messages(archived, self.get_queryset())))
+
+        paginator = self.paginator
+        if not request.query_params.get(paginator.cursor_query_param):
+            buffered = room_buffers.latest(int(self.kwargs['auction_id']), paginator.get_page_size(request))
+            if buffered is not None:
+                return Response(self.buffered_page(request, *buffered))
+
+        from .models import AuctionItem
+
+        get_object_or_404(AuctionItem.objects.only('id'), pk=self.kwargs['auction_id'])
+        return super().list(request, *args, **kwargs)
+
+    def buffered_page(self, request, messages, has_older):
+        """First page of a hot room from the ring buffer, with a cursor into the database for older pages"""
+        next_url = None
+        if has_older and messages:
+            position = messages[-1]['timestamp']
+            offset = 0
+            for message in reversed(messages):
+                if message['timestamp'] != position:
+                    break
+                offset += 1
+            self.paginator.base_url = request.build_absolute_uri()
+            next_url = self.paginator.encode_cursor(Cursor(offset=offset, reverse=False, position=position))
+        return {'next': next_url, 'previous': None, 'results': messages}
+
+    def archived_page(self, request, archived):
+        """
+        Page of an archived chat. The archive is a list, so the cursor
+        position is the number of newer messages already served.
+        """
+        paginator = self.paginator
+        page_size = paginator.get_page_size(request)
+        cursor = paginator.decode_cursor(request)
+        try:
+            start = int(cursor.position) if cursor and cursor.position else 0
+        except ValueError:
+            start = 0
+        start = max(0, start)
+
+        newest_first = archived[::-1]
+        messages = newest_first[start:start + page_size]
+        paginator.base_url = request.build_absolute_uri()
+
+        next_url = previous_url = None
+        if start + page_size < len(newest_first):
+            next_url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(start + page_size)))
+        if start > 0:
+            previous_url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(max(0, start - page_size))))
+        return {'next': next_url, 'previous': previous_url, 'results': messages}
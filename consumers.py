@@ -6,9 +6,17 @@ from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import AccessToken
 from jwt import decode as jwt_decode
 from django.conf import settings
+from .chat_history import room_buffers
+from .heartbeat import HeartbeatMixin
+from .rate_limits import acheck, throttle_frame
+from .subscriptions import SubscriptionManager, SubscriptionLimitExceeded
+from .fraud import FRAUD_ALERT_GROUP
+from .channel_layers import GROUP_KEY
+import logging
+logger = logging.getLogger(__name__)
 User = get_user_model()
 
-class AuctionConsumer(AsyncWebsocketConsumer):
+class AuctionConsumer(HeartbeatMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.auction_id = self.scope['url_route']['kwargs']['auction_id']
         self.group_name = f"auction_{self.auction_id}"
@@ -23,6 +31,7 @@ class AuctionConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 {
                     "type": "user_joined",
+                    "auction_id": int(self.auction_id),
                     "user": f"{self.user.first_name} {self.user.last_name}",
                     "ticket_id": self.user.ticket_id,
                 },
@@ -37,6 +46,7 @@ class AuctionConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 {
                     "type": "user_left",
+                    "auction_id": int(self.auction_id),
                     "user": f"{self.user.first_name} {self.user.last_name}",
                     "ticket_id": self.user.ticket_id,
                 },
@@ -78,7 +88,7 @@ class AuctionConsumer(AsyncWebsocketConsumer):
         }))
 
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+class NotificationConsumer(HeartbeatMixin, AsyncWebsocketConsumer):
     async def connect(self):
         if self.scope["user"].is_anonymous:
             await self.close()
@@ -95,9 +105,10 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
 #Buyer------------
 
-class BuyerDashboardConsumer(AsyncJsonWebsocketConsumer):
+class BuyerDashboardConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
     async def connect(self):
         self.user = self.scope["user"]
+        self.subscriptions = SubscriptionManager(self.channel_layer, self.channel_name)
         if not self.user.is_authenticated:
             await self.close()
         else:
@@ -107,13 +118,38 @@ class BuyerDashboardConsumer(AsyncJsonWebsocketConsumer):
             await self.accept()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await self.subscriptions.unsubscribe_all()
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-    # Client can subscribe to auctions (optional)
+    # Client can subscribe to auctions (optional):
+    #   {"auction_id": 5}
+    #   {"action": "subscribe" | "unsubscribe", "auction_ids": [5, 6]}
     async def receive_json(self, content):
-        auction_id = content.get("auction_id")
-        if auction_id:
-            await self.channel_layer.group_add(f"auction_{auction_id}", self.channel_name)
+        action = content.get("action", "subscribe")
+        auction_ids = content.get("auction_ids") or [content.get("auction_id")]
+        try:
+            groups = [f"auction_{int(auction_id)}" for auction_id in auction_ids if auction_id]
+        except (TypeError, ValueError):
+            await self.send_json({"type": "error", "message": "Invalid auction id"})
+            return
+
+        if action == "unsubscribe":
+            await self.subscriptions.unsubscribe(*groups)
+        elif action == "subscribe":
+            try:
+                await self.subscriptions.subscribe(*groups)
+            except SubscriptionLimitExceeded as e:
+                await self.send_json({"type": "error", "message": str(e)})
+                return
+        else:
+            await self.send_json({"type": "error", "message": f"Unknown action: {action}"})
+            return
+
+        await self.send_json({
+            "type": "subscriptions",
+            "auction_ids": sorted(int(group.split("_", 1)[1]) for group in self.subscriptions.groups),
+        })
 
     # 🔔 Generic auction update (e.g. new bid, price change)
     async def auction_update(self, event):
@@ -127,7 +163,7 @@ class BuyerDashboardConsumer(AsyncJsonWebsocketConsumer):
         })
 
 
-class SellerDashboardConsumer(AsyncJsonWebsocketConsumer):
+class SellerDashboardConsumer(HeartbeatMixin, AsyncJsonWebsocketConsumer):
     async def connect(self):
         self.user = self.scope["user"]
         if not self.user.is_authenticated or not hasattr(self.user, "sellerprofile"):
@@ -152,23 +188,57 @@ class SellerDashboardConsumer(AsyncJsonWebsocketConsumer):
             "content": event["content"],
         })
 
-class DisputeConsumer(AsyncJsonWebsocketConsumer):
+class TokenAuthMixin:
+    """Resolves the user from ?token=<JWT>, falling back to the session user"""
+
+    async def authenticate(self):
+        query_string = self.scope.get('query_string', b'').decode()
+        for param in query_string.split('&'):
+            if param.startswith('token='):
+                try:
+                    user = await self.get_user(AccessToken(param.split('=', 1)[1])['user_id'])
+                except Exception:
+                    user = None
+                if user:
+                    return user
+                break
+        return self.scope.get("user")
+
+    @database_sync_to_async
+    def get_user(self, user_id):
+        try:
+            return User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return None
+
+class DisputeConsumer(TokenAuthMixin, HeartbeatMixin, AsyncJsonWebsocketConsumer):
+    client_answers_pings = True  # AdminFraudAlerts.jsx answers heartbeat pings
+
     async def connect(self):
-        user = self.scope["user"]
-        if user.is_anonymous:
+        user = await self.authenticate()
+        if user is None or user.is_anonymous:
             await self.close()
         else:
             self.group_name = f"user_{user.id}"
             await self.channel_layer.group_add(self.group_name, self.channel_name)
+            # Staff also receive live shill-bidding flags (see fraud.py)
+            self.is_staff = user.is_staff or user.is_superuser
+            if self.is_staff:
+                await self.channel_layer.group_add(FRAUD_ALERT_GROUP, self.channel_name)
             await self.accept()
 
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        if getattr(self, 'is_staff', False):
+            await self.channel_layer.group_discard(FRAUD_ALERT_GROUP, self.channel_name)
 
     async def dispute_update(self, event):
         await self.send_json(event["content"])
 
-class AuctionChatConsumer(AsyncWebsocketConsumer):
+    async def fraud_flag(self, event):
+        await self.send_json(event["content"])
+
+class AuctionChatConsumer(HeartbeatMixin, AsyncWebsocketConsumer):
     async def connect(self):
         self.auction_id = self.scope["url_route"]["kwargs"]["auction_id"]
         self.room_group_name = f"auction_chat_{self.auction_id}"
@@ -225,7 +295,15 @@ class AuctionChatConsumer(AsyncWebsocketConsumer):
         await self.accept()
         print(f"✅ WebSocket connection accepted for {self.user.email}")
 
+        # Replay recent history, from the process ring buffer when the room is hot
+        for payload in await room_buffers.join(int(self.auction_id)):
+            await self.send(text_data=json.dumps(payload))
+        self.joined_room = True
+
     async def disconnect(self, close_code):
+        if getattr(self, 'joined_room', False):
+            room_buffers.leave(int(self.auction_id))
+
         # Leave room group
         if hasattr(self, 'room_group_name') and hasattr(self, 'channel_name'):
             await self.channel_layer.group_discard(
@@ -244,6 +322,11 @@ class AuctionChatConsumer(AsyncWebsocketConsumer):
                 print("⚠️ Empty message received, ignoring")
                 return
             
+            throttle = await acheck("chat", self.user.id, self.auction_id)
+            if throttle:
+                await self.send(text_data=json.dumps(throttle_frame("chat", throttle)))
+                return
+
             print(f"📨 Message received from {self.user.email}: {message}")
             
             # Save message to database
@@ -256,6 +339,8 @@ class AuctionChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     "type": "chat_message",  # This calls the chat_message method below
+                    "id": chat_message.id,
+                    "auction_id": int(self.auction_id),
                     "user": self.user.email,
                     "message": message,
                     "timestamp": chat_message.timestamp.isoformat(),
@@ -274,10 +359,12 @@ class AuctionChatConsumer(AsyncWebsocketConsumer):
         # Send message to WebSocket
         try:
             message_data = {
+                "id": event.get("id"),
                 "user": event["user"],
                 "message": event["message"],
                 "timestamp": event["timestamp"],
             }
+            room_buffers.record(int(self.auction_id), message_data)
             print(f"📤 Sending to {self.user.email}: {event['message'][:30]}...")
             await self.send(text_data=json.dumps(message_data))
             print(f"✅ Sent to {self.user.email}")
@@ -298,4 +385,196 @@ class AuctionChatConsumer(AsyncWebsocketConsumer):
             auction=auction, 
             sender=user, 
             message=message
-        )
\ No newline at end of file
+        )
+
+# Multiplexed------------
+
+class MultiplexConsumer(TokenAuthMixin, HeartbeatMixin, AsyncJsonWebsocketConsumer):
+    """
+    One socket per client carrying named streams.
+
+    Authenticates once at connect (?token=<JWT>, falling back to the session
+    user), then the client opts into streams with frames like
+        {"action": "subscribe", "stream": "bids", "auction_id": 5}
+        {"action": "unsubscribe", "stream": "chat", "auction_id": 5}
+        {"action": "send", "stream": "chat", "auction_id": 5, "message": "Hi"}
+    Events arrive as {"stream": ..., "auction_id": ..., "payload": {...}}, where
+    payload is the channel-layer event (or its "content", when it has one).
+    Auction events always carry the auction_id they belong to: from the
+    event itself, the group tag added by HybridChannelLayer, or the only
+    subscribed auction. Events that cannot be attributed are dropped.
+    """
+
+    client_answers_pings = True  # PlaceBid.jsx answers heartbeat pings
+
+    # stream -> (group name template, needs an auction_id, needs a logged-in user)
+    STREAMS = {
+        "bids": ("auction_{auction_id}", True, False),
+        "chat": ("auction_chat_{auction_id}", True, True),
+        "notifications": ("user_{user_id}", False, True),
+        "disputes": ("user_{user_id}", False, True),
+    }
+
+    # channel-layer message type -> stream it is delivered on
+    EVENT_STREAMS = {
+        "send_bid_update": "bids",
+        "auction_update": "bids",
+        "auction_closed": "bids",
+        "auction_extended": "bids",
+        "user_joined": "bids",
+        "user_left": "bids",
+        "chat_message": "chat",
+        "auction_notification": "notifications",
+        "personal_bid_confirmation": "notifications",
+        "payment_notification": "notifications",
+        "order_created": "notifications",
+        "dispute_update": "disputes",
+    }
+
+    async def connect(self):
+        self.user = await self.authenticate()
+        self.streams = set()  # (stream, auction_id) pairs
+        self.subscriptions = SubscriptionManager(self.channel_layer, self.channel_name)
+        if hasattr(self.channel_layer, "tag_groups"):
+            self.channel_layer.tag_groups(self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if hasattr(self, "subscriptions"):
+            for stream, auction_id in self.streams:
+                if stream == "chat":
+                    room_buffers.leave(auction_id)
+            await self.subscriptions.unsubscribe_all()
+
+    def group_for(self, stream, auction_id):
+        template, _, _ = self.STREAMS[stream]
+        return template.format(auction_id=auction_id, user_id=getattr(self.user, "id", None))
+
+    async def receive_json(self, content):
+        action = content.get("action")
+        stream = content.get("stream")
+        if stream not in self.STREAMS:
+            await self.send_json({"type": "error", "message": f"Unknown stream: {stream}"})
+            return
+
+        _, needs_auction, needs_user = self.STREAMS[stream]
+        if needs_user and not (self.user and self.user.is_authenticated):
+            await self.send_json({"type": "error", "stream": stream, "message": "Authentication required"})
+            return
+
+        auction_id = None
+        if needs_auction:
+            try:
+                auction_id = int(content.get("auction_id"))
+            except (TypeError, ValueError):
+                await self.send_json({"type": "error", "stream": stream, "message": "auction_id required"})
+                return
+
+        key = (stream, auction_id)
+        group = self.group_for(stream, auction_id)
+
+        if action == "subscribe":
+            try:
+                await self.subscriptions.subscribe(group)
+            except SubscriptionLimitExceeded as e:
+                await self.send_json({"type": "error", "stream": stream, "message": str(e)})
+                return
+            already_subscribed = key in self.streams
+            self.streams.add(key)
+            await self.send_json({"type": "subscribed", "stream": stream, "auction_id": auction_id})
+
+            if stream == "chat" and not already_subscribed:
+                history = await room_buffers.join(auction_id)
+                if content.get("replay"):
+                    for payload in history:
+                        await self.send_json({"stream": stream, "auction_id": auction_id, "payload": payload})
+
+        elif action == "unsubscribe":
+            if stream == "chat" and key in self.streams:
+                room_buffers.leave(auction_id)
+            self.streams.discard(key)
+            # notifications and disputes share the user group
+            if not any(self.group_for(*other) == group for other in self.streams):
+                await self.subscriptions.unsubscribe(group)
+            await self.send_json({"type": "unsubscribed", "stream": stream, "auction_id": auction_id})
+
+        elif action == "send" and stream == "chat":
+            message = (content.get("message") or "").strip()
+            if key not in self.streams:
+                await self.send_json({"type": "error", "stream": stream, "auction_id": auction_id, "message": "Not subscribed to this auction"})
+                return
+            if not message:
+                return
+            throttle = await acheck("chat", self.user.id, auction_id)
+            if throttle:
+                await self.send_json({"stream": stream, "auction_id": auction_id, **throttle_frame("chat", throttle)})
+                return
+            chat_message = await self.save_chat_message(auction_id, message)
+            if chat_message is None:
+                await self.send_json({"type": "error", "stream": stream, "auction_id": auction_id, "message": "Auction not found"})
+                return
+            await self.channel_layer.group_send(group, {
+                "type": "chat_message",
+                "id": chat_message.id,
+                "auction_id": auction_id,
+                "user": self.user.email,
+                "message": message,
+                "timestamp": chat_message.timestamp.isoformat(),
+            })
+
+        else:
+            await self.send_json({"type": "error", "stream": stream, "message": f"Unknown action: {action}"})
+
+    async def dispatch(self, message):
+        stream = self.EVENT_STREAMS.get(message["type"])
+        if stream is None:
+            return await super().dispatch(message)
+
+        group = message.pop(GROUP_KEY, None)
+        subscribed = [auction_id for name, auction_id in self.streams if name == stream]
+        if not subscribed:
+            return  # e.g. a dispute_update while only notifications is subscribed
+
+        auction_id = None
+        if self.STREAMS[stream][1]:
+            auction_id = self.event_auction_id(stream, message, group, subscribed)
+            if auction_id is None:
+                logger.warning(f"Dropping untagged {message['type']} event, {len(subscribed)} {stream} subscriptions")
+                return
+
+        if message["type"] == "chat_message" and auction_id is not None:
+            room_buffers.record(auction_id, {
+                field: message.get(field) for field in ("id", "user", "message", "timestamp")
+            })
+
+        payload = message.get("content", message)
+        await self.send_json({"stream": stream, "auction_id": auction_id, "payload": payload})
+
+    def event_auction_id(self, stream, message, group, subscribed):
+        """Subscribed auction an event belongs to, None if it cannot be told"""
+        auction_id = message.get("auction_id")
+        if auction_id is not None:
+            try:
+                auction_id = int(auction_id)
+            except (TypeError, ValueError):
+                return None
+            return auction_id if auction_id in subscribed else None
+        if group is not None:
+            for candidate in subscribed:
+                if self.group_for(stream, candidate) == group:
+                    return candidate
+            return None
+        # Stock layers don't tag groups and senders don't always tag events
+        return subscribed[0] if len(subscribed) == 1 else None
+
+    @database_sync_to_async
+    def save_chat_message(self, auction_id, message):
+        try:
+            auction = AuctionItem.objects.get(id=auction_id)
+        except AuctionItem.DoesNotExist:
+            return None
+        return AuctionChatMessage.objects.create(
+            auction=auction,
+            sender=self.user,
+            message=message
+        )
@@ -0,0 +1,307 @@
+# auctions/fraud.py
+"""
+Streaming shill-bidding detection.
+
+Every accepted bid and every retraction (bid delete) is fed to the
+detector from model signals. It keeps exponentially decaying counters,
+with a half-life of FRAUD_HALF_LIFE_SECONDS, per bidder, per (bidder,
+seller) and per (bidder, auction). Updating or reading a counter is O(1).
+
+Each bid is scored on:
+- concentration: share of the distinct auctions the bidder recently bid
+  on that belong to this seller, so many bids on one auction (a bidding
+  war) count once
+- retraction rate: recent retractions against recent bids
+- late bidding: share of recent bids placed in the last FRAUD_LATE_SECONDS
+  of an auction that barely raised the price. A late bid that raises the
+  price by FRAUD_LATE_RAISE or more is ordinary sniping and counts for
+  nothing, a minimum-increment nudge counts fully
+- repeat bidding: recent bids by the bidder on this same auction
+
+Bids scoring FRAUD_FLAG_THRESHOLD or more are flagged to admins as a
+"fraud_flag" event on the fraud_alerts group, which DisputeConsumer joins
+for staff users. A (bidder, seller) pair is flagged at most once per
+FRAUD_FLAG_COOLDOWN_SECONDS.
+
+With FRAUD_SHARED_STATE (the default) the counters and cooldowns live in
+the Django cache, so every worker scores against the same history; use a
+shared cache such as Redis. Concurrent updates of one counter may lose an
+increment, which only nudges a score. With FRAUD_SHARED_STATE = False
+they live in process memory, bounded by FRAUD_MAX_KEYS, and each worker
+only sees the bids it handles: detection is then only reliable with a
+single worker.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+FRAUD_DETECTION_ENABLED = getattr(settings, 'FRAUD_DETECTION_ENABLED', True)
+FRAUD_SHARED_STATE = getattr(settings, 'FRAUD_SHARED_STATE', True)
+FRAUD_HALF_LIFE_SECONDS = getattr(settings, 'FRAUD_HALF_LIFE_SECONDS', 3600)
+FRAUD_MAX_KEYS = getattr(settings, 'FRAUD_MAX_KEYS', 200000)
+FRAUD_MIN_BIDS = getattr(settings, 'FRAUD_MIN_BIDS', 5)
+FRAUD_MIN_AUCTIONS = getattr(settings, 'FRAUD_MIN_AUCTIONS', 5)
+FRAUD_REPEAT_BIDS = getattr(settings, 'FRAUD_REPEAT_BIDS', 10)
+FRAUD_LATE_SECONDS = getattr(settings, 'FRAUD_LATE_SECONDS', 60)
+FRAUD_LATE_RAISE = getattr(settings, 'FRAUD_LATE_RAISE', 0.05)
+FRAUD_FLAG_THRESHOLD = getattr(settings, 'FRAUD_FLAG_THRESHOLD', 0.7)
+FRAUD_FLAG_COOLDOWN_SECONDS = getattr(settings, 'FRAUD_FLAG_COOLDOWN_SECONDS', 600)
+FRAUD_AUCTION_CACHE_SECONDS = getattr(settings, 'FRAUD_AUCTION_CACHE_SECONDS', 30)
+
+FRAUD_ALERT_GROUP = "fraud_alerts"
+FRAUD_CACHE_PREFIX = "fraud:"
+
+WEIGHTS = {
+    'concentration': 0.45,
+    'retraction_rate': 0.25,
+    'late_rate': 0.2,
+    'repeat': 0.1,
+}
+
+
+class DecayingCounters:
+    """Exponentially decaying counters in process memory, least recently used keys are evicted past max_keys"""
+
+    def __init__(self, half_life=FRAUD_HALF_LIFE_SECONDS, max_keys=FRAUD_MAX_KEYS):
+        self.counters = OrderedDict()  # key -> [value, updated_at]
+        self.decay = math.log(2) / half_life
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+
+    def _current(self, key, now):
+        counter = self.counters.pop(key, None)
+        if counter is None:
+            return 0.0
+        return counter[0] * math.exp(-self.decay * max(0.0, now - counter[1]))
+
+    def apply(self, now, add=None, read=()):
+        """
+        Add to some counters and read others.
+
+        Args:
+            add (dict): Amount to add keyed by counter key
+            read (iterable): Counter keys to read without changing
+
+        Returns:
+            dict: Current value of every added or read counter
+        """
+        add = add or {}
+        values = {}
+        with self.lock:
+            for key in set(read) | set(add):
+                value = self._current(key, now) + add.get(key, 0.0)
+                values[key] = value
+                if value:
+                    self.counters[key] = [value, now]
+            while len(self.counters) > self.max_keys:
+                self.counters.popitem(last=False)
+        return values
+
+
+class CachedDecayingCounters:
+    """DecayingCounters kept in the Django cache, shared by every worker"""
+
+    def __init__(self, half_life=FRAUD_HALF_LIFE_SECONDS, prefix=FRAUD_CACHE_PREFIX):
+        self.decay = math.log(2) / half_life
+        self.prefix = prefix
+        self.timeout = int(half_life * 8)  # Decayed below 0.4% of its value by then
+
+    def _cache_key(self, key):
+        return self.prefix + ':'.join(str(part) for part in key)
+
+    def apply(self, now, add=None, read=()):
+        add = add or {}
+        keys = set(read) | set(add)
+        stored = cache.get_many([self._cache_key(key) for key in keys])
+
+        values, updates = {}, {}
+        for key in keys:
+            value, updated_at = stored.get(self._cache_key(key), (0.0, now))
+            value = value * math.exp(-self.decay * max(0.0, now - updated_at)) + add.get(key, 0.0)
+            values[key] = value
+            if key in add:
+                updates[self._cache_key(key)] = (value, now)
+        if updates:
+            cache.set_many(updates, self.timeout)
+        return values
+
+
+class ShillDetector:
+    def __init__(self, shared=FRAUD_SHARED_STATE, max_keys=FRAUD_MAX_KEYS):
+        self.shared = shared
+        self.counters = CachedDecayingCounters() if shared else DecayingCounters(max_keys=max_keys)
+        self.flagged = OrderedDict()  # (bidder, seller) -> last flagged at, without shared state
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+
+    def observe_retraction(self, bidder_id, now=None):
+        now = time.time() if now is None else now
+        self.counters.apply(now, add={('retract', bidder_id): 1.0})
+
+    def observe_bid(self, bidder_id, seller_id, auction_id, end_time=None, price_raise=None, now=None):
+        """
+        Update the bidder's counters with one bid and score it.
+
+        Args:
+            end_time (float): Auction end, seconds since the epoch
+            price_raise (float): How much the bid raised the price, as a
+                fraction of the previous price (None when unknown)
+
+        Returns:
+            dict: Score and features
+        """
+        now = time.time() if now is None else now
+        late = end_time is not None and 0 <= end_time - now <= FRAUD_LATE_SECONDS
+        late_weight = 0.0
+        if late and price_raise is not None:
+            late_weight = max(0.0, 1.0 - price_raise / FRAUD_LATE_RAISE)
+
+        on_auction_key = ('auction', bidder_id, auction_id)
+        auctions_key, seller_key = ('auctions', bidder_id), ('seller_auctions', bidder_id, seller_id)
+        values = self.counters.apply(
+            now,
+            add={('bids', bidder_id): 1.0, on_auction_key: 1.0, ('late', bidder_id): late_weight},
+            read=(('retract', bidder_id),),
+        )
+        # A bid on an auction the bidder has (all but) no recent bids on counts towards distinct auctions
+        first_on_auction = values[on_auction_key] < 1.5
+        values.update(self.counters.apply(
+            now,
+            add={auctions_key: 1.0, seller_key: 1.0} if first_on_auction else None,
+            read=() if first_on_auction else (auctions_key, seller_key),
+        ))
+
+        bids = values[('bids', bidder_id)]
+        auctions = max(values[auctions_key], 1.0)
+        # Shares mean little on a handful of bids or auctions, scale them by how much history there is
+        features = {
+            'concentration': round(min(1.0, auctions / FRAUD_MIN_AUCTIONS) * min(1.0, values[seller_key] / auctions), 3),
+            'retraction_rate': round(values[('retract', bidder_id)] / (bids + values[('retract', bidder_id)]), 3),
+            'late_rate': round(min(1.0, bids / FRAUD_MIN_BIDS) * values[('late', bidder_id)] / bids, 3),
+            'repeat': round(min(1.0, values[on_auction_key] / FRAUD_REPEAT_BIDS), 3),
+        }
+        score = sum(WEIGHTS[name] * value for name, value in features.items())
+        if bidder_id == seller_id:
+            score = 1.0  # Seller bidding on their own item
+        return {'score': round(score, 3), 'features': features}
+
+    def should_flag(self, bidder_id, seller_id, score, now=None):
+        """True once per cooldown for a (bidder, seller) pair scoring over the threshold"""
+        if score < FRAUD_FLAG_THRESHOLD:
+            return False
+        now = time.time() if now is None else now
+        if self.shared:
+            # cache.add is atomic, so only one worker flags the pair per cooldown
+            return cache.add(f"{FRAUD_CACHE_PREFIX}flagged:{bidder_id}:{seller_id}", now, FRAUD_FLAG_COOLDOWN_SECONDS)
+
+        key = (bidder_id, seller_id)
+        with self.lock:
+            last = self.flagged.pop(key, None)
+            if last is not None and now - last < FRAUD_FLAG_COOLDOWN_SECONDS:
+                self.flagged[key] = last
+                return False
+            self.flagged[key] = now
+            if len(self.flagged) > self.max_keys:
+                self.flagged.popitem(last=False)
+        return True
+
+
+detector = ShillDetector()
+
+_auctions = OrderedDict()  # auction id -> (seller id, end time, fetched at)
+_auctions_lock = threading.Lock()
+
+
+def auction_meta(auction_id, now=None):
+    """
+    (seller id, end time as epoch seconds) of an auction, cached for
+    FRAUD_AUCTION_CACHE_SECONDS so extensions are picked up.
+    """
+    now = time.time() if now is None else now
+    with _auctions_lock:
+        cached = _auctions.get(auction_id)
+    if cached and now - cached[2] < FRAUD_AUCTION_CACHE_SECONDS:
+        return cached[0], cached[1]
+
+    from .models import AuctionItem
+
+    row = AuctionItem.objects.filter(pk=auction_id).values_list('seller_id', 'end_time').first()
+    if row is None:
+        return None, None
+    seller_id, end_time = row[0], row[1].timestamp() if row[1] else None
+
+    with _auctions_lock:
+        _auctions.pop(auction_id, None)
+        _auctions[auction_id] = (seller_id, end_time, now)
+        if len(_auctions) > FRAUD_MAX_KEYS:
+            _auctions.popitem(last=False)
+    return seller_id, end_time
+
+
+def publish_flag(flag):
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(FRAUD_ALERT_GROUP, {"type": "fraud_flag", "content": flag})
+
+
+def price_raise(bid):
+    """How much a bid raised its auction's price, as a fraction of the previous highest bid"""
+    from .models import Bid
+
+    previous = (
+        Bid.objects.filter(auction_item_id=bid.auction_item_id, pk__lt=bid.pk)
+        .order_by('-amount')
+        .values_list('amount', flat=True)
+        .first()
+    )
+    if not previous:
+        return None
+    return float((bid.amount - previous) / previous)
+
+
+def observe_bid(bid):
+    """Score an accepted bid and flag it to admins when suspicious"""
+    try:
+        seller_id, end_time = auction_meta(bid.auction_item_id)
+        if seller_id is None:
+            return None
+
+        # Only late bids need the previous price, skip the query for the rest
+        raised = None
+        if end_time is not None and 0 <= end_time - time.time() <= FRAUD_LATE_SECONDS:
+            raised = price_raise(bid)
+
+        result = detector.observe_bid(bid.user_id, seller_id, bid.auction_item_id, end_time, raised)
+        if not detector.should_flag(bid.user_id, seller_id, result['score']):
+            return result
+
+        flag = {
+            "type": "fraud_flag",
+            "bid_id": bid.pk,
+            "auction_id": bid.auction_item_id,
+            "bidder_id": bid.user_id,
+            "seller_id": seller_id,
+            "amount": str(bid.amount),
+            **result,
+            "message": f"Suspicious bidding by user {bid.user_id} on auction {bid.auction_item_id} (score {result['score']})",
+        }
+        logger.warning(flag["message"])
+        publish_flag(flag)
+        return result
+    except Exception as e:
+        logger.error(f"Fraud scoring failed for bid {bid.pk}: {e}")
+        return None
+
+
+def observe_retraction(bid):
+    detector.observe_retraction(bid.user_id)
@@ -0,0 +1,191 @@
+# auctions/heartbeat.py
+"""
+Application-level heartbeat for WebSocket consumers.
+
+Consumers whose clients answer pings set client_answers_pings = True
+(today the multiplexed socket, answered by PlaceBid.jsx). After accept()
+the server sends them {"type": "ping", "ts": ...} every
+WS_HEARTBEAT_INTERVAL seconds and the client answers {"type": "pong"}.
+Any frame from the client counts as a sign of life. A connection that has
+been silent for WS_HEARTBEAT_TIMEOUT seconds is reaped: it is closed and
+its groups are discarded right away, without waiting for TCP to notice the
+dead peer, so it stops receiving fan-out.
+
+Other consumers are never pinged, since a client that cannot answer would
+be reaped while in use; their dead peers are dropped by the ASGI server's
+protocol-level pings (e.g. daphne --ping-interval/--ping-timeout). Set a
+consumer's flag once its clients handle "ping", or move them to the
+multiplexed socket. WS_HEARTBEAT_INTERVAL = 0 turns pings off everywhere.
+
+Each process keeps live/idle/reaped counts per consumer class and
+publishes them to the cache, see collect_metrics(). Idle is only counted
+for pinged consumers: for the others silence says nothing about the
+connection, so it is reported as None.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from channels.exceptions import StopConsumer
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+WS_HEARTBEAT_INTERVAL = getattr(settings, 'WS_HEARTBEAT_INTERVAL', 25)  # 0 disables heartbeats
+WS_HEARTBEAT_TIMEOUT = getattr(settings, 'WS_HEARTBEAT_TIMEOUT', 75)
+WS_REAPED_CLOSE_CODE = 4408
+
+METRICS_PROCESSES_KEY = 'ws:metrics:processes'
+METRICS_TIMEOUT = max(WS_HEARTBEAT_INTERVAL * 3, 60)
+
+# consumer class name -> set of live consumer instances in this process
+_connections = defaultdict(set)
+# names of the consumer classes being pinged
+_pinged = set()
+_reaped = defaultdict(int)
+_reporter = None
+
+
+def connection_metrics():
+    """
+    Live, idle (silent for over one heartbeat interval, None for consumers
+    that are not pinged) and reaped connection counts of this process.
+
+    Returns:
+        dict: Counts keyed by consumer class name
+    """
+    now = time.monotonic()
+    metrics = {}
+    for name in set(_connections) | set(_reaped):
+        consumers = _connections.get(name, ())
+        idle = None
+        if name in _pinged:
+            idle = sum(1 for consumer in consumers if now - consumer.last_seen > WS_HEARTBEAT_INTERVAL)
+        metrics[name] = {
+            'live': len(consumers),
+            'idle': idle,
+            'reaped': _reaped.get(name, 0),
+        }
+    return metrics
+
+
+def _process_key():
+    return f"ws:metrics:{socket.gethostname()}:{os.getpid()}"
+
+
+def _publish_metrics():
+    key = _process_key()
+    cache.set(key, {'updated_at': time.time(), 'consumers': connection_metrics()}, METRICS_TIMEOUT)
+    processes = cache.get(METRICS_PROCESSES_KEY) or []
+    if key not in processes:
+        cache.set(METRICS_PROCESSES_KEY, processes + [key], None)
+
+
+def collect_metrics():
+    """
+    Connection metrics of every process that reported recently.
+
+    Returns:
+        dict: {'processes': {process key: metrics}, 'totals': counts by consumer}
+    """
+    keys = cache.get(METRICS_PROCESSES_KEY) or []
+    reports = cache.get_many(keys)
+    if len(reports) != len(keys):
+        cache.set(METRICS_PROCESSES_KEY, list(reports), None)  # Drop processes that went away
+
+    totals = defaultdict(lambda: {'live': 0, 'idle': None, 'reaped': 0})
+    for report in reports.values():
+        for name, counts in report['consumers'].items():
+            for field, value in counts.items():
+                if value is not None:
+                    totals[name][field] = (totals[name][field] or 0) + value
+    return {'processes': reports, 'totals': dict(totals)}
+
+
+async def _report_metrics():
+    while True:
+        await asyncio.sleep(max(WS_HEARTBEAT_INTERVAL, 10))
+        try:
+            await sync_to_async(_publish_metrics)()
+        except Exception as e:
+            logger.error(f"Failed to publish WebSocket metrics: {e}")
+
+
+class HeartbeatMixin:
+    """
+    Mix into an AsyncWebsocketConsumer or AsyncJsonWebsocketConsumer
+    (before the base class) to ping the client and reap dead connections.
+    The consumer's disconnect() runs exactly once, whether the client
+    leaves or is reaped.
+
+    Only consumers with client_answers_pings are pinged and reaped.
+    """
+    client_answers_pings = False
+
+    async def accept(self, *args, **kwargs):
+        global _reporter
+
+        await super().accept(*args, **kwargs)
+        self.last_seen = time.monotonic()
+        self.reaped = False
+        _connections[type(self).__name__].add(self)
+
+        if _reporter is None or _reporter.done():
+            _reporter = asyncio.ensure_future(_report_metrics())
+        if WS_HEARTBEAT_INTERVAL and self.client_answers_pings:
+            _pinged.add(type(self).__name__)
+            self.heartbeat_task = asyncio.ensure_future(self.heartbeat())
+
+    async def heartbeat(self):
+        while True:
+            await asyncio.sleep(WS_HEARTBEAT_INTERVAL)
+            if time.monotonic() - self.last_seen > WS_HEARTBEAT_TIMEOUT:
+                await self.reap()
+                return
+            try:
+                await self.send(text_data=json.dumps({"type": "ping", "ts": int(time.time())}))
+            except Exception:
+                await self.reap()
+                return
+
+    async def reap(self):
+        """Close a silent connection and release its groups now"""
+        logger.info(f"Reaping silent {type(self).__name__} connection {self.channel_name}")
+        _reaped[type(self).__name__] += 1
+        try:
+            await self.close(code=WS_REAPED_CLOSE_CODE)
+        except Exception:
+            pass
+        self.reaped = True
+        await self.release(WS_REAPED_CLOSE_CODE)
+
+    async def release(self, code):
+        _connections[type(self).__name__].discard(self)
+        for group in self.groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+        await self.disconnect(code)
+
+    async def websocket_receive(self, message):
+        self.last_seen = time.monotonic()
+        text = message.get("text")
+        if text and '"pong"' in text:
+            try:
+                if json.loads(text).get("type") == "pong":
+                    return
+            except (ValueError, AttributeError):
+                pass
+        await super().websocket_receive(message)
+
+    async def websocket_disconnect(self, message):
+        task = getattr(self, "heartbeat_task", None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        if not getattr(self, "reaped", False):
+            await self.release(message.get("code"))
+        raise StopConsumer()
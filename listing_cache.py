@@ -0,0 +1,179 @@
+# auctions/listing_cache.py
+"""
+Cache for the browse listing endpoint (/api/auctions/browse/) used by
+BrowseAuctions.jsx and GuestBrowseAuctions.jsx.
+
+Pages are cached under a key built from the filter/order/page parameters,
+exactly as given since the view filters on exact values, plus surrogate-key generations: one for the page's category
+(or the "all" generation for uncategorized listings). Changing an auction
+bumps the generations of its category and of "all", which orphans every
+page that could contain it. Bids do not invalidate listings, prices on
+cached pages are at most LISTING_CACHE_TIMEOUT seconds old.
+"""
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+LISTING_CACHE_TIMEOUT = getattr(settings, 'LISTING_CACHE_TIMEOUT', 30)
+LISTING_BROWSER_MAX_AGE = getattr(settings, 'LISTING_BROWSER_MAX_AGE', 15)
+LISTING_WARM_CATEGORIES = getattr(settings, 'LISTING_WARM_CATEGORIES', 10)
+LISTING_WARM_PAGES = getattr(settings, 'LISTING_WARM_PAGES', 3)
+LISTING_CACHE_VIEW = getattr(settings, 'LISTING_CACHE_VIEW', 'auctions.browse_views.AuctionListView')
+# Scheme and host the API is served from, e.g. "https://api.example.com". Warmed pages carry
+# absolute links (pagination, images) built from it, so it must be the public address
+LISTING_SITE_URL = getattr(settings, 'LISTING_SITE_URL', None)
+
+# Parameters that change the listing, anything else is ignored for the key
+LISTING_PARAMS = (
+    'search', 'status', 'category', 'condition', 'min_price', 'max_price',
+    'ordering', 'page', 'page_size',
+)
+
+# Parameter values the view applies when they are missing, dropped so both share a key
+LISTING_DEFAULTS = {'page': '1', 'ordering': '-start_time'}
+
+ALL_SURROGATE = 'all'
+
+
+def _generation_key(surrogate):
+    return f"listing:gen:{surrogate}"
+
+
+def get_generation(surrogate):
+    key = _generation_key(surrogate)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def purge_surrogates(*surrogates):
+    """Invalidate every cached listing tagged with one of the surrogate keys after commit"""
+    def purge():
+        for surrogate in surrogates:
+            try:
+                cache.incr(_generation_key(surrogate))
+            except ValueError:
+                cache.add(_generation_key(surrogate), time.time_ns(), None)
+
+    transaction.on_commit(purge)
+
+
+def category_surrogate(category):
+    return f"category:{category or ''}"
+
+
+def purge_auction(category, previous_category=None):
+    """Invalidate listings that can contain an auction in `category` (and its old category)"""
+    surrogates = {ALL_SURROGATE, category_surrogate(category)}
+    if previous_category is not None:
+        surrogates.add(category_surrogate(previous_category))
+    purge_surrogates(*surrogates)
+
+
+def normalize_params(query_params):
+    """Listing parameters in a fixed order with defaults dropped"""
+    params = []
+    for name in LISTING_PARAMS:
+        value = str(query_params.get(name) or '').strip()
+        if not value or LISTING_DEFAULTS.get(name) == value:
+            continue
+        params.append((name, value))
+    return params
+
+
+def listing_cache_key(query_params):
+    params = normalize_params(query_params)
+    category = dict(params).get('category')
+    surrogate = category_surrogate(category) if category else ALL_SURROGATE
+    digest = hashlib.md5(urlencode(params).encode()).hexdigest()
+    return f"listing:{surrogate}:g{get_generation(surrogate)}:{digest}"
+
+
+class CachedListingMixin:
+    """
+    Serve a ListAPIView over AuctionItem from the listing cache.
+
+    The rendered listing must not depend on the requesting user.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key = listing_cache_key(request.query_params)
+        data = cache.get(key)
+        if data is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            data = response.data
+            cache.set(key, data, LISTING_CACHE_TIMEOUT)
+
+        response = Response(data)
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, max_age=0)
+        else:
+            # Anonymous pages are identical for everyone, let browsers and CDNs share them
+            patch_cache_control(response, public=True, max_age=LISTING_BROWSER_MAX_AGE)
+        return response
+
+
+def warm_listings():
+    """
+    Render the first pages of the busiest categories into the cache.
+
+    LISTING_CACHE_VIEW names the browse ListAPIView, by default
+    auctions.browse_views.AuctionListView. Pages are rendered as if
+    requested from LISTING_SITE_URL, so their absolute URLs match the
+    ones real requests get.
+
+    Returns:
+        int: Number of pages rendered
+    """
+    from django.db.models import Count
+    from rest_framework.test import APIRequestFactory
+
+    from auctions.models import AuctionItem
+
+    if not LISTING_CACHE_VIEW:
+        logger.warning("LISTING_CACHE_VIEW not configured - skipping listing warm-up")
+        return 0
+    if not LISTING_SITE_URL:
+        logger.warning("LISTING_SITE_URL not configured - skipping listing warm-up")
+        return 0
+    site = urlsplit(LISTING_SITE_URL)
+
+    view = import_string(LISTING_CACHE_VIEW).as_view()
+    factory = APIRequestFactory()
+
+    top_categories = list(
+        AuctionItem.objects.filter(status='active')
+        .values('category')
+        .annotate(count=Count('id'))
+        .order_by('-count')
+        .values_list('category', flat=True)[:LISTING_WARM_CATEGORIES]
+    )
+
+    rendered = 0
+    for category in [None] + top_categories:
+        for page in range(1, LISTING_WARM_PAGES + 1):
+            params = {'page': page}
+            if category:
+                params['category'] = category
+            request = factory.get(
+                '/api/auctions/browse/', params, HTTP_HOST=site.netloc, secure=site.scheme == 'https',
+            )
+            # Drop the current copy so the view re-renders it with a fresh TTL
+            cache.delete(listing_cache_key(params))
+            view(request).render()
+            rendered += 1
+    return rendered
@@ -0,0 +1,49 @@
+# payments/management/commands/backfill_rollups.py
+"""
+Rebuild the daily per-category rollups from the raw Bid and AuctionItem tables.
+
+Usage:
+    python manage.py backfill_rollups --days 365
+    python manage.py backfill_rollups --start 2024-01-01 --end 2024-12-31
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payments.rollups import backfill
+
+
+class Command(BaseCommand):
+    help = "Rebuild DailyCategoryStats rows for a date range from the raw tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Rebuild the last N days (default 90)')
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD), defaults to today')
+        parser.add_argument('--chunk-days', type=int, default=31, help='Days rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            end = date.fromisoformat(options['end']) if options['end'] else timezone.localdate()
+            if options['start']:
+                start = date.fromisoformat(options['start'])
+            else:
+                start = end - timedelta(days=options['days'])
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        if start > end:
+            raise CommandError("--start must not be after --end")
+
+        # Rebuild in chunks so each transaction stays short
+        total = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=options['chunk_days'] - 1), end)
+            rows = backfill(chunk_start, chunk_end)
+            total += rows
+            self.stdout.write(f"  {chunk_start} → {chunk_end}: {rows} rows")
+            chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt {total} rollup rows for {start} → {end}"))
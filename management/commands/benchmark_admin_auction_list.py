@@ -0,0 +1,119 @@
+# auctions/management/commands/benchmark_admin_auction_list.py
+"""
+Benchmark the admin auction list against auctions that each carry many bids.
+
+Seeds the fixtures inside a transaction that is rolled back at the end,
+so it is safe to run against a development database.
+
+Usage:
+    python manage.py benchmark_admin_auction_list --user admin@example.com
+    python manage.py benchmark_admin_auction_list --user admin@example.com --auctions 50 --bids 10000
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auctions.admin_views import AdminAuctionListView
+from auctions.models import AuctionItem, Bid
+from auctions.serializers import AuctionItemSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Time the admin auction list (old prefetch path vs annotated list path) on auctions with many bids"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='Email of a staff user, also used as seller and bidder')
+        parser.add_argument('--auctions', type=int, default=20, help='Auctions to seed (default 20)')
+        parser.add_argument('--bids', type=int, default=10000, help='Bids per auction (default 10000)')
+        parser.add_argument('--pages', type=int, default=5, help='Pages to walk with each path (default 5)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per path (default 3)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(email=options['user'], is_staff=True)
+        except User.DoesNotExist:
+            raise CommandError(f"No staff user with email {options['user']}")
+
+        try:
+            with transaction.atomic():
+                self.seed(user, options['auctions'], options['bids'])
+                self.report('prefetch (old)', lambda: self.run_prefetch_path(options['pages']), options['repeat'])
+                self.report('annotated list', lambda: self.run_list_view(user, options['pages']), options['repeat'])
+                raise Rollback()
+        except Rollback:
+            self.stdout.write("Seeded fixtures rolled back.")
+
+    def seed(self, user, auctions, bids):
+        started = timezone.now()
+        self.stdout.write(f"Seeding {auctions} auctions × {bids} bids...")
+
+        items = AuctionItem.objects.bulk_create([
+            AuctionItem(
+                seller=user,
+                item_name=f"Benchmark item {i}",
+                description="Benchmark fixture",
+                category="benchmark",
+                starting_price=Decimal('1.00'),
+                current_price=Decimal(bids),
+                start_time=started - timedelta(minutes=i),
+                end_time=started + timedelta(days=7),
+                status='active',
+            )
+            for i in range(auctions)
+        ])
+
+        for item in items:
+            Bid.objects.bulk_create(
+                (Bid(auction_item=item, user=user, amount=Decimal(n + 1)) for n in range(bids)),
+                batch_size=2000,
+            )
+
+        self.stdout.write(f"Seeded in {(timezone.now() - started).total_seconds():.1f}s")
+
+    def run_prefetch_path(self, pages):
+        """What AdminAuctionListView did before: prefetch every bid and image on the page"""
+        queryset = (
+            AuctionItem.objects.select_related('seller', 'winner')
+            .prefetch_related('images', 'bids')
+            .order_by('-start_time')
+        )
+        for page in range(pages):
+            rows = queryset[page * 20:(page + 1) * 20]
+            AuctionItemSerializer(rows, many=True).data
+
+    def run_list_view(self, user, pages):
+        """Walk the current view page by page following the keyset cursor"""
+        factory = APIRequestFactory()
+        view = AdminAuctionListView.as_view()
+        path = '/admin/auctions/'
+        for _ in range(pages):
+            request = factory.get(path)
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            path = response.data.get('next')
+            if not path:
+                break
+
+    def report(self, label, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+
+        best = min(timings) * 1000
+        self.stdout.write(f"{label:>16}: best {best:.1f} ms over {repeat} runs, {len(queries)} queries")
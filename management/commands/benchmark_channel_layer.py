@@ -0,0 +1,104 @@
+# auctions/management/commands/benchmark_channel_layer.py
+"""
+Compare group_send on the stock channel layer with HybridChannelLayer.
+
+A hot room is simulated as one group with many members in this process.
+Each publish is timed until every member has received it. The members are
+plain receive loops, so the numbers isolate the channel layer from
+consumer code.
+
+Usage:
+    python manage.py benchmark_channel_layer
+    python manage.py benchmark_channel_layer --members 1000 --messages 200
+    python manage.py benchmark_channel_layer --redis redis://127.0.0.1:6379
+"""
+import asyncio
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from auctions.channel_layers import HybridChannelLayer
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = "Time group_send fan-out to local members on the stock layer and on HybridChannelLayer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=500, help='Members in the room (default 500)')
+        parser.add_argument('--messages', type=int, default=100, help='Publishes to time (default 100)')
+        parser.add_argument('--redis', help='Redis URL for channels_redis (default: in-memory layer)')
+
+    def handle(self, *args, **options):
+        if options['redis']:
+            inner = {
+                'BACKEND': 'channels_redis.core.RedisChannelLayer',
+                'CONFIG': {'hosts': [options['redis']], 'capacity': options['messages'] * 2},
+            }
+        else:
+            inner = {
+                'BACKEND': 'channels.layers.InMemoryChannelLayer',
+                'CONFIG': {'capacity': options['messages'] * 2},
+            }
+
+        layers = [
+            ('stock', lambda: import_string(inner['BACKEND'])(**inner['CONFIG'])),
+            ('hybrid', lambda: HybridChannelLayer(inner=inner, local_capacity=options['messages'] * 2)),
+        ]
+
+        self.stdout.write(f"{options['members']} members, {options['messages']} publishes, inner layer {inner['BACKEND']}")
+        self.stdout.write(f"{'layer':<8} {'p50 ms':>9} {'p99 ms':>9} {'msgs/s':>11} {'shared-layer copies':>20}")
+        for name, factory in layers:
+            latencies, elapsed, copies = asyncio.run(self.run(factory(), options['members'], options['messages']))
+            self.stdout.write(
+                f"{name:<8} {statistics.median(latencies) * 1000:>9.3f} {percentile(latencies, 99) * 1000:>9.3f} "
+                f"{options['members'] * options['messages'] / elapsed:>11.0f} {copies:>20}"
+            )
+
+    async def run(self, layer, members, messages):
+        group = 'benchmark_room'
+        channels = [await layer.new_channel() for _ in range(members)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+
+        received = 0
+        all_received = asyncio.Event()
+
+        async def member(channel):
+            nonlocal received
+            for _ in range(messages):
+                await layer.receive(channel)
+                received += 1
+                if received % members == 0:
+                    all_received.set()
+
+        tasks = [asyncio.ensure_future(member(channel)) for channel in channels]
+        await asyncio.sleep(0)
+
+        latencies = []
+        started = time.perf_counter()
+        for i in range(messages):
+            all_received.clear()
+            sent = time.perf_counter()
+            await layer.group_send(group, {'type': 'send_bid_update', 'amount': i})
+            await all_received.wait()
+            latencies.append(time.perf_counter() - sent)
+        elapsed = time.perf_counter() - started
+
+        await asyncio.gather(*tasks)
+        for channel in channels:
+            await layer.group_discard(group, channel)
+
+        # Copies written to the shared layer per publish: one per member for
+        # the stock layer, one per process (here: one) for the hybrid layer
+        copies = messages if isinstance(layer, HybridChannelLayer) else messages * members
+
+        if hasattr(layer, 'flush'):
+            await layer.flush()
+        return latencies, elapsed, copies
@@ -0,0 +1,100 @@
+# auctions/management/commands/benchmark_websockets.py
+"""
+WebSocket capacity benchmark (see ws_benchmark.py).
+
+Runs in-process against the in-memory layer by default, or a local Redis
+with --redis. Needs no network or database.
+
+Usage:
+    python manage.py benchmark_websockets
+    python manage.py benchmark_websockets --watchers 1000,10000,50000 --chatters 200
+    python manage.py benchmark_websockets --layer hybrid --redis redis://127.0.0.1:6379
+    python manage.py benchmark_websockets --scenarios broadcast --json
+    python manage.py benchmark_websockets --scenarios connect --authenticated
+"""
+import asyncio
+import contextlib
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+SCENARIOS = ('connect', 'broadcast', 'chat')
+
+
+class Command(BaseCommand):
+    help = "Measure connect storms, bid broadcast fan-out and chat bursts for AuctionConsumer/AuctionChatConsumer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated subset of connect,broadcast,chat')
+        parser.add_argument('--watchers', default='1000,10000', help='Client counts for connect and broadcast (default 1000,10000)')
+        parser.add_argument('--bids', type=int, default=20, help='Broadcasts per fan-out run (default 20)')
+        parser.add_argument('--chatters', type=int, default=100, help='Clients in the chat room (default 100)')
+        parser.add_argument('--messages', type=int, default=10, help='Messages per chatter (default 10)')
+        parser.add_argument('--concurrency', type=int, default=500, help='Connects in flight at once (default 500)')
+        parser.add_argument('--layer', choices=('memory', 'redis', 'hybrid'), default='memory',
+                            help='memory, redis (channels_redis) or hybrid (HybridChannelLayer over --redis or memory)')
+        parser.add_argument('--redis', help='Redis URL (default redis://127.0.0.1:6379 for --layer redis, in-memory inner layer for hybrid)')
+        parser.add_argument('--authenticated', action='store_true',
+                            help='Connect logged-in clients, whose joins fan user_joined out to the room')
+        parser.add_argument('--json', action='store_true', help='Print one JSON object per result')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        try:
+            watcher_counts = [int(count) for count in options['watchers'].split(',')]
+        except ValueError:
+            raise CommandError("--watchers takes comma-separated integers")
+
+        with override_settings(CHANNEL_LAYERS={'default': self.layer_config(options)}):
+            results = asyncio.run(self.run(scenarios, watcher_counts, options))
+
+        for result in results:
+            if options['json']:
+                self.stdout.write(json.dumps(result))
+            else:
+                self.stdout.write('  '.join(f"{key}={value}" for key, value in result.items()))
+
+    def layer_config(self, options):
+        redis = {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [options['redis'] or 'redis://127.0.0.1:6379'], 'capacity': 1000},
+        }
+        memory = {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+            'CONFIG': {'capacity': 1000},
+        }
+        if options['layer'] == 'redis':
+            return redis
+        if options['layer'] == 'hybrid':
+            return {
+                'BACKEND': 'auctions.channel_layers.HybridChannelLayer',
+                'CONFIG': {'inner': redis if options['redis'] else memory, 'local_capacity': 1000},
+            }
+        return memory
+
+    async def run(self, scenarios, watcher_counts, options):
+        from auctions import ws_benchmark
+
+        layer = options['layer']
+        results = []
+        for count in watcher_counts:
+            if 'connect' in scenarios:
+                result = await ws_benchmark.connect_storm(
+                    count, options['concurrency'], authenticated=options['authenticated'],
+                )
+                results.append({'layer': layer, **result})
+            if 'broadcast' in scenarios:
+                result = await ws_benchmark.broadcast_fanout(count, options['bids'], options['concurrency'])
+                results.append({'layer': layer, **result})
+
+        if 'chat' in scenarios:
+            # AuctionChatConsumer prints per message, keep that out of the report
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                result = await ws_benchmark.chat_burst(options['chatters'], options['messages'], options['concurrency'])
+            results.append({'layer': layer, **result})
+        return results
@@ -0,0 +1,49 @@
+# payments/management/commands/check_query_plans.py
+"""
+Report index usage for the hot ORM queries and query counts per endpoint.
+
+Usage:
+    python manage.py check_query_plans
+    python manage.py check_query_plans --verbose-plans
+    python manage.py check_query_plans --user admin@example.com
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.query_plans import check_hot_queries, count_endpoint_queries
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN hot ORM queries, fail on sequential scans and report per-endpoint query counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every query')
+        parser.add_argument('--user', help='Email of a staff user used to count queries per endpoint')
+
+    def handle(self, *args, **options):
+        failures = []
+
+        for name, result in check_hot_queries().items():
+            if result['uses_index']:
+                self.stdout.write(self.style.SUCCESS(f"✅ {name}: index"))
+            else:
+                failures.append(name)
+                tables = ', '.join(result['seq_scans'])
+                self.stdout.write(self.style.ERROR(f"❌ {name}: sequential scan on {tables}"))
+
+            if options['verbose_plans'] or not result['uses_index']:
+                self.stdout.write(result['plan'])
+
+        if options['user']:
+            User = get_user_model()
+            try:
+                user = User.objects.get(email=options['user'], is_staff=True)
+            except User.DoesNotExist:
+                raise CommandError(f"No staff user with email {options['user']}")
+
+            self.stdout.write("\nQueries per endpoint:")
+            for name, result in count_endpoint_queries(user).items():
+                self.stdout.write(f"  {name}: {result['queries']} queries (HTTP {result['status']})")
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries fall back to a sequential scan: {', '.join(failures)}")
@@ -0,0 +1,26 @@
+# payments/management/commands/rebuild_bid_log.py
+"""
+Rewrite the bid event log and price series from Bid rows, e.g. after
+enabling them or losing the log volume.
+
+Usage:
+    python manage.py rebuild_bid_log
+    python manage.py rebuild_bid_log --auction 42 --auction 43
+"""
+from django.core.management.base import BaseCommand
+
+from payments import price_series
+from payments.bid_log import BID_LOG_DIR, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the append-only bid event log and price series from the Bid table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--auction', type=int, action='append', help='Only this auction (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Bids fetched per chunk')
+
+    def handle(self, *args, **options):
+        written = rebuild(options['auction'], batch_size=options['batch_size'])
+        points = price_series.rebuild(options['auction'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Wrote {written} events and {points} price points to {BID_LOG_DIR}"))
@@ -0,0 +1,28 @@
+# payments/management/commands/rebuild_search_index.py
+"""
+Rebuild the auction search index from scratch.
+
+Usage:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --status active
+"""
+from django.core.management.base import BaseCommand
+
+from auctions.models import AuctionItem
+from payments.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild AuctionSearchTerm rows for every auction"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', help='Only reindex auctions with this status')
+        parser.add_argument('--batch-size', type=int, default=500, help='Auctions fetched per chunk')
+
+    def handle(self, *args, **options):
+        queryset = AuctionItem.objects.order_by('pk')
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+
+        count = rebuild_index(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Indexed {count} auctions"))
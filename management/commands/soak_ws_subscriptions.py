@@ -0,0 +1,95 @@
+# auctions/management/commands/soak_ws_subscriptions.py
+"""
+Soak test for BuyerDashboardConsumer subscriptions.
+
+Runs rounds of simulated dashboard clients against an in-memory channel
+layer. Each client connects, subscribes to a batch of auctions, drops a
+few, and disconnects. After every round the layer should hold no groups,
+and traced memory should stay flat from round to round.
+
+Usage:
+    python manage.py soak_ws_subscriptions
+    python manage.py soak_ws_subscriptions --rounds 50 --clients 200 --auctions 40
+"""
+import asyncio
+import gc
+import tracemalloc
+from types import SimpleNamespace
+
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from auctions.consumers import BuyerDashboardConsumer
+
+
+class ScopeUser:
+    """ASGI wrapper that puts a fake authenticated user in the scope"""
+
+    def __init__(self, app, user_id):
+        self.app = app
+        self.user = SimpleNamespace(id=user_id, is_authenticated=True, is_anonymous=False)
+
+    async def __call__(self, scope, receive, send):
+        return await self.app(dict(scope, user=self.user), receive, send)
+
+
+class Command(BaseCommand):
+    help = "Show channel-layer group memberships and memory staying flat across dashboard connect/disconnect rounds"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=20, help='Connect/disconnect rounds (default 20)')
+        parser.add_argument('--clients', type=int, default=100, help='Concurrent clients per round (default 100)')
+        parser.add_argument('--auctions', type=int, default=20, help='Auctions each client subscribes to (default 20)')
+        parser.add_argument('--max-growth-kb', type=int, default=256, help='Allowed memory growth after warm-up (default 256 KB)')
+
+    def handle(self, *args, **options):
+        with override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}):
+            asyncio.run(self.soak(options))
+
+    async def soak(self, options):
+        app = BuyerDashboardConsumer.as_asgi()
+        layer = get_channel_layer()
+
+        tracemalloc.start()
+        baseline = None
+        self.stdout.write(f"{'round':>5}  {'groups':>7}  {'members':>8}  {'memory KB':>10}")
+
+        for round_number in range(1, options['rounds'] + 1):
+            await asyncio.gather(*(
+                self.run_client(app, user_id, round_number, options['auctions'])
+                for user_id in range(1, options['clients'] + 1)
+            ))
+
+            gc.collect()
+            groups = len(layer.groups)
+            members = sum(len(channels) for channels in layer.groups.values())
+            memory = tracemalloc.get_traced_memory()[0] // 1024
+            if round_number == 2:
+                baseline = memory  # First round pays for imports and caches
+            self.stdout.write(f"{round_number:>5}  {groups:>7}  {members:>8}  {memory:>10}")
+
+            if groups or members:
+                raise CommandError(f"Round {round_number} left {members} memberships in {groups} groups")
+
+        tracemalloc.stop()
+        if baseline is not None and memory - baseline > options['max_growth_kb']:
+            raise CommandError(f"Memory grew by {memory - baseline} KB after warm-up")
+        self.stdout.write(self.style.SUCCESS("Group memberships and memory stayed flat."))
+
+    async def run_client(self, app, user_id, round_number, auctions):
+        communicator = WebsocketCommunicator(ScopeUser(app, user_id), "/ws/buyer-dashboard/")
+        connected, _ = await communicator.connect()
+        if not connected:
+            raise CommandError(f"Client {user_id} was refused")
+
+        # Spread subscriptions so clients share some groups and not others
+        first = (user_id * 7 + round_number) % 1000 + 1
+        auction_ids = list(range(first, first + auctions))
+        await communicator.send_json_to({"action": "subscribe", "auction_ids": auction_ids})
+        await communicator.receive_json_from()
+        await communicator.send_json_to({"action": "unsubscribe", "auction_ids": auction_ids[:auctions // 4]})
+        await communicator.receive_json_from()
+
+        await communicator.disconnect()
@@ -0,0 +1,36 @@
+# auctions/management/commands/ws_connection_metrics.py
+"""
+Print live, idle and reaped WebSocket connections reported by every ASGI
+process (see heartbeat.py). Idle shows "-" for consumers that are not pinged.
+
+Usage:
+    python manage.py ws_connection_metrics
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from auctions.heartbeat import collect_metrics
+
+
+class Command(BaseCommand):
+    help = "Show WebSocket connection metrics per consumer across ASGI processes"
+
+    def handle(self, *args, **options):
+        metrics = collect_metrics()
+        if not metrics['processes']:
+            self.stdout.write("No ASGI process has reported metrics recently.")
+            return
+
+        for process, report in sorted(metrics['processes'].items()):
+            updated = datetime.fromtimestamp(report['updated_at']).strftime('%H:%M:%S')
+            self.stdout.write(f"{process} (updated {updated})")
+            self.write_counts(report['consumers'])
+
+        self.stdout.write("Total")
+        self.write_counts(metrics['totals'])
+
+    def write_counts(self, consumers):
+        for name, counts in sorted(consumers.items()):
+            idle = '-' if counts['idle'] is None else counts['idle']
+            self.stdout.write(f"  {name:<26} live {counts['live']:>6}  idle {idle:>6}  reaped {counts['reaped']:>6}")
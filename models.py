@@ -53,6 +53,9 @@ class PaymentMethod(models.Model):
 
     class Meta:
         ordering = ['-is_default', '-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='payment_method_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.card_brand.upper()} ending in {self.last_four_digits}"
@@ -95,7 +98,8 @@ class Payment(models.Model):
         max_length=255, 
         blank=True, 
         null=True,
-        default=None
+        default=None,
+        db_index=True
     )
     stripe_payment_method_id = models.CharField(
         max_length=255, 
@@ -128,6 +132,11 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='payment_user_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='payment_status_created_idx'),
+            models.Index(fields=['-created_at'], name='payment_created_idx'),
+        ]
 
     def __str__(self):
         return f"Payment {self.id} - {self.status} (${self.amount})"
@@ -144,8 +153,188 @@ class WebhookEvent(models.Model):
     
     class Meta:
         ordering = ['-processed_at']
+        indexes = [
+            models.Index(fields=['-processed_at'], name='webhook_event_processed_idx'),
+        ]
         verbose_name = "Webhook Event"
         verbose_name_plural = "Webhook Events"
     
     def __str__(self):
-        return f"{self.event_type} - {self.stripe_event_id}"
\ No newline at end of file
+        return f"{self.event_type} - {self.stripe_event_id}"
+
+class RefundJob(models.Model):
+    """
+    A bulk refund run started by an admin.
+    Tracks progress while the refund engine works through the payments.
+    """
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    )
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="refund_jobs"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="pending"
+    )
+    reason = models.TextField(blank=True, null=True)
+
+    # Payments selected for refund and per-payment failure messages
+    payment_ids = models.JSONField(default=list)
+    errors = models.JSONField(default=dict, blank=True)
+
+    # Progress counters
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    succeeded = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Refund Job"
+        verbose_name_plural = "Refund Jobs"
+
+    def __str__(self):
+        return f"Refund job {self.id} - {self.status} ({self.processed}/{self.total})"
+
+
+class StatCounter(models.Model):
+    """
+    Incrementally maintained marketplace total (see stats.py).
+    Each counter is split across a few shard rows so concurrent bids
+    don't all queue on the same row lock.
+    """
+    name = models.CharField(max_length=50)
+    shard = models.PositiveSmallIntegerField(default=0)
+    value = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name', 'shard']
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'shard'], name='unique_stat_counter_shard'),
+        ]
+        verbose_name = "Stat Counter"
+        verbose_name_plural = "Stat Counters"
+
+    def __str__(self):
+        return f"{self.name}[{self.shard}] = {self.value}"
+
+
+
+class DailyCategoryStats(models.Model):
+    """
+    Per-day, per-category marketplace facts for the admin analytics page.
+    Maintained incrementally from model signals (see rollups.py) and
+    rebuilt with the backfill_rollups management command.
+    """
+    day = models.DateField()
+    category = models.CharField(max_length=100, blank=True, default='')
+    bid_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    auctions_opened = models.IntegerField(default=0)
+    auctions_closed = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['day', 'category']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category'], name='unique_daily_category_stats'),
+        ]
+        verbose_name = "Daily Category Stats"
+        verbose_name_plural = "Daily Category Stats"
+
+    def __str__(self):
+        return f"{self.day} {self.category or '-'}: {self.bid_count} bids, ${self.revenue}"
+
+
+class AuctionSearchTerm(models.Model):
+    """
+    Inverted index entry for auction search (see search.py).
+    One row per (term, auction) with the summed weight of the fields the term appears in.
+    """
+    term = models.CharField(max_length=64, db_index=True)
+    auction = models.ForeignKey(
+        'auctions.AuctionItem',
+        on_delete=models.CASCADE,
+        related_name='search_terms'
+    )
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'auction'], name='unique_auction_search_term'),
+        ]
+        verbose_name = "Auction Search Term"
+        verbose_name_plural = "Auction Search Terms"
+
+    def __str__(self):
+        return f"{self.term} → auction {self.auction_id} ({self.weight})"
+
+
+class WatchlistEntry(models.Model):
+    """
+    An auction a user is watching.
+    The (auction, user) index is the inverted index used to fan bid and
+    close events out to watchers (see watchlist.py).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="watchlist_entries")
+    auction = models.ForeignKey(
+        'auctions.AuctionItem',
+        on_delete=models.CASCADE,
+        related_name='watchlist_entries'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['auction', 'user'], name='unique_watchlist_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='watchlist_user_created_idx'),
+        ]
+        verbose_name = "Watchlist Entry"
+        verbose_name_plural = "Watchlist Entries"
+
+    def __str__(self):
+        return f"{self.user_id} watches auction {self.auction_id}"
+
+
+class ChatArchive(models.Model):
+    """
+    Compressed chat log of a closed auction (see chat_archive.py).
+    The rows it replaces are deleted from AuctionChatMessage.
+    """
+    auction = models.OneToOneField(
+        'auctions.AuctionItem',
+        on_delete=models.CASCADE,
+        related_name='chat_archive'
+    )
+    data = models.BinaryField(help_text="zlib-compressed JSON lines, oldest message first")
+    message_count = models.PositiveIntegerField(default=0)
+    first_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    size_bytes = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-archived_at']
+        verbose_name = "Chat Archive"
+        verbose_name_plural = "Chat Archives"
+
+    def __str__(self):
+        return f"Chat archive of auction {self.auction_id} ({self.message_count} messages)"
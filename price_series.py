@@ -0,0 +1,242 @@
+# payments/price_series.py
+"""
+Per-auction price history for auction charts.
+
+Each accepted bid appends one (timestamp µs, price in cents) pair of int64s
+to <BID_LOG_DIR>/<auction_id>/price.series, next to the bid event log
+(see bid_log.py). Reads map the file and split it into two array('q')
+columns without parsing row by row.
+
+The file is a local copy: a host only appends the bids it accepted
+(BID_LOG_DIR is local disk), and retracted bids stay in it. Bid rows are
+the source of truth, so the file is only read when it holds exactly as
+many points as the auction has bids, otherwise the series is loaded
+from the Bid rows.
+
+Charts ask for a resolution (number of points) and get the series
+downsampled with Largest-Triangle-Three-Buckets, or min/max per bucket.
+Results are cached per bid count and latest bid id, which every host
+agrees on, so until the next bid a chart is served from the cache.
+
+Recording is switched by PRICE_SERIES_ENABLED, independently of the bid
+event log.
+"""
+import logging
+import mmap
+import os
+import struct
+from array import array
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .bid_log import auction_dir, from_micros, to_cents, to_micros
+
+logger = logging.getLogger(__name__)
+
+PRICE_SERIES_ENABLED = getattr(settings, 'PRICE_SERIES_ENABLED', True)
+PRICE_SERIES_DEFAULT_POINTS = getattr(settings, 'PRICE_SERIES_DEFAULT_POINTS', 300)
+PRICE_SERIES_MAX_POINTS = getattr(settings, 'PRICE_SERIES_MAX_POINTS', 2000)
+PRICE_SERIES_CACHE_TIMEOUT = getattr(settings, 'PRICE_SERIES_CACHE_TIMEOUT', 3600)
+
+POINT = struct.Struct('<qq')
+SERIES_FILE = 'price.series'
+MODES = ('lttb', 'minmax')
+
+
+def series_path(auction_id):
+    return os.path.join(auction_dir(auction_id), SERIES_FILE)
+
+
+def series_length(auction_id):
+    try:
+        return os.path.getsize(series_path(auction_id)) // POINT.size
+    except FileNotFoundError:
+        return 0
+
+
+def record(auction_id, when, amount):
+    """Append one accepted bid to an auction's series"""
+    os.makedirs(auction_dir(auction_id), exist_ok=True)
+    fd = os.open(series_path(auction_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, POINT.pack(to_micros(when), to_cents(amount)))
+    finally:
+        os.close(fd)
+
+
+def record_bid(bid):
+    try:
+        record(bid.auction_item_id, bid.created_at, bid.amount)
+    except OSError as e:
+        logger.error(f"Failed to record price of bid {bid.pk}: {e}")
+
+
+def load_bids(auction_id):
+    """load() from the auction's Bid rows, in (created_at, id) order"""
+    from auctions.models import Bid
+
+    values = array('q')
+    rows = (
+        Bid.objects.filter(auction_item_id=auction_id)
+        .order_by('created_at', 'id')
+        .values_list('created_at', 'amount')
+        .iterator(chunk_size=5000)
+    )
+    for created_at, amount in rows:
+        values.append(to_micros(created_at))
+        values.append(to_cents(amount))
+    return values[0::2], values[1::2]
+
+
+def load(auction_id):
+    """
+    Returns:
+        tuple: (timestamps, prices) as array('q') columns, µs and cents
+    """
+    values = array('q')
+    try:
+        with open(series_path(auction_id), 'rb') as series:
+            size = os.fstat(series.fileno()).st_size // POINT.size * POINT.size
+            if size:
+                with mmap.mmap(series.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    values.frombytes(mapped[:size])
+    except FileNotFoundError:
+        pass
+    return values[0::2], values[1::2]
+
+
+def lttb(xs, ys, threshold):
+    """
+    Indexes of the points Largest-Triangle-Three-Buckets keeps: the first
+    and last point, and per bucket the point spanning the largest triangle
+    with the previous pick and the next bucket's average.
+    """
+    length = len(xs)
+    if threshold >= length:
+        return list(range(length))
+    if threshold < 3:
+        return [0, length - 1]
+
+    picked = [0]
+    every = (length - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        next_start, next_end = end, min(int((i + 2) * every) + 1, length)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        a = best
+
+    picked.append(length - 1)
+    return picked
+
+
+def min_max(ys, buckets):
+    """Indexes of the lowest and highest point of each bucket, in time order"""
+    length = len(ys)
+    if buckets * 2 >= length:
+        return list(range(length))
+
+    picked = []
+    every = length / buckets
+    for i in range(buckets):
+        start, end = int(i * every), int((i + 1) * every)
+        bucket = range(start, end)
+        low = min(bucket, key=ys.__getitem__)
+        high = max(bucket, key=ys.__getitem__)
+        picked.extend(sorted({low, high}))
+    return picked
+
+
+def downsample(auction_id, points=None, mode='lttb'):
+    """
+    Chart points of an auction's price history.
+
+    Args:
+        points (int): Points wanted, capped at PRICE_SERIES_MAX_POINTS
+        mode (str): 'lttb' or 'minmax' (two points per bucket)
+
+    Returns:
+        dict: Raw length and the downsampled series
+    """
+    points = max(2, min(int(points or PRICE_SERIES_DEFAULT_POINTS), PRICE_SERIES_MAX_POINTS))
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+    from auctions.models import Bid
+
+    bids = Bid.objects.filter(auction_item_id=auction_id).aggregate(count=Count('id'), last=Max('id'))
+    key = f"price_series:{auction_id}:{mode}:{points}:{bids['count']}:{bids['last']}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    # The local file misses bids other hosts accepted and keeps retracted ones
+    if series_length(auction_id) == bids['count']:
+        xs, ys = load(auction_id)
+    else:
+        xs, ys = load_bids(auction_id)
+    picked = lttb(xs, ys, points) if mode == 'lttb' else min_max(ys, points // 2)
+    result = {
+        'auction_id': int(auction_id),
+        'length': len(xs),
+        'mode': mode,
+        'series': [
+            {'t': from_micros(xs[i]).isoformat(), 'price': str(Decimal(ys[i]) / 100)}
+            for i in picked
+        ],
+    }
+    cache.set(key, result, PRICE_SERIES_CACHE_TIMEOUT)
+    return result
+
+
+def rebuild(auction_ids=None, batch_size=5000):
+    """
+    Rewrite price series from Bid rows in (created_at, id) order.
+
+    Returns:
+        int: Points written
+    """
+    from auctions.models import AuctionItem, Bid
+
+    auctions = AuctionItem.objects.order_by('pk').values_list('pk', flat=True)
+    if auction_ids is not None:
+        auctions = auctions.filter(pk__in=auction_ids)
+
+    written = 0
+    for auction_id in auctions.iterator(chunk_size=500):
+        bids = (
+            Bid.objects.filter(auction_item_id=auction_id)
+            .order_by('created_at', 'id')
+            .values_list('created_at', 'amount')
+            .iterator(chunk_size=batch_size)
+        )
+        buffer = bytearray()
+        for created_at, amount in bids:
+            buffer += POINT.pack(to_micros(created_at), to_cents(amount))
+
+        path = series_path(auction_id)
+        if not buffer:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        os.makedirs(auction_dir(auction_id), exist_ok=True)
+        with open(path + '.tmp', 'wb') as series:
+            series.write(buffer)
+        os.replace(path + '.tmp', path)
+        written += len(buffer) // POINT.size
+    return written
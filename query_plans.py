@@ -0,0 +1,151 @@
+# payments/query_plans.py
+"""
+Query-plan checks for the hot ORM queries in views.py, webhook_handler.py
+and admin_views.py.
+
+Each hot query is EXPLAINed with sequential scans discouraged, so a missing
+index shows up as a scan no matter how small the local tables are.
+The assertions run in tests.py; check_query_plans reports the same plans
+against a live database.
+
+NOTE: Auction models are imported inside functions to avoid circular imports.
+"""
+import re
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import Payment, PaymentMethod, WebhookEvent
+
+# Planner output that means a table was read without an index
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'SCAN (\w+)(?!\w| USING)'),
+}
+
+
+def _payment_queries():
+    return {
+        # webhook_handler.handle_charge_dispute_created / handle_charge_refunded
+        'payment_by_charge_id': Payment.objects.filter(stripe_charge_id='ch_plan_check'),
+        # views.ConfirmPaymentView / webhook_handler.handle_payment_intent_succeeded
+        'payment_by_intent_id': Payment.objects.filter(stripe_payment_intent_id='pi_plan_check'),
+        # views.PaymentListView
+        'payments_for_user': Payment.objects.filter(user_id=0).order_by('-created_at')[:20],
+        # webhook_handler._check_event_processed
+        'webhook_event_processed': WebhookEvent.objects.filter(stripe_event_id='evt_plan_check'),
+        # webhook_handler.handle_payment_method_detached
+        'payment_method_by_stripe_id': PaymentMethod.objects.filter(
+            stripe_payment_method_id='pm_plan_check'
+        ),
+    }
+
+
+def _auction_queries():
+    from auctions.models import AuctionItem, Bid, Dispute
+
+    since = timezone.now() - timedelta(days=30)
+    return {
+        # admin_views.AdminAuctionListView filters
+        'auctions_by_status': AuctionItem.objects.filter(status='active').order_by('-start_time')[:20],
+        'auctions_by_category': AuctionItem.objects.filter(category='plan_check').order_by('-start_time')[:20],
+        'auctions_ending_before': AuctionItem.objects.filter(end_time__lte=timezone.now())[:20],
+        # admin_views.AdminAnalyticsView revenue trend
+        'closed_auctions_since': AuctionItem.objects.filter(status='closed', end_time__gte=since),
+        # admin_views.AdminAnalyticsView bids per day
+        'bids_since': Bid.objects.filter(created_at__gte=since),
+        # admin_views.DisputeListView
+        'recent_disputes': Dispute.objects.order_by('-created_at')[:20],
+    }
+
+
+def hot_queries():
+    """
+    Return the hot ORM queries keyed by name.
+    Auction queries are skipped when the auctions app is not installed.
+    """
+    queries = _payment_queries()
+    try:
+        queries.update(_auction_queries())
+    except ImportError:
+        pass
+    return queries
+
+
+def explain_query(queryset):
+    """
+    EXPLAIN a queryset with sequential scans discouraged.
+
+    Args:
+        queryset: Django QuerySet to explain
+
+    Returns:
+        dict: Plan text and the tables read by a full scan
+    """
+    vendor = connection.vendor
+
+    with transaction.atomic():
+        if vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+
+    pattern = SEQ_SCAN_PATTERNS.get(vendor)
+    scanned = pattern.findall(plan) if pattern else []
+
+    return {
+        'plan': plan,
+        'uses_index': not scanned,
+        'seq_scans': scanned,
+    }
+
+
+def check_hot_queries():
+    """
+    EXPLAIN every hot query.
+
+    Returns:
+        dict: Result of explain_query() keyed by query name
+    """
+    return {name: explain_query(queryset) for name, queryset in hot_queries().items()}
+
+
+def count_endpoint_queries(user):
+    """
+    Call the hot admin and payment endpoints as `user` and count their queries.
+
+    Args:
+        user: Staff user to authenticate the requests as
+
+    Returns:
+        dict: Number of queries and response status keyed by endpoint name
+    """
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from .views import PaymentListView
+
+    endpoints = {'payment-list': (PaymentListView.as_view(), '/payments/')}
+    try:
+        from auctions import admin_views
+
+        endpoints.update({
+            'admin-auction-list': (admin_views.AdminAuctionListView.as_view(), '/admin/auctions/'),
+            'admin-reports': (admin_views.AdminReportView.as_view(), '/admin/reports/'),
+            'admin-analytics': (admin_views.AdminAnalyticsView.as_view(), '/admin/analytics/'),
+            'admin-disputes': (admin_views.DisputeListView.as_view(), '/admin/disputes/'),
+        })
+    except ImportError:
+        pass
+
+    factory = APIRequestFactory()
+    results = {}
+    for name, (view, path) in endpoints.items():
+        request = factory.get(path)
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request)
+            response.render()
+        results[name] = {'queries': len(queries), 'status': response.status_code}
+    return results
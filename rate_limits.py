@@ -0,0 +1,173 @@
+# auctions/rate_limits.py
+"""
+Token-bucket rate limits for chat messages and bids.
+
+Every action is checked against a bucket per user and a bucket per auction,
+so one client can neither flood a room nor, through many rooms, the server.
+A message is refused before it costs a database write or a room-wide
+broadcast.
+
+Buckets live in process memory by default. Set RATE_LIMIT_REDIS_URL to keep
+them in Redis, shared by every worker (needs the redis package).
+
+Limits are (capacity, refill per second) and can be overridden through the
+RATE_LIMITS setting, e.g. {'chat:user': (5, 0.5)}.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+DEFAULT_RATE_LIMITS = {
+    'chat:user': (5, 0.5),      # Burst of 5, then one message every 2s
+    'chat:auction': (30, 10),   # Whole room
+    'bid:user': (5, 1),
+    'bid:auction': (20, 5),
+}
+
+RATE_LIMITS = {**DEFAULT_RATE_LIMITS, **getattr(settings, 'RATE_LIMITS', {})}
+RATE_LIMIT_REDIS_URL = getattr(settings, 'RATE_LIMIT_REDIS_URL', None)
+RATE_LIMIT_MAX_LOCAL_KEYS = getattr(settings, 'RATE_LIMIT_MAX_LOCAL_KEYS', 100000)
+
+
+class LocalBuckets:
+    """In-process buckets, least recently used keys are evicted past max_keys"""
+
+    def __init__(self, max_keys=RATE_LIMIT_MAX_LOCAL_KEYS):
+        self.buckets = OrderedDict()  # key -> [tokens, updated_at]
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now=None):
+        """
+        Take one token.
+
+        Returns:
+            float: 0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            bucket = self.buckets.pop(key, None)
+            if bucket is None:
+                bucket = [capacity, now]
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+
+            if tokens >= 1:
+                retry_after = 0.0
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+
+            self.buckets[key] = [tokens, now]
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return retry_after
+
+
+# KEYS[1] bucket key; ARGV capacity, rate, now. Returns retry-after in ms.
+TOKEN_BUCKET_LUA = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return retry_after
+"""
+
+
+class RedisBuckets:
+    """Buckets shared by every worker, updated atomically by a Lua script"""
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(TOKEN_BUCKET_LUA)
+
+    def take(self, key, capacity, rate, now=None):
+        now = time.time() if now is None else now
+        return self.script(keys=[f"ratelimit:{key}"], args=[capacity, rate, now]) / 1000
+
+
+_buckets = None
+
+
+def get_buckets():
+    global _buckets
+    if _buckets is None:
+        _buckets = RedisBuckets(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else LocalBuckets()
+    return _buckets
+
+
+def check(action, user_id, auction_id):
+    """
+    Charge one `action` ('chat' or 'bid') to the user and auction buckets.
+
+    The per-auction bucket is only charged when the user bucket allows it,
+    so a throttled user cannot drain the room's budget.
+
+    Returns:
+        dict: None when allowed, otherwise a throttle description with
+            'scope' ('user' or 'auction') and 'retry_after' seconds
+    """
+    buckets = get_buckets()
+    for scope, key in (('user', user_id), ('auction', auction_id)):
+        capacity, rate = RATE_LIMITS[f"{action}:{scope}"]
+        retry_after = buckets.take(f"{action}:{scope}:{key}", capacity, rate)
+        if retry_after:
+            return {'scope': scope, 'retry_after': round(retry_after, 2)}
+    return None
+
+
+async def acheck(action, user_id, auction_id):
+    """check() for consumers, Redis round-trips run off the event loop"""
+    if isinstance(get_buckets(), LocalBuckets):
+        return check(action, user_id, auction_id)
+    return await sync_to_async(check, thread_sensitive=False)(action, user_id, auction_id)
+
+
+def throttle_frame(action, throttle):
+    """WebSocket frame telling the client to back off"""
+    return {
+        "type": "throttled",
+        "action": action,
+        "scope": throttle['scope'],
+        "retry_after": throttle['retry_after'],
+        "message": f"Too many {action} messages, retry in {throttle['retry_after']}s",
+    }
+
+
+class BidRateThrottle(BaseThrottle):
+    """
+    DRF throttle for the place-bid endpoint: per user and per auction.
+    The auction comes from the `auction_id`/`pk` URL kwarg or the request body.
+    """
+
+    def allow_request(self, request, view):
+        if request.method != 'POST' or not request.user.is_authenticated:
+            return True
+
+        auction_id = (
+            view.kwargs.get('auction_id')
+            or view.kwargs.get('pk')
+            or request.data.get('auction_item')
+            or request.data.get('auction_id')
+        )
+        self.throttle = check('bid', request.user.id, auction_id)
+        return self.throttle is None
+
+    def wait(self):
+        return self.throttle['retry_after']
@@ -0,0 +1,91 @@
+# auctions/response_cache.py
+"""
+Rendered-response cache for the auction detail endpoint (/api/auctions/browse/<id>/).
+
+Each auction has a version number in the cache. The version is bumped when
+a bid lands or the auction itself is saved (including AuctionItem.close()),
+see signals.py. Rendered JSON is stored under a key that includes the
+version, so a bump invalidates it without deleting anything, and the
+version doubles as the ETag so unchanged polls get a 304.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+AUCTION_RENDER_TIMEOUT = getattr(settings, 'AUCTION_RENDER_CACHE_TIMEOUT', 300)
+AUCTION_VERSION_TIMEOUT = None  # Versions never expire on their own
+
+
+def _version_key(auction_id):
+    return f"auction:{auction_id}:version"
+
+
+def _render_key(auction_id, version):
+    return f"auction:{auction_id}:v{version}:render"
+
+
+def get_auction_version(auction_id):
+    """
+    Current version of an auction.
+    Starts from the clock so a version lost to eviction never reuses an old ETag.
+    """
+    key = _version_key(auction_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), AUCTION_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_auction_version(auction_id):
+    """Invalidate the rendered detail of an auction once the current transaction commits"""
+    def bump():
+        try:
+            cache.incr(_version_key(auction_id))
+        except ValueError:
+            cache.add(_version_key(auction_id), time.time_ns(), AUCTION_VERSION_TIMEOUT)
+
+    transaction.on_commit(bump)
+
+
+def make_etag(auction_id, version):
+    return f'"auction-{auction_id}-{version}"'
+
+
+class CachedAuctionDetailMixin:
+    """
+    Serve a RetrieveAPIView for AuctionItem from the rendered-response cache.
+
+    The rendered body must not depend on the requesting user.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        auction_id = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        version = get_auction_version(auction_id)
+        etag = make_etag(auction_id, version)
+
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+        key = _render_key(auction_id, version)
+        body = cache.get(key)
+        if body is None:
+            response = super().retrieve(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            body = JSONRenderer().render(response.data)
+            cache.set(key, body, AUCTION_RENDER_TIMEOUT)
+
+        response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        # Clients may keep the body but must revalidate with If-None-Match on every poll
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,223 @@
+# payments/rollups.py
+"""
+Daily per-category rollups for the admin analytics page.
+
+DailyCategoryStats rows are bumped from model signals (see signals.py) so
+AdminAnalyticsView reads a few dozen rows instead of grouping raw Bid and
+AuctionItem rows on every request. backfill() rebuilds a date range from
+the raw tables, updating the rows in place under a lock so it can run
+while signals keep bumping them.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyCategoryStats
+
+FACT_FIELDS = ('bid_count', 'revenue', 'auctions_opened', 'auctions_closed')
+
+
+def to_day(value):
+    """Calendar day of a datetime in the current timezone (same as TruncDay)"""
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def bump(day, category, **deltas):
+    """
+    Add deltas to the facts of one (day, category) row inside the caller's transaction.
+
+    Args:
+        day (date): Calendar day
+        category (str): Auction category
+        **deltas: Amounts to add, keyed by fact field
+    """
+    deltas = {
+        field: value if field == 'revenue' else int(value)
+        for field, value in deltas.items()
+        if value
+    }
+    if day is None or not deltas:
+        return
+
+    category = category or ''
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if not DailyCategoryStats.objects.filter(day=day, category=category).update(**updates):
+        DailyCategoryStats.objects.get_or_create(day=day, category=category)
+        DailyCategoryStats.objects.filter(day=day, category=category).update(**updates)
+
+
+def auction_facts(state):
+    """
+    What one auction in the given state contributes to the rollups.
+
+    Args:
+        state (dict): status, current_price, category, start_time and end_time
+
+    Returns:
+        dict: Fact deltas keyed by (day, category)
+    """
+    facts = defaultdict(lambda: defaultdict(Decimal))
+    if not state:
+        return facts
+
+    category = state.get('category') or ''
+    facts[(to_day(state.get('start_time')), category)]['auctions_opened'] += 1
+    if state.get('status') == 'closed':
+        closed = facts[(to_day(state.get('end_time')), category)]
+        closed['auctions_closed'] += 1
+        closed['revenue'] += Decimal(state.get('current_price') or 0)
+    return facts
+
+
+def apply_auction_change(old_state, new_state):
+    """Move an auction's contribution from its old state to its new one"""
+    old, new = auction_facts(old_state), auction_facts(new_state)
+    for key in set(old) | set(new):
+        deltas = {field: new[key][field] - old[key][field] for field in FACT_FIELDS}
+        bump(*key, **deltas)
+
+
+def raw_facts(start, end):
+    """
+    Facts of [start, end] computed from the raw tables.
+
+    Returns:
+        dict: Fact values keyed by (day, category)
+    """
+    from auctions.models import AuctionItem, Bid
+
+    facts = defaultdict(lambda: defaultdict(Decimal))
+
+    bids = (
+        Bid.objects.annotate(day=TruncDate('created_at'))
+        .filter(day__gte=start, day__lte=end)
+        .values('day', 'auction_item__category')
+        .annotate(count=Count('id'))
+    )
+    for row in bids.iterator():
+        facts[(row['day'], row['auction_item__category'] or '')]['bid_count'] += row['count']
+
+    opened = (
+        AuctionItem.objects.annotate(day=TruncDate('start_time'))
+        .filter(day__gte=start, day__lte=end)
+        .values('day', 'category')
+        .annotate(count=Count('id'))
+    )
+    for row in opened.iterator():
+        facts[(row['day'], row['category'] or '')]['auctions_opened'] += row['count']
+
+    closed = (
+        AuctionItem.objects.filter(status='closed')
+        .annotate(day=TruncDate('end_time'))
+        .filter(day__gte=start, day__lte=end)
+        .values('day', 'category')
+        .annotate(count=Count('id'), revenue=Sum('current_price'))
+    )
+    for row in closed.iterator():
+        key = (row['day'], row['category'] or '')
+        facts[key]['auctions_closed'] += row['count']
+        facts[key]['revenue'] += row['revenue'] or 0
+    return facts
+
+
+def backfill(start, end):
+    """
+    Rebuild the rollups for [start, end] from the raw tables.
+
+    Rows are updated in place, never deleted. The range's rows are locked
+    before the raw tables are read, so a bump() from a bid or auction
+    committed during the rebuild waits and then adds its delta on top of
+    the rebuilt value, and a bump() committed before it is part of the
+    raw read. Rows that first appear during the rebuild (a concurrent
+    bump() created them) are set to the rebuilt values.
+
+    Args:
+        start (date): First day to rebuild
+        end (date): Last day to rebuild
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    with transaction.atomic():
+        existing = {
+            (row.day, row.category): row
+            for row in DailyCategoryStats.objects.select_for_update().filter(day__gte=start, day__lte=end)
+        }
+        facts = raw_facts(start, end)
+
+        # Rows with no facts left are zeroed rather than deleted
+        for key, row in existing.items():
+            for field in FACT_FIELDS:
+                setattr(row, field, facts[key][field] if key in facts else 0)
+        DailyCategoryStats.objects.bulk_update(list(existing.values()), FACT_FIELDS, batch_size=500)
+
+        new_keys = {key for key in facts if key not in existing}
+        DailyCategoryStats.objects.bulk_create(
+            [
+                DailyCategoryStats(day=day, category=category, **{field: facts[(day, category)][field] for field in FACT_FIELDS})
+                for day, category in new_keys
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        if new_keys:
+            # ignore_conflicts skipped rows a concurrent bump() created first, set those too
+            stale = []
+            for row in DailyCategoryStats.objects.select_for_update().filter(day__gte=start, day__lte=end):
+                key = (row.day, row.category)
+                if key in new_keys and any(getattr(row, field) != facts[key][field] for field in FACT_FIELDS):
+                    for field in FACT_FIELDS:
+                        setattr(row, field, facts[key][field])
+                    stale.append(row)
+            DailyCategoryStats.objects.bulk_update(stale, FACT_FIELDS, batch_size=500)
+
+    return len(existing) + len(new_keys)
+
+
+def daily_totals(start, end, field):
+    """
+    Sum one fact per day across categories.
+
+    Returns:
+        list: (day, total) pairs ordered by day, skipping empty days
+    """
+    return list(
+        DailyCategoryStats.objects.filter(day__gte=start, day__lte=end)
+        .values('day')
+        .annotate(total=Sum(field))
+        .filter(total__gt=0)
+        .order_by('day')
+        .values_list('day', 'total')
+    )
+
+
+def category_totals(field, start, end):
+    """
+    Sum one fact per category within a date range.
+
+    Returns:
+        list: (category, total) pairs ordered by total descending
+    """
+    return list(
+        DailyCategoryStats.objects.filter(day__gte=start, day__lte=end)
+        .values('category')
+        .annotate(total=Sum(field))
+        .filter(total__gt=0)
+        .order_by('-total')
+        .values_list('category', 'total')
+    )
+
+
+def default_range(days):
+    """(start, end) covering the last `days` days including today"""
+    end = timezone.localdate()
+    return end - timedelta(days=days), end
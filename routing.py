@@ -8,5 +8,6 @@ websocket_urlpatterns = [
     re_path(r"ws/buyer-dashboard/$", consumers.BuyerDashboardConsumer.as_asgi()),
     re_path(r"ws/disputes/$", DisputeConsumer.as_asgi()),
     re_path(r"ws/auctions/(?P<auction_id>\d+)/chat/$", AuctionChatConsumer.as_asgi()),
+    re_path(r"ws/stream/$", consumers.MultiplexConsumer.as_asgi()),
 
 ]
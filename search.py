@@ -0,0 +1,178 @@
+# payments/search.py
+"""
+Auction search backed by an inverted index (AuctionSearchTerm).
+
+Each auction's text fields are tokenized into weighted terms when the
+auction is saved, and again when its seller's name or email changes
+(see signals.py). Queries match every query token as a
+prefix against the indexed terms, so a search is a handful of index range
+scans instead of ILIKE '%term%' across joined tables, and results are
+ranked by the summed weight of the matched terms.
+"""
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, OuterRef, Q, Subquery, Sum, When
+from rest_framework import filters
+
+from .models import AuctionSearchTerm
+
+# Weight of a term by the field it appears in
+FIELD_WEIGHTS = {
+    'item_name': 8,
+    'category': 4,
+    'seller__email': 2,
+    'seller__first_name': 2,
+    'seller__last_name': 2,
+    'description': 1,
+}
+
+INDEXED_FIELDS = ('item_name', 'description', 'category')
+
+# Seller fields in the index, a change reindexes the seller's auctions
+SELLER_FIELDS = tuple(field.split('__', 1)[1] for field in FIELD_WEIGHTS if field.startswith('seller__'))
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = getattr(settings, 'SEARCH_MAX_QUERY_TERMS', 6)
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with',
+})
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Split text into lowercase index terms"""
+    if not text:
+        return []
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall(str(text).lower())
+        if len(token) >= MIN_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def build_terms(auction):
+    """
+    Weighted terms for one auction.
+
+    Returns:
+        dict: Summed weight keyed by term
+    """
+    seller = auction.seller
+    values = {
+        'item_name': auction.item_name,
+        'category': auction.category,
+        'description': auction.description,
+        'seller__email': getattr(seller, 'email', None),
+        'seller__first_name': getattr(seller, 'first_name', None),
+        'seller__last_name': getattr(seller, 'last_name', None),
+    }
+
+    terms = {}
+    for field, text in values.items():
+        for token in set(tokenize(text)):
+            terms[token] = terms.get(token, 0) + FIELD_WEIGHTS[field]
+    return terms
+
+
+def index_auction(auction):
+    """Replace the indexed terms of one auction"""
+    terms = build_terms(auction)
+    with transaction.atomic():
+        AuctionSearchTerm.objects.filter(auction_id=auction.pk).delete()
+        AuctionSearchTerm.objects.bulk_create([
+            AuctionSearchTerm(term=term, auction_id=auction.pk, weight=min(weight, 32767))
+            for term, weight in terms.items()
+        ])
+
+
+def rebuild_index(queryset=None, batch_size=500):
+    """
+    Reindex every auction in `queryset` (all auctions by default).
+
+    Returns:
+        int: Number of auctions indexed
+    """
+    if queryset is None:
+        from auctions.models import AuctionItem
+        queryset = AuctionItem.objects.all()
+
+    count = 0
+    for auction in queryset.select_related('seller').iterator(chunk_size=batch_size):
+        index_auction(auction)
+        count += 1
+    return count
+
+
+def matching_terms(query):
+    """
+    Ranked auction matches for a search query.
+
+    Every query token must prefix-match at least one term of the auction.
+
+    Returns:
+        QuerySet: values rows of (auction, rank), or None for an empty query
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not tokens:
+        return None
+
+    any_token = Q()
+    for token in tokens:
+        any_token |= Q(term__startswith=token)
+
+    matched = AuctionSearchTerm.objects.filter(any_token).values('auction')
+    per_token = {
+        f'matched_{i}': Max(Case(When(term__startswith=token, then=1), default=0, output_field=IntegerField()))
+        for i, token in enumerate(tokens)
+    }
+    every_token = {f'matched_{i}': 1 for i in range(len(tokens))}
+
+    return (
+        matched.annotate(rank=Sum('weight'), **per_token)
+        .filter(**every_token)
+        .values('auction', 'rank')
+    )
+
+
+def search_auctions(queryset, query):
+    """
+    Narrow an AuctionItem queryset to auctions matching `query`, annotated with search_rank.
+
+    A query with no searchable terms (only stopwords or single characters)
+    matches nothing rather than every auction.
+    """
+    matches = matching_terms(query)
+    if matches is None:
+        return queryset.none()
+
+    return queryset.filter(
+        pk__in=matches.values('auction')
+    ).annotate(
+        search_rank=Subquery(
+            matches.filter(auction=OuterRef('pk')).values('rank')[:1],
+            output_field=IntegerField(),
+        )
+    )
+
+
+class AuctionSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on AuctionItem list views.
+    Uses the inverted index and orders by rank unless ?ordering= is given.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+
+        queryset = search_auctions(queryset, query)
+        if not request.query_params.get(filters.OrderingFilter.ordering_param):
+            queryset = queryset.order_by('-search_rank', '-pk')
+        return queryset
@@ -1,6 +1,6 @@
 # payments/serializers.py
 from rest_framework import serializers
-from .models import PaymentMethod, Payment
+from .models import PaymentMethod, Payment, RefundJob, WatchlistEntry
 
 
 class PaymentMethodSerializer(serializers.ModelSerializer):
@@ -123,4 +123,51 @@ class PaymentDetailSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
             'paid_at',
-        ]
\ No newline at end of file
+        ]
+
+class RefundJobSerializer(serializers.ModelSerializer):
+    """
+    Progress view of a bulk refund job (admin only).
+    """
+    created_by_email = serializers.CharField(source='created_by.email', read_only=True, default=None)
+
+    class Meta:
+        model = RefundJob
+        fields = [
+            'id',
+            'status',
+            'reason',
+            'created_by_email',
+            'total',
+            'processed',
+            'succeeded',
+            'failed',
+            'errors',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+
+class WatchlistEntrySerializer(serializers.ModelSerializer):
+    """
+    A watched auction with the fields the Watchlist page shows.
+    """
+    item_name = serializers.CharField(source='auction.item_name', read_only=True)
+    current_price = serializers.DecimalField(source='auction.current_price', max_digits=10, decimal_places=2, read_only=True)
+    status = serializers.CharField(source='auction.status', read_only=True)
+    end_time = serializers.DateTimeField(source='auction.end_time', read_only=True)
+
+    class Meta:
+        model = WatchlistEntry
+        fields = [
+            'id',
+            'auction',
+            'item_name',
+            'current_price',
+            'status',
+            'end_time',
+            'created_at',
+        ]
+        read_only_fields = ['id', 'created_at']
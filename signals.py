@@ -1,9 +1,18 @@
 # payments/signals.py
 """
-Django signals for order notifications.
-Triggers async task when a new order is created.
+Django signals for order notifications and marketplace statistics.
+Triggers async task when a new order is created and keeps the admin
+report counters (stats.py), daily rollups (rollups.py), the auction
+search index (search.py), the auction detail cache (auctions/response_cache.py),
+the browse listing cache (auctions/listing_cache.py), watchlist notifications
+(watchlist.py), the bid event log (bid_log.py), auction price series
+(price_series.py) and the shill-bidding detector (auctions/fraud.py) in
+step with user, auction and bid changes.
 """
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_init, post_save, post_delete, pre_save
 from django.dispatch import receiver
 import logging
 
@@ -31,4 +40,376 @@ def trigger_order_notifications(sender, instance, created, **kwargs):
         except Exception as e:
             logger.error(f"Failed to trigger order notifications: {e}")
             # Don't fail the order creation if notification fails
-            pass
\ No newline at end of file
+            pass
+
+
+# =====================================================
+# MARKETPLACE COUNTERS
+# =====================================================
+
+def _apply_counter_deltas(deltas):
+    """Apply counter deltas in a savepoint so a counter failure never breaks the save"""
+    try:
+        from . import stats
+
+        with transaction.atomic():
+            for name, delta in deltas.items():
+                stats.increment(name, delta)
+    except Exception as e:
+        logger.error(f"Failed to update stat counters: {e}")
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def count_user_created(sender, instance, created, **kwargs):
+    if created:
+        _apply_counter_deltas({'total_users': 1})
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def count_user_deleted(sender, instance, **kwargs):
+    _apply_counter_deltas({'total_users': -1})
+
+
+AUCTION_TRACKED_FIELDS = (
+    'status', 'current_price', 'category', 'start_time', 'end_time',
+    'item_name', 'description', 'seller_id',
+)
+
+
+def _auction_state(instance):
+    return {field: getattr(instance, field, None) for field in AUCTION_TRACKED_FIELDS}
+
+
+def _loaded_state(instance):
+    """Tracked fields held by the instance, None if any is deferred"""
+    values = instance.__dict__
+    if any(field not in values for field in AUCTION_TRACKED_FIELDS):
+        return None
+    return {field: values[field] for field in AUCTION_TRACKED_FIELDS}
+
+
+@receiver(post_init, sender='auctions.AuctionItem')
+def snapshot_auction_state(sender, instance, **kwargs):
+    """Remember the tracked fields as loaded, so pre_save needs no extra SELECT"""
+    instance._stats_loaded = _loaded_state(instance) if instance.pk else None
+
+
+@receiver(pre_save, sender='auctions.AuctionItem')
+def remember_auction_state(sender, instance, update_fields=None, **kwargs):
+    """
+    Stash the stored auction state so post_save can work out how the
+    counters, daily rollups and search index changed.
+
+    Instances loaded from the database carry their loaded state; the row
+    is only read back for instances built by hand or with deferred fields.
+    """
+    instance._stats_previous = None
+    if instance.pk:
+        loaded = getattr(instance, '_stats_loaded', None)
+        if loaded is not None and not instance._state.adding:
+            instance._stats_previous = loaded
+        else:
+            instance._stats_previous = (
+                sender.objects.filter(pk=instance.pk)
+                .values(*AUCTION_TRACKED_FIELDS)
+                .first()
+            )
+
+    # What the row will hold after this save, for the next save of this instance
+    saved = _loaded_state(instance)
+    if saved is not None and update_fields is not None and instance._stats_previous:
+        saved = {
+            field: saved[field] if field in update_fields or field.removesuffix('_id') in update_fields
+            else instance._stats_previous[field]
+            for field in AUCTION_TRACKED_FIELDS
+        }
+    instance._stats_loaded = saved
+
+
+@receiver(post_save, sender='auctions.AuctionItem')
+def count_auction_saved(sender, instance, created, **kwargs):
+    from .stats import auction_contribution
+
+    new = auction_contribution(instance.status, instance.current_price)
+    previous = getattr(instance, '_stats_previous', None)
+    if previous:
+        old = auction_contribution(previous['status'], previous['current_price'])
+    else:
+        old = auction_contribution(None, None)
+
+    deltas = {name: new[name] - old[name] for name in new}
+    if created:
+        deltas['total_auctions'] = 1
+    _apply_counter_deltas(deltas)
+
+
+@receiver(post_delete, sender='auctions.AuctionItem')
+def count_auction_deleted(sender, instance, **kwargs):
+    from .stats import auction_contribution
+
+    deltas = {
+        name: -value
+        for name, value in auction_contribution(instance.status, instance.current_price).items()
+    }
+    deltas['total_auctions'] = -1
+    _apply_counter_deltas(deltas)
+
+
+@receiver(post_save, sender='auctions.Bid')
+def count_bid_placed(sender, instance, created, **kwargs):
+    if created:
+        _apply_counter_deltas({'total_bids': 1})
+
+
+@receiver(post_delete, sender='auctions.Bid')
+def count_bid_deleted(sender, instance, **kwargs):
+    _apply_counter_deltas({'total_bids': -1})
+
+
+# =====================================================
+# DAILY ROLLUPS
+# =====================================================
+
+def _apply_rollup(update):
+    """Run a rollup update in a savepoint so a rollup failure never breaks the save"""
+    try:
+        with transaction.atomic():
+            update()
+    except Exception as e:
+        logger.error(f"Failed to update daily rollups: {e}")
+
+
+@receiver(post_save, sender='auctions.AuctionItem')
+def rollup_auction_saved(sender, instance, created, **kwargs):
+    from .rollups import apply_auction_change
+
+    previous = getattr(instance, '_stats_previous', None)
+    _apply_rollup(lambda: apply_auction_change(previous, _auction_state(instance)))
+
+
+@receiver(post_delete, sender='auctions.AuctionItem')
+def rollup_auction_deleted(sender, instance, **kwargs):
+    from .rollups import apply_auction_change
+
+    _apply_rollup(lambda: apply_auction_change(_auction_state(instance), None))
+
+
+def _bid_rollup(instance, delta):
+    from auctions.models import AuctionItem
+    from .rollups import bump, to_day
+
+    category = (
+        AuctionItem.objects.filter(pk=instance.auction_item_id)
+        .values_list('category', flat=True)
+        .first()
+    )
+    bump(to_day(instance.created_at), category, bid_count=delta)
+
+
+@receiver(post_save, sender='auctions.Bid')
+def rollup_bid_placed(sender, instance, created, **kwargs):
+    if created:
+        _apply_rollup(lambda: _bid_rollup(instance, 1))
+
+
+@receiver(post_delete, sender='auctions.Bid')
+def rollup_bid_deleted(sender, instance, **kwargs):
+    _apply_rollup(lambda: _bid_rollup(instance, -1))
+
+
+# =====================================================
+# SEARCH INDEX
+# =====================================================
+
+@receiver(post_save, sender='auctions.AuctionItem')
+def reindex_auction(sender, instance, created, **kwargs):
+    """Reindex only when a searchable field changed, not on every bid's price update"""
+    from .search import INDEXED_FIELDS, index_auction
+
+    previous = getattr(instance, '_stats_previous', None)
+    if not created and previous and all(
+        previous[field] == getattr(instance, field) for field in INDEXED_FIELDS + ('seller_id',)
+    ):
+        return
+
+    try:
+        with transaction.atomic():
+            index_auction(instance)
+    except Exception as e:
+        logger.error(f"Failed to index auction {instance.pk}: {e}")
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def snapshot_seller_search_fields(sender, instance, **kwargs):
+    """Remember the indexed seller fields as loaded, so post_save can tell whether they changed"""
+    from .search import SELLER_FIELDS
+
+    values = instance.__dict__
+    instance._search_loaded = {field: values[field] for field in SELLER_FIELDS if field in values}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_seller_auctions(sender, instance, created, **kwargs):
+    """Auctions index their seller's email and names, reindex them when those change"""
+    from .search import SELLER_FIELDS, rebuild_index
+
+    loaded = getattr(instance, '_search_loaded', {})
+    current = {field: instance.__dict__[field] for field in SELLER_FIELDS if field in instance.__dict__}
+    instance._search_loaded = {**loaded, **current}
+    if created or all(loaded.get(field) == value for field, value in current.items()):
+        return
+
+    def reindex():
+        from auctions.models import AuctionItem
+
+        try:
+            rebuild_index(AuctionItem.objects.filter(seller_id=instance.pk))
+        except Exception as e:
+            logger.error(f"Failed to reindex auctions of seller {instance.pk}: {e}")
+
+    transaction.on_commit(reindex)
+
+
+# =====================================================
+# AUCTION DETAIL CACHE
+# =====================================================
+
+@receiver(post_save, sender='auctions.AuctionItem')
+@receiver(post_delete, sender='auctions.AuctionItem')
+def invalidate_auction_detail(sender, instance, **kwargs):
+    """Status changes (including AuctionItem.close()) and edits change the detail page"""
+    from auctions.response_cache import bump_auction_version
+
+    bump_auction_version(instance.pk)
+
+
+@receiver(post_save, sender='auctions.Bid')
+@receiver(post_delete, sender='auctions.Bid')
+def invalidate_auction_detail_on_bid(sender, instance, **kwargs):
+    from auctions.response_cache import bump_auction_version
+
+    bump_auction_version(instance.auction_item_id)
+
+
+# =====================================================
+# BROWSE LISTING CACHE
+# =====================================================
+
+LISTING_FIELDS = ('status', 'category', 'item_name', 'start_time', 'end_time')
+
+
+@receiver(post_save, sender='auctions.AuctionItem')
+def purge_auction_listings(sender, instance, created, **kwargs):
+    """Purge listings on visible changes only, price updates from bids expire with the TTL"""
+    from auctions.listing_cache import purge_auction
+
+    previous = getattr(instance, '_stats_previous', None)
+    if not created and previous and all(
+        previous[field] == getattr(instance, field) for field in LISTING_FIELDS
+    ):
+        return
+
+    purge_auction(instance.category, previous['category'] if previous else None)
+
+
+@receiver(post_delete, sender='auctions.AuctionItem')
+def purge_deleted_auction_listings(sender, instance, **kwargs):
+    from auctions.listing_cache import purge_auction
+
+    purge_auction(instance.category)
+
+
+# =====================================================
+# WATCHLIST FAN-OUT
+# =====================================================
+
+@receiver(post_save, sender='auctions.Bid')
+def fan_out_bid_to_watchers(sender, instance, created, **kwargs):
+    """Coalesced per auction, see watchlist.schedule_bid_fan_out"""
+    if not created:
+        return
+
+    from .watchlist import schedule_bid_fan_out
+
+    schedule_bid_fan_out(instance.auction_item_id)
+
+
+@receiver(post_save, sender='auctions.AuctionItem')
+def fan_out_close_to_watchers(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if created or not previous or previous['status'] == 'closed' or instance.status != 'closed':
+        return
+
+    from .tasks import notify_watchers_of_close
+
+    auction_id, item_name, winner_id = instance.pk, instance.item_name, getattr(instance, 'winner_id', None)
+    transaction.on_commit(lambda: notify_watchers_of_close.delay(auction_id, item_name, winner_id))
+
+
+# =====================================================
+# BID EVENT LOG AND PRICE SERIES
+# =====================================================
+
+@receiver(post_save, sender='auctions.Bid')
+def log_bid_placed(sender, instance, created, **kwargs):
+    from . import bid_log
+
+    if created and bid_log.BID_LOG_ENABLED:
+        transaction.on_commit(lambda: bid_log.log_bid(instance))
+
+
+@receiver(post_save, sender='auctions.Bid')
+def record_bid_price(sender, instance, created, **kwargs):
+    from . import price_series
+
+    if created and price_series.PRICE_SERIES_ENABLED:
+        transaction.on_commit(lambda: price_series.record_bid(instance))
+
+
+@receiver(post_delete, sender='auctions.Bid')
+def log_bid_retracted(sender, instance, **kwargs):
+    from django.utils import timezone
+    from . import bid_log
+
+    if bid_log.BID_LOG_ENABLED:
+        retracted_at = timezone.now()
+        transaction.on_commit(lambda: bid_log.log_retraction(instance, retracted_at))
+
+
+@receiver(post_save, sender='auctions.AuctionItem')
+def log_auction_closed(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if created or not previous or previous['status'] == 'closed' or instance.status != 'closed':
+        return
+
+    from django.utils import timezone
+    from . import bid_log
+
+    if bid_log.BID_LOG_ENABLED:
+        closed_at = timezone.now()
+        transaction.on_commit(lambda: bid_log.log_close(instance, closed_at))
+
+
+# =====================================================
+# SHILL-BIDDING DETECTION
+# =====================================================
+
+@receiver(post_save, sender='auctions.Bid')
+def score_bid(sender, instance, created, **kwargs):
+    from auctions import fraud
+
+    if created and fraud.FRAUD_DETECTION_ENABLED:
+        transaction.on_commit(lambda: fraud.observe_bid(instance))
+
+
+@receiver(post_delete, sender='auctions.Bid')
+def score_bid_retraction(sender, instance, origin=None, **kwargs):
+    from auctions import fraud
+
+    # Only bids deleted for themselves are retractions, not cascades from
+    # deleting their auction or bidder
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origin_model is not sender:
+        return
+    if fraud.FRAUD_DETECTION_ENABLED:
+        transaction.on_commit(lambda: fraud.observe_retraction(instance))
@@ -0,0 +1,168 @@
+# auctions/sse.py
+"""
+Server-Sent Events stream of auction price/status updates for read-only
+viewers.
+
+Each process keeps one channel-layer subscription per auction (an
+anonymous channel in the auction_{id} group that AuctionConsumer uses),
+and fans every event out to the in-process queues of the HTTP streams
+watching that auction. Ten thousand viewers on one process cost one group
+membership and ten thousand small queues, not ten thousand consumers.
+
+Requires ASGI, StreamingHttpResponse iterates the async generator on the
+event loop.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEARTBEAT_SECONDS = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+SSE_QUEUE_SIZE = getattr(settings, 'SSE_QUEUE_SIZE', 50)
+SSE_RETRY_MS = getattr(settings, 'SSE_RETRY_MS', 3000)
+
+# Channel-layer events relayed to viewers, the rest of the group traffic is dropped
+SSE_EVENT_TYPES = frozenset({
+    'send_bid_update',
+    'auction_update',
+    'auction_extended',
+    'auction_closed',
+})
+
+
+class AuctionFeed:
+    """One upstream group subscription shared by every local viewer of an auction"""
+
+    def __init__(self, auction_id):
+        self.auction_id = auction_id
+        self.group_name = f"auction_{auction_id}"
+        self.listeners = set()
+        self.task = None
+
+    async def start(self):
+        channel_layer = get_channel_layer()
+        self.channel_name = await channel_layer.new_channel()
+        await channel_layer.group_add(self.group_name, self.channel_name)
+        self.task = asyncio.ensure_future(self.pump(channel_layer))
+
+    async def stop(self):
+        self.task.cancel()
+        await get_channel_layer().group_discard(self.group_name, self.channel_name)
+
+    async def pump(self, channel_layer):
+        while True:
+            try:
+                message = await channel_layer.receive(self.channel_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"SSE feed for auction {self.auction_id} failed to receive: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if message.get('type') in SSE_EVENT_TYPES:
+                self.publish(message)
+
+    def publish(self, message):
+        for queue in self.listeners:
+            if queue.full():
+                queue.get_nowait()  # A slow viewer loses its oldest update, never stalls the feed
+            queue.put_nowait(message)
+
+
+class FeedHub:
+    """Per-process registry of AuctionFeeds, a feed lives while it has viewers"""
+
+    def __init__(self):
+        self.feeds = {}
+        self.lock = asyncio.Lock()
+
+    async def subscribe(self, auction_id):
+        queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        async with self.lock:
+            feed = self.feeds.get(auction_id)
+            if feed is None:
+                feed = AuctionFeed(auction_id)
+                await feed.start()
+                self.feeds[auction_id] = feed
+            feed.listeners.add(queue)
+        return queue
+
+    async def unsubscribe(self, auction_id, queue):
+        async with self.lock:
+            feed = self.feeds.get(auction_id)
+            if feed is None:
+                return
+            feed.listeners.discard(queue)
+            if not feed.listeners:
+                del self.feeds[auction_id]
+                await feed.stop()
+
+
+hub = FeedHub()
+
+
+def format_event(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def auction_events(auction_id, snapshot):
+    queue = await hub.subscribe(auction_id)
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        yield format_event('snapshot', snapshot)
+        if snapshot['status'] == 'closed':
+            return
+
+        event_id = 0
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"  # Comment line, keeps proxies from closing an idle stream
+                continue
+
+            event_id += 1
+            data = message.get('content', {k: v for k, v in message.items() if k != 'type'})
+            yield format_event(message['type'], data, event_id)
+            if message['type'] == 'auction_closed':
+                return
+    finally:
+        await hub.unsubscribe(auction_id, queue)
+
+
+async def auction_event_stream(request, auction_id):
+    """
+    GET /api/auctions/<auction_id>/events/
+    text/event-stream of bid, price and status updates, no login needed.
+
+    Starts with a "snapshot" event of the current price and status, then
+    relays send_bid_update, auction_update, auction_extended and
+    auction_closed. The stream ends after auction_closed.
+    """
+    from .models import AuctionItem
+
+    snapshot = await sync_to_async(
+        lambda: AuctionItem.objects.filter(pk=auction_id)
+        .values('id', 'status', 'current_price', 'end_time')
+        .first()
+    )()
+    if snapshot is None:
+        raise Http404("Auction not found")
+
+    response = StreamingHttpResponse(auction_events(auction_id, snapshot), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
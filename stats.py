@@ -0,0 +1,172 @@
+# payments/stats.py
+"""
+Marketplace totals for the admin reports page.
+
+Totals live in StatCounter rows that are bumped from model signals
+(see signals.py) instead of being re-aggregated on every dashboard load.
+reconcile_counters() recomputes them from the raw tables to fix drift
+from bulk updates that bypass signals.
+
+Each counter is also cached under its own key as an integer (revenue in
+cents). Increments are applied to the cached value with cache.incr()
+after commit, so the cache stays warm instead of being dropped on every
+bid.
+"""
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import StatCounter
+
+TOTAL_USERS = 'total_users'
+TOTAL_AUCTIONS = 'total_auctions'
+ACTIVE_AUCTIONS = 'active_auctions'
+TOTAL_BIDS = 'total_bids'
+TOTAL_REVENUE = 'total_revenue'
+
+COUNTER_NAMES = (TOTAL_USERS, TOTAL_AUCTIONS, ACTIVE_AUCTIONS, TOTAL_BIDS, TOTAL_REVENUE)
+
+STATS_COUNTER_SHARDS = getattr(settings, 'STATS_COUNTER_SHARDS', 8)
+STATS_CACHE_PREFIX = 'stats:counter:'
+STATS_CACHE_TIMEOUT = getattr(settings, 'STATS_CACHE_TIMEOUT', 300)
+
+# Counters with cents precision, cached as integer cents
+DECIMAL_COUNTERS = (TOTAL_REVENUE,)
+
+
+def _cache_key(name):
+    return f"{STATS_CACHE_PREFIX}{name}"
+
+
+def _to_cached(name, value):
+    if name in DECIMAL_COUNTERS:
+        return int((Decimal(value) * 100).to_integral_value())
+    return int(value)
+
+
+def _from_cached(name, value):
+    if name in DECIMAL_COUNTERS:
+        return Decimal(value) / 100
+    return value
+
+
+def _bump_cached(name, delta):
+    """Apply a committed increment to the cached counter, if it is cached"""
+    try:
+        cache.incr(_cache_key(name), _to_cached(name, delta))
+    except ValueError:
+        pass  # Not cached, the next read loads it from the shards
+
+
+def _cache_counters(totals):
+    cache.set_many(
+        {_cache_key(name): _to_cached(name, totals[name]) for name in COUNTER_NAMES},
+        STATS_CACHE_TIMEOUT,
+    )
+
+
+def increment(name, delta=1):
+    """
+    Add `delta` to a counter inside the caller's transaction.
+
+    Args:
+        name (str): Counter name
+        delta (int | Decimal): Amount to add (may be negative)
+    """
+    if not delta:
+        return
+
+    shard = random.randrange(STATS_COUNTER_SHARDS)
+    updated = StatCounter.objects.filter(name=name, shard=shard).update(
+        value=F('value') + delta,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        StatCounter.objects.get_or_create(name=name, shard=shard)
+        StatCounter.objects.filter(name=name, shard=shard).update(
+            value=F('value') + delta,
+            updated_at=timezone.now(),
+        )
+
+    transaction.on_commit(lambda: _bump_cached(name, delta))
+
+
+def auction_contribution(status, current_price):
+    """What one auction in the given state adds to the status-dependent counters"""
+    return {
+        ACTIVE_AUCTIONS: 1 if status == 'active' else 0,
+        TOTAL_REVENUE: Decimal(current_price or 0) if status == 'closed' else Decimal(0),
+    }
+
+
+def get_counters():
+    """
+    Return every counter, served from cache when possible.
+
+    Returns:
+        dict: Counter value keyed by counter name
+    """
+    cached = cache.get_many([_cache_key(name) for name in COUNTER_NAMES])
+    if len(cached) == len(COUNTER_NAMES):
+        return {name: _from_cached(name, cached[_cache_key(name)]) for name in COUNTER_NAMES}
+
+    totals = dict(
+        StatCounter.objects.values('name')
+        .annotate(total=Sum('value'))
+        .values_list('name', 'total')
+    )
+
+    # First load after deploy: build the counters from the raw tables
+    if any(name not in totals for name in COUNTER_NAMES):
+        totals = reconcile_counters()
+
+    counters = {name: totals[name] for name in COUNTER_NAMES}
+    _cache_counters(counters)
+    return counters
+
+
+def _compute_totals():
+    from auctions.models import AuctionItem, Bid
+
+    User = get_user_model()
+    return {
+        TOTAL_USERS: User.objects.count(),
+        TOTAL_AUCTIONS: AuctionItem.objects.count(),
+        ACTIVE_AUCTIONS: AuctionItem.objects.filter(status='active').count(),
+        TOTAL_BIDS: Bid.objects.count(),
+        TOTAL_REVENUE: AuctionItem.objects.filter(status='closed').aggregate(
+            Sum('current_price')
+        )['current_price__sum'] or 0,
+    }
+
+
+def reconcile_counters():
+    """
+    Recompute every counter from the raw tables and overwrite the shards.
+
+    The shard rows are locked before aggregating, so increments from
+    transactions still in flight land after the overwrite instead of
+    being lost.
+
+    Returns:
+        dict: Exact counter values keyed by counter name
+    """
+    with transaction.atomic():
+        for name in COUNTER_NAMES:
+            for shard in range(STATS_COUNTER_SHARDS):
+                StatCounter.objects.get_or_create(name=name, shard=shard)
+        list(StatCounter.objects.select_for_update().filter(name__in=COUNTER_NAMES))
+
+        totals = _compute_totals()
+        for name, value in totals.items():
+            StatCounter.objects.filter(name=name).update(value=0, updated_at=timezone.now())
+            StatCounter.objects.filter(name=name, shard=0).update(value=value)
+
+    _cache_counters(totals)
+    return totals
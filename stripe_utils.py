@@ -213,13 +213,14 @@ class StripePaymentHandler:
             return {'success': False, 'error': str(e)}
 
     @staticmethod
-    def refund_payment(charge_id, amount=None):
+    def refund_payment(charge_id, amount=None, idempotency_key=None):
         """
         Refund a charge (full or partial).
         
         Args:
             charge_id (str): Stripe Charge ID
             amount (Decimal): Amount to refund (optional for partial refund)
+            idempotency_key (str): Key that makes retries safe (optional)
         
         Returns:
             dict: Refund details or error
@@ -228,6 +229,8 @@ class StripePaymentHandler:
             refund_params = {'charge': charge_id}
             if amount:
                 refund_params['amount'] = int(amount * 100)  # Convert to cents
+            if idempotency_key:
+                refund_params['idempotency_key'] = idempotency_key
             
             refund = stripe.Refund.create(**refund_params)
             logger.info(f"✅ Refund created: {refund.id}")
@@ -236,6 +239,9 @@ class StripePaymentHandler:
                 'refund_id': refund.id,
                 'status': refund.status,
             }
+        except stripe.error.RateLimitError as e:
+            logger.warning(f"⚠️ Refund rate limited: {e}")
+            return {'success': False, 'error': 'Rate limit exceeded. Try again later.', 'rate_limited': True}
         except stripe.error.InvalidRequestError as e:
             logger.error(f"❌ Refund error: {e}")
             return {'success': False, 'error': str(e)}
@@ -0,0 +1,82 @@
+# auctions/subscriptions.py
+"""
+Per-connection channel-layer group subscriptions.
+
+A consumer owns one SubscriptionManager. It remembers which groups the
+connection joined, applies subscribe/unsubscribe requests in concurrent
+batches, caps how many groups one connection may hold, and discards every
+group when the connection goes away, so memberships never outlive the
+socket.
+"""
+import asyncio
+
+from django.conf import settings
+
+WS_MAX_SUBSCRIPTIONS = getattr(settings, 'WS_MAX_SUBSCRIPTIONS', 50)
+
+
+class SubscriptionLimitExceeded(Exception):
+    """Raised when a subscribe request would take a connection over its limit"""
+
+
+class SubscriptionManager:
+    """
+    Track and apply the group memberships of one connection.
+
+    Args:
+        channel_layer: The consumer's channel layer
+        channel_name (str): The consumer's channel name
+        limit (int): Maximum number of groups this connection may join
+    """
+
+    def __init__(self, channel_layer, channel_name, limit=None):
+        self.channel_layer = channel_layer
+        self.channel_name = channel_name
+        self.limit = WS_MAX_SUBSCRIPTIONS if limit is None else limit
+        self.groups = set()
+
+    def __contains__(self, group):
+        return group in self.groups
+
+    def __len__(self):
+        return len(self.groups)
+
+    async def subscribe(self, *groups):
+        """
+        Join every group not already joined.
+
+        Returns:
+            list: Groups newly joined
+
+        Raises:
+            SubscriptionLimitExceeded: Nothing is joined if the batch does not fit
+        """
+        new = [group for group in dict.fromkeys(groups) if group not in self.groups]
+        if len(self.groups) + len(new) > self.limit:
+            raise SubscriptionLimitExceeded(
+                f"At most {self.limit} subscriptions per connection"
+            )
+
+        self.groups.update(new)
+        await asyncio.gather(
+            *(self.channel_layer.group_add(group, self.channel_name) for group in new)
+        )
+        return new
+
+    async def unsubscribe(self, *groups):
+        """
+        Leave every joined group in `groups`.
+
+        Returns:
+            list: Groups left
+        """
+        left = [group for group in dict.fromkeys(groups) if group in self.groups]
+        self.groups.difference_update(left)
+        await asyncio.gather(
+            *(self.channel_layer.group_discard(group, self.channel_name) for group in left)
+        )
+        return left
+
+    async def unsubscribe_all(self):
+        """Leave every group, call from the consumer's disconnect()"""
+        return await self.unsubscribe(*self.groups)
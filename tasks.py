@@ -298,4 +298,154 @@ The Auction Team
     
     except Exception as e:
         logger.error(f"❌ Error in send_payment_receipt: {str(e)}")
-        return {'success': False, 'error': str(e)}
\ No newline at end of file
+        return {'success': False, 'error': str(e)}
+
+@shared_task
+def process_bulk_refund(job_id):
+    """
+    Run a bulk refund job started from the admin or the bulk refund API.
+    
+    Args:
+        job_id (int): RefundJob ID to process
+    
+    Returns:
+        dict: Final job counters
+    """
+    try:
+        from .bulk_refunds import run_refund_job
+        
+        return run_refund_job(job_id)
+    except Exception as e:
+        logger.error(f"❌ Error in process_bulk_refund: {str(e)}")
+        return {'success': False, 'error': str(e), 'job_id': job_id}
+
+
+@shared_task
+def reconcile_stat_counters():
+    """
+    Recompute the admin report counters from the raw tables.
+    
+    Schedule periodically (e.g. hourly via CELERY_BEAT_SCHEDULE) to correct
+    drift from bulk updates that bypass model signals.
+    
+    Returns:
+        dict: Reconciled counter values
+    """
+    try:
+        from .stats import reconcile_counters
+        
+        totals = reconcile_counters()
+        logger.info(f"✅ Stat counters reconciled: {totals}")
+        return {'success': True, 'counters': {name: str(value) for name, value in totals.items()}}
+    except Exception as e:
+        logger.error(f"❌ Error in reconcile_stat_counters: {str(e)}")
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task
+def warm_listing_cache():
+    """
+    Keep the first browse pages of the busiest categories in the listing cache.
+    
+    Schedule a little more often than LISTING_CACHE_TIMEOUT (e.g. every 20s
+    via CELERY_BEAT_SCHEDULE) so anonymous visitors never hit a cold page.
+    
+    Returns:
+        dict: Number of pages rendered
+    """
+    try:
+        from auctions.listing_cache import warm_listings
+        
+        rendered = warm_listings()
+        return {'success': True, 'rendered': rendered}
+    except Exception as e:
+        logger.error(f"❌ Error in warm_listing_cache: {str(e)}")
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task
+def notify_watchers_of_bid(auction_id):
+    """
+    Send the latest price of an auction to its watchers.
+    Queued at most once per WATCHLIST_COALESCE_SECONDS per auction.
+    
+    Args:
+        auction_id (int): AuctionItem ID
+    
+    Returns:
+        dict: Number of watchers notified
+    """
+    try:
+        from .watchlist import notify_bid
+        
+        return {'success': True, 'notified': notify_bid(auction_id)}
+    except Exception as e:
+        logger.error(f"❌ Error in notify_watchers_of_bid: {str(e)}")
+        return {'success': False, 'error': str(e), 'auction_id': auction_id}
+
+
+@shared_task
+def notify_watchers_of_close(auction_id, item_name, winner_id=None):
+    """
+    Tell the watchers of a closed auction that it has ended.
+    
+    Args:
+        auction_id (int): AuctionItem ID
+        item_name (str): Auction title for the message
+        winner_id (int): Winner, who is notified separately
+    
+    Returns:
+        dict: Number of watchers notified
+    """
+    try:
+        from .watchlist import notify_closed
+        
+        return {'success': True, 'notified': notify_closed(auction_id, item_name, winner_id)}
+    except Exception as e:
+        logger.error(f"❌ Error in notify_watchers_of_close: {str(e)}")
+        return {'success': False, 'error': str(e), 'auction_id': auction_id}
+
+
+@shared_task
+def notify_watchers_closing_soon():
+    """
+    Warn watchers of auctions that end within WATCHLIST_CLOSING_SOON_MINUTES.
+    
+    Schedule every minute via CELERY_BEAT_SCHEDULE, each auction is
+    announced once.
+    
+    Returns:
+        dict: Number of watchers notified
+    """
+    try:
+        from .watchlist import notify_closing_soon
+        
+        return {'success': True, 'notified': notify_closing_soon()}
+    except Exception as e:
+        logger.error(f"❌ Error in notify_watchers_closing_soon: {str(e)}")
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task
+def archive_closed_auction_chats(limit=None):
+    """
+    Move chat logs of auctions closed more than CHAT_ARCHIVE_AFTER_DAYS ago
+    into compressed per-auction archives.
+    
+    Schedule nightly via CELERY_BEAT_SCHEDULE.
+    
+    Args:
+        limit (int): Most auctions to archive in one run
+    
+    Returns:
+        dict: Auctions and messages archived
+    """
+    try:
+        from auctions.chat_archive import archive_closed_chats
+        
+        archived = archive_closed_chats(limit=limit)
+        logger.info(f"✅ Chat archived: {archived}")
+        return {'success': True, **archived}
+    except Exception as e:
+        logger.error(f"❌ Error in archive_closed_auction_chats: {str(e)}")
+        return {'success': False, 'error': str(e)}
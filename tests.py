@@ -1,3 +1,480 @@
-from django.test import TestCase
+# payments/tests.py
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipIf
+from urllib.parse import parse_qsl, urlsplit
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from payments.models import Payment, PaymentMethod, WebhookEvent
+from payments.query_plans import _payment_queries, explain_query
+from payments.views import PaymentListView
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+User = get_user_model()
+
+
+def make_user(email, **extra):
+    fields = {User.USERNAME_FIELD: email, 'email': email, **extra}
+    return User.objects.create(**fields)
+
+
+def make_auction(seller, **extra):
+    from auctions.models import AuctionItem
+
+    now = timezone.now()
+    fields = {
+        'seller': seller,
+        'item_name': 'Test item',
+        'description': 'Test fixture',
+        'category': 'test',
+        'starting_price': Decimal('1.00'),
+        'current_price': Decimal('1.00'),
+        'start_time': now - timedelta(days=1),
+        'end_time': now + timedelta(days=1),
+        'status': 'active',
+        **extra,
+    }
+    return AuctionItem.objects.create(**fields)
+
+
+def get(view, path, user, **params):
+    """Call a DRF view as `user` and return (response, captured queries)"""
+    request = APIRequestFactory().get(path, params)
+    force_authenticate(request, user=user)
+    with CaptureQueriesContext(connection) as queries:
+        response = view(request)
+        response.render()
+    return response, queries
+
+
+# =====================================================
+# QUERY PLANS (see query_plans.py)
+# =====================================================
+
+class HotQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('buyer@example.com')
+        cls.other = make_user('other@example.com')
+        cls.seed_payments(cls.other, 200)
+        cls.seed_payments(cls.user, 5)
+
+    @classmethod
+    def seed_payments(cls, user, count):
+        offset = Payment.objects.count()
+        Payment.objects.bulk_create(
+            Payment(
+                user=user,
+                amount=Decimal('10.00') + n,
+                status='succeeded' if n % 3 else 'failed',
+                stripe_payment_intent_id=f"pi_{offset + n}",
+                stripe_charge_id=f"ch_{offset + n}",
+            )
+            for n in range(count)
+        )
+        PaymentMethod.objects.bulk_create(
+            PaymentMethod(user=user, stripe_payment_method_id=f"pm_{offset + n}", last_four_digits='4242')
+            for n in range(count)
+        )
+        WebhookEvent.objects.bulk_create(
+            WebhookEvent(stripe_event_id=f"evt_{offset + n}", event_type='charge.succeeded')
+            for n in range(count)
+        )
+
+    def test_payment_hot_queries_use_indexes(self):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.skipTest(f"No scan detection for {connection.vendor}")
+
+        for name, queryset in _payment_queries().items():
+            with self.subTest(query=name):
+                result = explain_query(queryset)
+                self.assertTrue(result['uses_index'], f"{name} scans {result['seq_scans']}:\n{result['plan']}")
+
+    def test_admin_changelists_have_a_fixed_query_count(self):
+        admin_user = make_user('staff@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(admin_user)
+
+        for model in ('payment', 'paymentmethod', 'webhookevent'):
+            url = reverse(f'admin:payments_{model}_changelist')
+            for params in ({}, {'q': 'buyer@example.com'}, {'p': 2}):
+                with self.subTest(model=model, params=params):
+                    with CaptureQueriesContext(connection) as queries:
+                        response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertLessEqual(len(queries), 12, [q['sql'] for q in queries])
+                    for query in queries:
+                        self.assertNotIn('DISTINCT', query['sql'].upper())
+
+    def test_payment_list_query_count_does_not_grow_with_rows(self):
+        view = PaymentListView.as_view()
+
+        def count_queries(user):
+            request = APIRequestFactory().get('/payments/')
+            force_authenticate(request, user=user)
+            with CaptureQueriesContext(connection) as queries:
+                response = view(request)
+                response.render()
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        few, many = count_queries(self.user), count_queries(self.other)
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 3)
+
+
+# =====================================================
+# DISPUTE LIST (auctions/admin_views.py)
+# =====================================================
+
+class DisputeListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from auctions.models import Dispute
+        from orders.models import Order
+
+        cls.admin = make_user('admin@example.com', is_staff=True)
+        seller = make_user('seller@example.com')
+        buyer = make_user('winner@example.com')
+
+        cls.disputes = []
+        for n in range(45):
+            auction = make_auction(seller, item_name=f"Disputed item {n}", status='closed')
+            order = Order.objects.create(auction_item=auction, buyer=buyer, seller=seller, amount=Decimal('10.00'))
+            cls.disputes.append(Dispute.objects.create(
+                order=order, raised_by=buyer, against=seller, status='pending', reason='not_received',
+            ))
+
+    def setUp(self):
+        from auctions.admin_views import DisputeListView
+
+        self.view = DisputeListView.as_view()
+
+    def walk_pages(self, **params):
+        """Follow `next` links, returning (ids in order, queries per page)"""
+        ids, query_counts = [], []
+        while True:
+            response, queries = get(self.view, '/admin/disputes/', self.admin, **params)
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertNotIn('error', response.data)
+            for query in queries:
+                self.assertNotIn('COUNT(', query['sql'].upper())
+            ids.extend(row['id'] for row in response.data['results'])
+            query_counts.append(len(queries))
+            if not response.data['next']:
+                return ids, query_counts
+            # The full next link, so filters carry over to later pages
+            params = dict(parse_qsl(urlsplit(response.data['next']).query))
+
+    def test_cursor_pages_cover_every_dispute_once(self):
+        ids, _ = self.walk_pages()
+        self.assertEqual(sorted(ids), sorted(dispute.id for dispute in self.disputes))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_query_count_is_constant_per_page(self):
+        _, query_counts = self.walk_pages()
+        self.assertEqual(len(query_counts), 3)
+        self.assertEqual(len(set(query_counts)), 1)
+        self.assertLessEqual(query_counts[0], 2)
+
+    def test_created_before_includes_the_whole_day(self):
+        from auctions.models import Dispute
+
+        today = timezone.localdate()
+        Dispute.objects.filter(pk=self.disputes[0].pk).update(created_at=timezone.now() - timedelta(days=3))
+        ids, _ = self.walk_pages(created_before=str(today))
+        self.assertEqual(len(ids), len(self.disputes))
+
+        ids, _ = self.walk_pages(created_before=str(today - timedelta(days=1)))
+        self.assertEqual(ids, [self.disputes[0].id])
+
+    def test_invalid_date_is_rejected(self):
+        response, _ = get(self.view, '/admin/disputes/', self.admin, created_after='2024-13-01')
+        self.assertEqual(response.status_code, 400)
+
+    def test_counts_cover_every_dispute(self):
+        from django.core.cache import cache
+
+        cache.delete('admin:dispute_counts')
+        response, _ = get(self.view, '/admin/disputes/', self.admin, counts=1)
+        self.assertEqual(response.data['counts'], {'pending': 45, 'total': 45})
+        self.assertEqual(len(response.data['results']), 20)
+
+
+# =====================================================
+# ADMIN AUCTION LIST (auctions/admin_views.py)
+# =====================================================
+
+class AdminAuctionOrderingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('auction-admin@example.com', is_staff=True)
+        seller = make_user('priced-seller@example.com')
+        cls.auctions = [
+            make_auction(seller, item_name=f"Priced item {n}", current_price=Decimal(price))
+            for n, price in enumerate(('30.00', '10.00', '20.00'))
+        ]
+
+    def ids(self, **params):
+        from auctions.admin_views import AdminAuctionListView
+
+        response, _ = get(AdminAuctionListView.as_view(), '/admin/auctions/', self.admin, **params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['results']]
+
+    def test_page_numbers_order_by_price(self):
+        expected = [auction.id for auction in sorted(self.auctions, key=lambda auction: auction.current_price)]
+        self.assertEqual(self.ids(page=1, ordering='current_price'), expected)
+
+    def test_cursor_pages_ignore_price_ordering(self):
+        self.assertEqual(self.ids(ordering='current_price'), self.ids())
+
+
+# =====================================================
+# AUCTION SEARCH (see search.py)
+# =====================================================
+
+class AuctionSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = make_user('search-seller@example.com')
+        cls.camera = make_auction(seller, item_name='Vintage film camera', category='photography')
+        cls.lamp = make_auction(seller, item_name='Brass desk lamp', category='home')
+
+    def search(self, query):
+        from auctions.models import AuctionItem
+        from payments.search import search_auctions
+
+        return set(search_auctions(AuctionItem.objects.all(), query).values_list('pk', flat=True))
+
+    def test_prefix_terms_match(self):
+        self.assertEqual(self.search('vint cam'), {self.camera.pk})
+
+    def test_query_without_searchable_terms_matches_nothing(self):
+        for query in ('the', 'a of', 'x', 'the a'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query), set())
+
+    def test_renamed_seller_is_reindexed(self):
+        seller = User.objects.get(pk=self.camera.seller_id)
+        seller.first_name = 'Rosalind'
+        with self.captureOnCommitCallbacks(execute=True):
+            seller.save()
+        self.assertEqual(self.search('rosalind'), {self.camera.pk, self.lamp.pk})
+
+
+# =====================================================
+# LISTING CACHE KEYS (see auctions/listing_cache.py)
+# =====================================================
+
+class ListingCacheKeyTests(TestCase):
+    def key(self, **params):
+        from auctions.listing_cache import listing_cache_key
+
+        return listing_cache_key(params)
+
+    def test_filter_values_keep_their_case(self):
+        self.assertNotEqual(self.key(category='Art'), self.key(category='art'))
+        self.assertNotEqual(self.key(status='Active'), self.key(status='active'))
+
+    def test_price_bounds_are_part_of_the_key(self):
+        self.assertNotEqual(self.key(min_price='10'), self.key(min_price='20'))
+        self.assertNotEqual(self.key(), self.key(max_price='50'))
+
+    def test_default_page_and_ordering_share_a_key(self):
+        self.assertEqual(self.key(), self.key(page='1', ordering='-start_time'))
+        self.assertNotEqual(self.key(), self.key(ordering='start_time'))
+
+
+# =====================================================
+# PAYMENT EXPORT FILTERS (see exports.py)
+# =====================================================
+
+class FilterPaymentsTests(SimpleTestCase):
+    @override_settings(USE_TZ=True, TIME_ZONE='Asia/Tokyo')
+    def test_days_are_bounded_in_the_current_time_zone(self):
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+        from payments.exports import filter_payments
+
+        queryset = filter_payments(Payment.objects.all(), {'start_date': '2026-01-10', 'end_date': '2026-01-10'})
+        bounds = {lookup.lookup_name: lookup.rhs for lookup in queryset.query.where.children}
+        tokyo = ZoneInfo('Asia/Tokyo')
+        self.assertEqual(bounds['gte'], datetime(2026, 1, 10, tzinfo=tokyo))
+        self.assertEqual(bounds['lt'], datetime(2026, 1, 11, tzinfo=tokyo))
+
+    def test_malformed_day_raises_value_error(self):
+        from payments.exports import filter_payments
+
+        with self.assertRaises(ValueError):
+            filter_payments(Payment.objects.all(), {'start_date': '10/01/2026'})
+
+
+# =====================================================
+# BIDDING REPORT (see analytics.py)
+# =====================================================
+
+@skipIf(np is None, "Bidding reports need numpy")
+class ComputeReportTests(SimpleTestCase):
+    HOUR, DAY = 3600, 86400
+
+    def report(self):
+        from payments.analytics import compute_report
+
+        categories, codes = np.unique(np.array(['art', 'books', 'art'], dtype=object), return_inverse=True)
+        auctions = {
+            'id': np.array([3, 1, 2], dtype=np.int64),
+            'categories': categories,
+            'category_code': codes,
+            'closed': np.array([True, True, False]),
+            'starting_price': np.array([10.0, 5.0, 1.0]),
+            'current_price': np.array([25.0, 5.0, 3.0]),
+            'start_time': np.array([0.0, 0.0, 0.0]),
+            'end_time': np.array([2 * self.HOUR, self.HOUR, np.nan]),
+        }
+        bids = {
+            # Two bids on auction 3, one on auction 1, one on an auction outside the window
+            'auction_item_id': np.array([3, 3, 1, 99], dtype=np.int64),
+            # 1970-01-01 was a Thursday
+            'created_at': np.array([0.0, self.HOUR, 4 * self.DAY + 5 * self.HOUR, 0.0]),
+        }
+        return compute_report(auctions, bids)
+
+    def test_sell_through_and_revenue(self):
+        report = self.report()
+        self.assertEqual((report['auctions'], report['bids']), (3, 4))
+        self.assertEqual(report['revenue'], 30.0)
+        self.assertEqual(report['sell_through']['rate'], 1.0)
+        self.assertEqual(
+            [(row['category'], row['closed'], row['sold']) for row in report['sell_through']['by_category']],
+            [('art', 1, 1), ('books', 1, 1)],
+        )
+
+    def test_bid_velocity_skips_auctions_without_bids_or_end(self):
+        velocity = self.report()['bid_velocity']
+        self.assertEqual(velocity['auctions'], 2)
+        self.assertEqual(velocity['bids_per_hour']['p50'], 1.0)
+
+    def test_price_to_start_by_category(self):
+        ratios = {row['category']: row['mean'] for row in self.report()['price_to_start_by_category']}
+        self.assertEqual(ratios, {'art': 2.5, 'books': 1.0})
+
+    def test_hourly_heatmap(self):
+        counts = self.report()['hourly_heatmap']['counts']
+        self.assertEqual(counts[3][0], 2)  # Thursday 00:00, heatmap counts every bid in the window
+        self.assertEqual(counts[3][1], 1)
+        self.assertEqual(counts[0][5], 1)  # Monday 05:00
+        self.assertEqual(sum(map(sum, counts)), 4)
+
+
+# =====================================================
+# SHILL-BIDDING DETECTION (see auctions/fraud.py)
+# =====================================================
+
+class ShillDetectorTests(SimpleTestCase):
+    SELLER = 100
+
+    def detector(self):
+        from auctions.fraud import ShillDetector
+
+        return ShillDetector(shared=False)
+
+    def bid(self, detector, bidder_id, auction_id, now, late=False, price_raise=None):
+        end_time = now + (30 if late else 3600)
+        return detector.observe_bid(bidder_id, self.SELLER, auction_id, end_time, price_raise, now=now)
+
+    def shill(self, detector, bidder_id=1):
+        """Two late minimum-increment nudges on each of ten auctions by one seller, with retractions"""
+        now = 1000.0
+        results = []
+        for auction_id in range(1, 11):
+            for _ in range(2):
+                now += 1
+                results.append(self.bid(detector, bidder_id, auction_id, now, late=True, price_raise=0.0))
+            if auction_id % 2:
+                detector.observe_retraction(bidder_id, now=now)
+        return results[-1], now
+
+    def test_bidding_war_on_one_auction_is_not_flagged(self):
+        from auctions.fraud import FRAUD_FLAG_THRESHOLD
+
+        detector = self.detector()
+        now = 1000.0
+        for _ in range(10):
+            now += 5
+            result = self.bid(detector, 1, 1, now, late=True, price_raise=0.02)
+            self.assertFalse(detector.should_flag(1, self.SELLER, result['score'], now=now))
+        self.assertLess(result['features']['concentration'], 0.5)
+        self.assertLess(result['score'], FRAUD_FLAG_THRESHOLD)
+
+    def test_late_bids_that_raise_the_price_do_not_count_as_late(self):
+        detector = self.detector()
+        now = 1000.0
+        for auction_id in range(1, 6):
+            now += 1
+            result = self.bid(detector, 1, auction_id, now, late=True, price_raise=0.2)
+        self.assertEqual(result['features']['late_rate'], 0.0)
+
+    def test_loyal_buyer_is_not_flagged(self):
+        detector = self.detector()
+        now = 1000.0
+        for auction_id in range(1, 9):
+            now += 60
+            result = self.bid(detector, 1, auction_id, now)
+            self.assertFalse(detector.should_flag(1, self.SELLER, result['score'], now=now))
+        self.assertEqual(result['features']['concentration'], 1.0)
+
+    def test_shill_is_flagged_once_per_cooldown(self):
+        from auctions.fraud import FRAUD_FLAG_COOLDOWN_SECONDS, FRAUD_FLAG_THRESHOLD
+
+        detector = self.detector()
+        result, now = self.shill(detector)
+        self.assertGreaterEqual(result['score'], FRAUD_FLAG_THRESHOLD)
+        self.assertTrue(detector.should_flag(1, self.SELLER, result['score'], now=now))
+        self.assertFalse(detector.should_flag(1, self.SELLER, result['score'], now=now + 1))
+        self.assertTrue(detector.should_flag(1, self.SELLER, result['score'], now=now + FRAUD_FLAG_COOLDOWN_SECONDS))
+
+    def test_seller_bidding_on_own_item_scores_one(self):
+        result = self.detector().observe_bid(self.SELLER, self.SELLER, 1, now=1000.0)
+        self.assertEqual(result['score'], 1.0)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'fraud-tests'}})
+class SharedShillDetectorTests(ShillDetectorTests):
+    """Same scenarios with the default counters and cooldowns kept in the cache"""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def detector(self):
+        from auctions.fraud import ShillDetector
+
+        return ShillDetector(shared=True)
+
+    def test_shill_is_flagged_once_per_cooldown(self):
+        # The cooldown is the cache timeout, so it runs on the wall clock
+        from auctions.fraud import FRAUD_FLAG_THRESHOLD
+
+        result, now = self.shill(self.detector())
+        self.assertGreaterEqual(result['score'], FRAUD_FLAG_THRESHOLD)
+        self.assertTrue(self.detector().should_flag(1, self.SELLER, result['score'], now=now))
+        self.assertFalse(self.detector().should_flag(1, self.SELLER, result['score'], now=now + 1))
+
+    def test_workers_share_history(self):
+        from auctions.fraud import FRAUD_FLAG_THRESHOLD
+
+        _, now = self.shill(self.detector())
+        result = self.bid(self.detector(), 1, 11, now + 1, late=True, price_raise=0.0)
+        self.assertGreaterEqual(result['score'], FRAUD_FLAG_THRESHOLD)
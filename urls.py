@@ -14,6 +14,20 @@ urlpatterns = [
     path('<int:payment_id>/status/', views.PaymentStatusView.as_view(), name='payment-status'),
     path('<int:payment_id>/refund/', views.RefundPaymentView.as_view(), name='refund-payment'),
 
+    # Bulk Refunds (Admin)
+    path('bulk-refunds/', views.BulkRefundView.as_view(), name='bulk-refund'),
+    path('bulk-refunds/<int:pk>/', views.RefundJobDetailView.as_view(), name='bulk-refund-detail'),
+
+    # Exports (Admin)
+    path('export/', views.PaymentExportView.as_view(), name='payment-export'),
+
+    # Watchlist
+    path('watchlist/', views.WatchlistView.as_view(), name='watchlist'),
+    path('watchlist/<int:auction_id>/', views.WatchlistEntryDeleteView.as_view(), name='watchlist-entry'),
+
+    # Price history (auction charts)
+    path('auctions/<int:auction_id>/price-history/', views.PriceHistoryView.as_view(), name='price-history'),
+
     path('webhook/stripe/', webhook.stripe_webhook, name='stripe-webhook'),
     path('webhook/test/', webhook.test_webhook, name='test-webhook'),
 ]
\ No newline at end of file
@@ -5,12 +5,15 @@ from . import admin_views
 urlpatterns = [
     # Auction Management
     path("auctions/", admin_views.AdminAuctionListView.as_view(), name="admin-auction-list"),
+    path("auctions/export/", admin_views.AdminAuctionExportView.as_view(), name="admin-auction-export"),
+    path("bids/export/", admin_views.AdminBidExportView.as_view(), name="admin-bid-export"),
     path("close-auction/<int:auction_id>/", admin_views.close_auction_api, name="close-auction-api"),
     path("reopen-auction/<int:auction_id>/", admin_views.reopen_auction_api, name="reopen-auction-api"),
     
     # Reports & Analytics
     path('reports/', admin_views.AdminReportView.as_view(), name='admin-reports'),
     path('analytics/', admin_views.AdminAnalyticsView.as_view(), name='admin-analytics'),
+    path('analytics/bidding/', admin_views.AdminBiddingReportView.as_view(), name='admin-bidding-report'),
     
     # Dispute Management
     path('disputes/', admin_views.DisputeListView.as_view(), name='admin-disputes'),
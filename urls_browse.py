@@ -0,0 +1,11 @@
+# auctions/urls_browse.py
+from django.urls import path
+from . import browse_views, chat_history, sse
+
+urlpatterns = [
+    # GET-only, under their own prefix so POST "" and PUT/PATCH/DELETE "<int:pk>/" still reach the app's views
+    path("browse/", browse_views.AuctionListView.as_view(), name="auction-browse"),
+    path("browse/<int:pk>/", browse_views.AuctionDetailView.as_view(), name="auction-browse-detail"),
+    path("<int:auction_id>/chat/history/", chat_history.ChatHistoryView.as_view(), name="auction-chat-history"),
+    path("<int:auction_id>/events/", sse.auction_event_stream, name="auction-events"),
+]
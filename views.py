@@ -16,13 +16,16 @@ from django.conf import settings
 import logging
 import traceback
 
-from .models import PaymentMethod, Payment
+from .models import PaymentMethod, Payment, RefundJob, WatchlistEntry
 from .serializers import (
     PaymentMethodSerializer,
     PaymentMethodCreateSerializer,
     PaymentSerializer,
+    RefundJobSerializer,
+    WatchlistEntrySerializer,
 )
 from .stripe_utils import StripePaymentHandler
+from . import price_series
 
 logger = logging.getLogger(__name__)
 
@@ -544,4 +547,148 @@ class RefundPaymentView(APIView):
             return Response(
                 {'error': f'Failed to process refund: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+# =====================================================
+# BULK REFUNDS (Admin)
+# =====================================================
+
+class BulkRefundView(APIView):
+    """
+    POST /payments/bulk-refunds/
+    Start a bulk refund job for many payments (admin only).
+    
+    Request body:
+    {
+        "payment_ids": [1, 2, 3],
+        "reason": "Seller banned"
+    }
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        payment_ids = request.data.get('payment_ids')
+
+        if not payment_ids or not isinstance(payment_ids, list):
+            return Response(
+                {'error': 'payment_ids must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            from .bulk_refunds import create_refund_job
+            from .tasks import process_bulk_refund
+
+            job = create_refund_job(
+                payment_ids,
+                user=request.user,
+                reason=request.data.get('reason'),
+            )
+            transaction.on_commit(lambda: process_bulk_refund.delay(job.id))
+        except (ValueError, TypeError):
+            return Response(
+                {'error': 'payment_ids must contain payment IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        logger.info(f"✅ Refund job {job.id} queued by {request.user.id} for {job.total} payments")
+
+        return Response(RefundJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class RefundJobDetailView(generics.RetrieveAPIView):
+    """
+    GET /payments/bulk-refunds/<pk>/
+    Progress of a bulk refund job (admin only)
+    """
+    serializer_class = RefundJobSerializer
+    permission_classes = [permissions.IsAdminUser]
+    queryset = RefundJob.objects.select_related('created_by')
+
+
+# =====================================================
+# EXPORTS (Admin)
+# =====================================================
+
+class PaymentExportView(APIView):
+    """
+    GET /payments/export/?export_format=csv|jsonl
+    Stream every payment matching the filters (admin only).
+    
+    Query Parameters:
+    - status, currency: Same filters as the Payment admin changelist
+    - start_date / end_date: Filter by creation date (YYYY-MM-DD)
+    - search: Exact user email, PaymentIntent ID or charge ID
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        from .exports import PAYMENT_EXPORT_FIELDS, filter_payments, stream_export
+
+        export_format = request.query_params.get('export_format', 'csv')
+
+        try:
+            queryset = filter_payments(Payment.objects.order_by('id'), request.query_params)
+            return stream_export(queryset, PAYMENT_EXPORT_FIELDS, export_format, 'payments')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+# =====================================================
+# WATCHLIST
+# =====================================================
+
+class WatchlistView(generics.ListCreateAPIView):
+    """
+    GET: List the auctions the current user is watching
+    POST: Watch an auction ({"auction": <id>}), watching twice is a no-op
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = WatchlistEntrySerializer
+
+    def get_queryset(self):
+        return WatchlistEntry.objects.filter(user=self.request.user).select_related('auction')
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        entry, created = WatchlistEntry.objects.get_or_create(
+            user=request.user,
+            auction=serializer.validated_data['auction'],
+        )
+        return Response(
+            self.get_serializer(entry).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+
+class WatchlistEntryDeleteView(APIView):
+    """
+    DELETE: Stop watching an auction
+    """
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, auction_id):
+        WatchlistEntry.objects.filter(user=request.user, auction_id=auction_id).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# =====================================================
+# PRICE HISTORY
+# =====================================================
+
+class PriceHistoryView(APIView):
+    """
+    GET: Price history of an auction for charts
+    ?points=300 sets the resolution, ?mode=minmax keeps each bucket's low and high
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, auction_id):
+        try:
+            points = int(request.query_params.get('points', price_series.PRICE_SERIES_DEFAULT_POINTS))
+            data = price_series.downsample(auction_id, points, request.query_params.get('mode', 'lttb'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
@@ -0,0 +1,159 @@
+# payments/watchlist.py
+"""
+Fan-out of auction events to watchers.
+
+Watchers are read from the (auction, user) index of WatchlistEntry as one
+streamed query, and messages go to each watcher's user_{id} group (joined
+by NotificationConsumer) in concurrent batches. Bids on the same auction
+are coalesced: the first bid schedules one fan-out a short window later,
+and that fan-out reports the latest price.
+"""
+import asyncio
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import WatchlistEntry
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST_COALESCE_SECONDS = getattr(settings, 'WATCHLIST_COALESCE_SECONDS', 2)
+WATCHLIST_SEND_BATCH = getattr(settings, 'WATCHLIST_SEND_BATCH', 1000)
+WATCHLIST_CLOSING_SOON_MINUTES = getattr(settings, 'WATCHLIST_CLOSING_SOON_MINUTES', 15)
+
+
+def iter_watcher_ids(auction_id, exclude_user_id=None):
+    """Stream watcher IDs of an auction straight off the index"""
+    queryset = WatchlistEntry.objects.filter(auction_id=auction_id)
+    if exclude_user_id:
+        queryset = queryset.exclude(user_id=exclude_user_id)
+    return queryset.values_list('user_id', flat=True).iterator(chunk_size=WATCHLIST_SEND_BATCH)
+
+
+async def _send_to_groups(channel_layer, user_ids, message):
+    await asyncio.gather(
+        *(channel_layer.group_send(f"user_{user_id}", message) for user_id in user_ids),
+        return_exceptions=True,
+    )
+
+
+def fan_out(auction_id, content, exclude_user_id=None):
+    """
+    Send `content` to every watcher of an auction.
+
+    Returns:
+        int: Number of watchers notified
+    """
+    channel_layer = get_channel_layer()
+    message = {"type": "auction_notification", "content": content}
+
+    sent = 0
+    batch = []
+    for user_id in iter_watcher_ids(auction_id, exclude_user_id):
+        batch.append(user_id)
+        if len(batch) >= WATCHLIST_SEND_BATCH:
+            async_to_sync(_send_to_groups)(channel_layer, batch, message)
+            sent += len(batch)
+            batch = []
+    if batch:
+        async_to_sync(_send_to_groups)(channel_layer, batch, message)
+        sent += len(batch)
+
+    return sent
+
+
+def _pending_key(auction_id):
+    return f"watchlist:fanout:{auction_id}"
+
+
+def schedule_bid_fan_out(auction_id):
+    """
+    Queue one outbid fan-out per auction per coalescing window.
+    Bids that land while one is pending ride along with it.
+    """
+    def schedule():
+        if cache.add(_pending_key(auction_id), 1, WATCHLIST_COALESCE_SECONDS * 5):
+            from .tasks import notify_watchers_of_bid
+            notify_watchers_of_bid.apply_async((auction_id,), countdown=WATCHLIST_COALESCE_SECONDS)
+
+    transaction.on_commit(schedule)
+
+
+def notify_bid(auction_id):
+    """Tell watchers (except the current high bidder) the latest price of an auction"""
+    from auctions.models import AuctionItem, Bid
+
+    cache.delete(_pending_key(auction_id))
+
+    auction = (
+        AuctionItem.objects.filter(pk=auction_id)
+        .values('id', 'item_name', 'current_price', 'status')
+        .first()
+    )
+    if not auction or auction['status'] != 'active':
+        return 0
+
+    top_bidder_id = (
+        Bid.objects.filter(auction_item_id=auction_id)
+        .order_by('-amount')
+        .values_list('user_id', flat=True)
+        .first()
+    )
+
+    return fan_out(auction_id, {
+        "type": "watchlist_outbid",
+        "auction_id": auction['id'],
+        "item_name": auction['item_name'],
+        "current_price": str(auction['current_price']),
+        "message": f"New bid on {auction['item_name']}: ${auction['current_price']}",
+    }, exclude_user_id=top_bidder_id)
+
+
+def notify_closed(auction_id, item_name, winner_id=None):
+    """Tell watchers an auction they watch has closed"""
+    return fan_out(auction_id, {
+        "type": "watchlist_closed",
+        "auction_id": auction_id,
+        "item_name": item_name,
+        "message": f"{item_name} has closed.",
+    }, exclude_user_id=winner_id)
+
+
+def notify_closing_soon():
+    """
+    Tell watchers about auctions ending within WATCHLIST_CLOSING_SOON_MINUTES.
+    Each auction is announced once.
+
+    Returns:
+        int: Number of watchers notified
+    """
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from auctions.models import AuctionItem
+
+    window = timedelta(minutes=WATCHLIST_CLOSING_SOON_MINUTES)
+    ending = AuctionItem.objects.filter(
+        status='active',
+        end_time__gt=timezone.now(),
+        end_time__lte=timezone.now() + window,
+        watchlist_entries__isnull=False,
+    ).distinct().values_list('id', 'item_name', 'end_time')
+
+    sent = 0
+    for auction_id, item_name, end_time in ending:
+        if not cache.add(f"watchlist:closing-soon:{auction_id}", 1, int(window.total_seconds()) * 2):
+            continue
+        sent += fan_out(auction_id, {
+            "type": "watchlist_closing_soon",
+            "auction_id": auction_id,
+            "item_name": item_name,
+            "end_time": end_time.isoformat(),
+            "message": f"{item_name} is closing soon!",
+        })
+    return sent
@@ -0,0 +1,289 @@
+# auctions/ws_benchmark.py
+"""
+WebSocket capacity scenarios run in-process with Channels'
+WebsocketCommunicator (no sockets, no network).
+
+    connect_storm     N clients connect to AuctionConsumer as fast as the
+                      event loop allows: connections/sec and memory per
+                      connection. With authenticated=True every join also
+                      fans user_joined out to the whole room, which grows
+                      with the square of the room size
+    broadcast_fanout  N watchers of one auction receive bid broadcasts:
+                      delivery latency percentiles and messages/sec
+    chat_burst        M chatters in one AuctionChatConsumer room each send
+                      a burst of messages: delivery latency and messages/sec
+
+The numbers cover the consumer and channel-layer path a worker runs.
+Socket and TLS costs are measured against a live server with the
+standalone load generator in ws_loadgen.py.
+"""
+import asyncio
+import contextlib
+import gc
+import itertools
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.urls import re_path
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import rate_limits
+from .chat_history import RoomBuffer, room_buffers
+from .consumers import AuctionChatConsumer, AuctionConsumer
+
+BENCHMARK_AUCTION_ID = 1
+
+# Chat limits for chat_burst: buckets are still charged, but never run dry
+UNLIMITED_CHAT = {'chat:user': (10 ** 9, 10 ** 9), 'chat:auction': (10 ** 9, 10 ** 9)}
+
+_message_ids = itertools.count(1)
+_user_ids = itertools.count(1)
+
+
+class ScopeUser:
+    """ASGI wrapper that puts a user (anonymous by default) in the scope"""
+
+    def __init__(self, app, user=None):
+        self.app = app
+        self.user = user or SimpleNamespace(id=None, is_authenticated=False, is_anonymous=True)
+
+    async def __call__(self, scope, receive, send):
+        return await self.app(dict(scope, user=self.user), receive, send)
+
+
+def bench_user(user_id):
+    """Stand-in for a logged-in user, with the fields the consumers read"""
+    return SimpleNamespace(
+        id=user_id, is_authenticated=True, is_anonymous=False,
+        email=f"bench{user_id}@example.com", first_name="Bench", last_name=str(user_id),
+        ticket_id=f"BENCH-{user_id}",
+    )
+
+
+class BenchmarkChatConsumer(AuctionChatConsumer):
+    """AuctionChatConsumer without database round-trips, so the room itself is measured"""
+
+    @database_sync_to_async
+    def get_user(self, user_id):
+        return bench_user(user_id)
+
+    @database_sync_to_async
+    def save_message(self, user, message):
+        return SimpleNamespace(id=next(_message_ids), timestamp=timezone.now())
+
+
+@contextlib.contextmanager
+def chat_limits(limits):
+    """Temporarily replace chat rate limits (see rate_limits.py)"""
+    saved = dict(rate_limits.RATE_LIMITS)
+    rate_limits.RATE_LIMITS.update(limits)
+    try:
+        yield
+    finally:
+        rate_limits.RATE_LIMITS.clear()
+        rate_limits.RATE_LIMITS.update(saved)
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    if not samples:
+        return {f"p{point}": None for point in points}
+    ordered = sorted(samples)
+    return {
+        f"p{point}": round(ordered[min(len(ordered) - 1, int(len(ordered) * point / 100))] * 1000, 3)
+        for point in points
+    }
+
+
+async def _connect_all(communicators, concurrency):
+    for start in range(0, len(communicators), concurrency):
+        batch = communicators[start:start + concurrency]
+        results = await asyncio.gather(*(communicator.connect() for communicator in batch))
+        refused = sum(1 for connected, _ in results if not connected)
+        if refused:
+            raise RuntimeError(f"{refused} connections refused")
+
+
+async def _disconnect_all(communicators, concurrency):
+    for start in range(0, len(communicators), concurrency):
+        await asyncio.gather(*(
+            communicator.disconnect() for communicator in communicators[start:start + concurrency]
+        ))
+
+
+def _urls(consumer):
+    return URLRouter([
+        re_path(r"ws/auctions/(?P<auction_id>\d+)/$", AuctionConsumer.as_asgi()),
+        re_path(r"ws/auctions/(?P<auction_id>\d+)/chat/$", consumer.as_asgi()),
+    ])
+
+
+def _router(consumer, user=None):
+    return ScopeUser(_urls(consumer), user)
+
+
+def _auction_communicators(count, auction_id=BENCHMARK_AUCTION_ID, authenticated=False):
+    urls = _urls(BenchmarkChatConsumer)
+    path = f"/ws/auctions/{auction_id}/"
+    if not authenticated:
+        app = ScopeUser(urls)
+        return [WebsocketCommunicator(app, path) for _ in range(count)]
+    return [WebsocketCommunicator(ScopeUser(urls, bench_user(next(_user_ids))), path) for _ in range(count)]
+
+
+def _spread_communicators(clients, authenticated=False):
+    communicators = []
+    for auction_offset in range(100):
+        communicators += _auction_communicators(
+            clients // 100 + (1 if auction_offset < clients % 100 else 0),
+            BENCHMARK_AUCTION_ID + auction_offset,
+            authenticated,
+        )
+    return communicators
+
+
+async def connect_storm(clients, concurrency=500, memory_sample=2000, authenticated=False):
+    """
+    Connect `clients` AuctionConsumers spread over 100 auctions.
+
+    Connection rate is timed without tracing; memory per connection comes
+    from a separate traced run of up to `memory_sample` connections.
+    Anonymous clients join silently. Authenticated clients announce
+    themselves with user_joined (and user_left on disconnect) to everyone
+    already in the room, as logged-in bidders do.
+
+    Returns:
+        dict: connections/sec and traced memory per connection (KB)
+    """
+    communicators = _spread_communicators(clients, authenticated)
+    started = time.perf_counter()
+    await _connect_all(communicators, concurrency)
+    elapsed = time.perf_counter() - started
+    await _disconnect_all(communicators, concurrency)
+    del communicators
+
+    sample = min(clients, memory_sample)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    communicators = _spread_communicators(sample, authenticated)
+    await _connect_all(communicators, concurrency)
+    gc.collect()
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / max(sample, 1) / 1024
+    tracemalloc.stop()
+    await _disconnect_all(communicators, concurrency)
+
+    return {
+        'scenario': 'connect_storm',
+        'clients': clients,
+        'authenticated': authenticated,
+        'connections_per_sec': round(clients / elapsed),
+        'memory_per_connection_kb': round(per_connection, 2),
+    }
+
+
+async def _drain(communicator, expected, latencies, timeout):
+    received = 0
+    while received < expected:
+        event = await communicator.receive_json_from(timeout=timeout)
+        if event.get("type") in ("ping", "throttled"):
+            continue  # Heartbeat (heartbeat.py) or rate limit notice (rate_limits.py)
+        latencies.append(time.perf_counter() - float(event["message"]))
+        received += 1
+
+
+async def broadcast_fanout(watchers, bids=20, concurrency=500, timeout=30):
+    """
+    Broadcast `bids` auction events to `watchers` clients of one auction.
+
+    The send time travels in the event, so every delivery is timed.
+
+    Returns:
+        dict: messages/sec and delivery latency percentiles (ms)
+    """
+    communicators = _auction_communicators(watchers)
+    await _connect_all(communicators, concurrency)
+
+    channel_layer = get_channel_layer()
+    latencies = []
+    drains = [
+        asyncio.ensure_future(_drain(communicator, bids, latencies, timeout))
+        for communicator in communicators
+    ]
+
+    started = time.perf_counter()
+    for _ in range(bids):
+        # auction_closed relays "message" verbatim, so it carries the send time
+        await channel_layer.group_send(
+            f"auction_{BENCHMARK_AUCTION_ID}",
+            {"type": "auction_closed", "message": repr(time.perf_counter())},
+        )
+    await asyncio.gather(*drains)
+    elapsed = time.perf_counter() - started
+
+    await _disconnect_all(communicators, concurrency)
+    return {
+        'scenario': 'broadcast_fanout',
+        'clients': watchers,
+        'broadcasts': bids,
+        'messages_per_sec': round(len(latencies) / elapsed),
+        **percentiles(latencies),
+    }
+
+
+async def chat_burst(chatters, messages=10, concurrency=500, timeout=30):
+    """
+    Every chatter sends `messages` messages at once into one room.
+
+    The room and per-user chat limits would refuse most of a burst, so
+    they are raised to UNLIMITED_CHAT for the run; the buckets are still
+    charged, so their cost is part of the figures.
+
+    Returns:
+        dict: delivered messages/sec and delivery latency percentiles (ms)
+    """
+    # A warm (empty) ring buffer, so joining the room needs no history query
+    room_buffers.rooms.setdefault(BENCHMARK_AUCTION_ID, RoomBuffer([]))
+
+    app = _router(BenchmarkChatConsumer)
+    communicators = []
+    for user_id in range(1, chatters + 1):
+        token = AccessToken()
+        token["user_id"] = user_id
+        communicators.append(WebsocketCommunicator(
+            app,
+            f"/ws/auctions/{BENCHMARK_AUCTION_ID}/chat/?token={token}",
+        ))
+    await _connect_all(communicators, concurrency)
+
+    expected = chatters * messages
+    latencies = []
+    drains = [
+        asyncio.ensure_future(_drain(communicator, expected, latencies, timeout))
+        for communicator in communicators
+    ]
+
+    with chat_limits(UNLIMITED_CHAT):
+        started = time.perf_counter()
+        for _ in range(messages):
+            await asyncio.gather(*(
+                communicator.send_json_to({"message": repr(time.perf_counter())})
+                for communicator in communicators
+            ))
+        await asyncio.gather(*drains)
+        elapsed = time.perf_counter() - started
+
+    await _disconnect_all(communicators, concurrency)
+    return {
+        'scenario': 'chat_burst',
+        'clients': chatters,
+        'sent': expected,
+        'delivered': len(latencies),
+        'messages_per_sec': round(len(latencies) / elapsed),
+        **percentiles(latencies),
+    }
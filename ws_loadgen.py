@@ -0,0 +1,158 @@
+# auctions/ws_loadgen.py
+"""
+Standalone asyncio WebSocket load generator for a running ASGI server.
+
+Opens many real sockets against AuctionConsumer / AuctionChatConsumer
+routes and reports connections/sec, messages/sec and latency percentiles.
+Needs only Python and the `websockets` package, not Django, so it can run
+on a separate load box or next to a local daphne/uvicorn without network
+access beyond localhost.
+
+Usage:
+    python ws_loadgen.py connect --url ws://127.0.0.1:8000/ws/auctions/1/ --clients 5000
+    python ws_loadgen.py watch --url ws://127.0.0.1:8000/ws/auctions/1/ --clients 10000 --duration 60
+    python ws_loadgen.py chat --url "ws://127.0.0.1:8000/ws/auctions/1/chat/?token=<JWT>" --clients 200 --messages 20
+
+`watch` only counts deliveries, the broadcasts come from the app (place
+bids or run benchmark_websockets for timed in-process broadcasts). `chat`
+stamps each message with the send time, so delivery latency is measured
+end to end. Raise the open-file limit (ulimit -n) before large runs.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    if not samples:
+        return {f"p{point}_ms": None for point in points}
+    ordered = sorted(samples)
+    return {
+        f"p{point}_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * point / 100))] * 1000, 3)
+        for point in points
+    }
+
+
+async def open_clients(websockets, url, clients, concurrency):
+    sockets = []
+    connect_times = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def connect():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                sockets.append(await websockets.connect(url, ping_interval=None, max_queue=None))
+                connect_times.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connect() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return sockets, {
+        'clients': clients,
+        'connected': len(sockets),
+        'failed': failures,
+        'connections_per_sec': round(len(sockets) / elapsed) if elapsed else None,
+        **{f"connect_{key}": value for key, value in percentiles(connect_times).items()},
+    }
+
+
+async def close_clients(sockets):
+    await asyncio.gather(*(socket.close() for socket in sockets), return_exceptions=True)
+
+
+async def read_frames(socket, on_frame, deadline):
+    try:
+        while time.perf_counter() < deadline:
+            raw = await asyncio.wait_for(socket.recv(), deadline - time.perf_counter())
+            frame = json.loads(raw)
+            if frame.get("type") == "ping":
+                await socket.send(json.dumps({"type": "pong"}))  # Stay clear of the reaper
+                continue
+            on_frame(frame)
+    except Exception:
+        pass  # Deadline reached or the server closed the socket
+
+
+async def run_connect(websockets, args):
+    sockets, report = await open_clients(websockets, args.url, args.clients, args.concurrency)
+    await close_clients(sockets)
+    return {'scenario': 'connect', **report}
+
+
+async def run_watch(websockets, args):
+    sockets, report = await open_clients(websockets, args.url, args.clients, args.concurrency)
+    received = 0
+
+    def count(frame):
+        nonlocal received
+        received += 1
+
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*(read_frames(socket, count, deadline) for socket in sockets))
+    await close_clients(sockets)
+    return {'scenario': 'watch', **report, 'received': received, 'messages_per_sec': round(received / args.duration)}
+
+
+async def run_chat(websockets, args):
+    sockets, report = await open_clients(websockets, args.url, args.clients, args.concurrency)
+    latencies = []
+    last_delivery = None
+
+    def record(frame):
+        nonlocal last_delivery
+        try:
+            latencies.append(time.perf_counter() - float(frame["message"]))
+            last_delivery = time.perf_counter()
+        except (KeyError, TypeError, ValueError):
+            pass  # Someone else's message
+
+    deadline = time.perf_counter() + args.duration
+    readers = [asyncio.ensure_future(read_frames(socket, record, deadline)) for socket in sockets]
+
+    started = time.perf_counter()
+    for _ in range(args.messages):
+        await asyncio.gather(*(
+            socket.send(json.dumps({"message": repr(time.perf_counter())})) for socket in sockets
+        ), return_exceptions=True)
+    await asyncio.gather(*readers)
+    elapsed = (last_delivery or time.perf_counter()) - started
+
+    await close_clients(sockets)
+    return {
+        'scenario': 'chat',
+        **report,
+        'sent': len(sockets) * args.messages,
+        'delivered': len(latencies),
+        'messages_per_sec': round(len(latencies) / elapsed),
+        **percentiles(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('scenario', choices=('connect', 'watch', 'chat'))
+    parser.add_argument('--url', required=True, help='WebSocket URL, including ?token= for chat')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=200, help='Handshakes in flight at once')
+    parser.add_argument('--messages', type=int, default=10, help='Messages per chat client')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to listen (watch, chat)')
+    args = parser.parse_args(argv)
+
+    try:
+        import websockets
+    except ImportError:
+        sys.exit("ws_loadgen needs the websockets package: pip install websockets")
+
+    runner = {'connect': run_connect, 'watch': run_watch, 'chat': run_chat}[args.scenario]
+    print(json.dumps(asyncio.run(runner(websockets, args))))
+
+
+if __name__ == '__main__':
+    main()